@@ -0,0 +1,27 @@
+import React from "react";
+
+type RunEvent = { id: string; channel: string; data: Record<string, unknown> };
+
+export function RunEvents({ runId }: { runId: string }) {
+  const [events, setEvents] = React.useState<RunEvent[]>([]);
+
+  React.useEffect(() => {
+    // EventSource resends Last-Event-ID on reconnect, so dropped streams resume without gaps.
+    const source = new EventSource(`/runs/${runId}/events`);
+    const onEvent = (e: MessageEvent) =>
+      setEvents((prev) => [...prev.slice(-199), { id: e.lastEventId, channel: e.type, data: JSON.parse(e.data) }]);
+    source.addEventListener("progress", onEvent);
+    return () => source.close();
+  }, [runId]);
+
+  return (
+    <section>
+      <h3>Run Progress</h3>
+      <ul>
+        {events.map((e) => (
+          <li key={e.id}>{String(e.data.state ?? e.channel)}</li>
+        ))}
+      </ul>
+    </section>
+  );
+}
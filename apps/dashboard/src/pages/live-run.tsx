@@ -1,11 +1,14 @@
 import React from "react";
 import { ApprovalPanel } from "../components/ApprovalPanel";
 import { LiveDesktopStream } from "../components/LiveDesktopStream";
+import { RunEvents } from "../components/RunEvents";
 
 export default function Page() {
+  const runId = new URLSearchParams(window.location.search).get("run");
   return (
     <main>
       <h1>SkyAgentOS Dashboard</h1>
+      {runId && <RunEvents runId={runId} />}
       <ApprovalPanel />
       <LiveDesktopStream />
     </main>
@@ -0,0 +1,71 @@
+"""GET /runs/{id} latency: a MemoryStore built and migrated per request (the
+API's previous behaviour) vs the shared AppContext store with pooled
+connections."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib import request
+
+from skyagentos.api.context import AppContext
+from skyagentos.api.server import MissionHandler, make_server
+from skyagentos.memory.store import MemoryStore
+from skyagentos.models.schemas import Mission
+
+
+class PerRequestStoreHandler(MissionHandler):
+    @contextmanager
+    def store(self):
+        store = MemoryStore(self.ctx.store.db_path)
+        store.init()
+        try:
+            yield store
+        finally:
+            store.close()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_benchmark(requests: int = 300, port: int = 18790) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({"SKYAGENT_DRY_RUN": "true", "ORCHESTRATOR_WORKERS": "0", "ORCHESTRATOR_HOST": "127.0.0.1", "SKYAGENT_STREAM_STDOUT": "false"})
+        os.environ["MEMORY_DB_PATH"] = str(Path(tmp) / "api.db")
+        os.environ["AGENT_FS_ROOT"] = str(Path(tmp) / "agentfs")
+        ctx = AppContext.from_env()
+        run_id = ctx.orchestrator.submit(Mission(id="m-bench", objective="latency", domain="research"))["run_id"]
+        for n, (name, handler) in enumerate((("per_request_store", PerRequestStoreHandler), ("app_context", MissionHandler))):
+            os.environ["ORCHESTRATOR_PORT"] = str(port + n)
+            server = make_server(ctx, handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{port + n}/runs/{run_id}"
+            samples = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                with request.urlopen(url, timeout=10) as resp:
+                    assert json.loads(resp.read())["run"]["id"] == run_id
+                samples.append(time.perf_counter() - start)
+            server.shutdown()
+            server.server_close()
+            results[name] = {
+                "requests": requests,
+                "p50_ms": round(_percentile(samples, 0.5) * 1000, 3),
+                "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+                "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+            }
+        results["app_context"]["store_connections"] = len(ctx.store._conns)
+        ctx.close()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
@@ -0,0 +1,63 @@
+"""Missions/sec: thread-pool Orchestrator vs AsyncOrchestrator against local stub servers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from evals.perf.stubs import start_stub
+from skyagentos.models.schemas import Mission
+from skyagentos.runtime.async_orchestrator import AsyncOrchestrator
+from skyagentos.runtime.orchestrator import Orchestrator
+
+
+def _missions(prefix: str, n: int) -> list[Mission]:
+    return [Mission(id=f"{prefix}-{i}", objective="Research stub pricing", max_steps=2) for i in range(n)]
+
+
+def run_benchmark(missions: int = 200, threads: int = 16, concurrency: int = 200, delay_s: float = 0.05) -> dict:
+    os.environ["SKYAGENT_DRY_RUN"] = "false"
+    llm, llm_url = start_stub("litellm", delay_s)
+    sky, sky_url = start_stub("skyvern", delay_s)
+    quiet = lambda channel, payload: None  # noqa: E731
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["AGENT_FS_ROOT"] = str(Path(tmp) / "agentfs")
+
+            orch = Orchestrator(Path(tmp) / "threads.db", llm_url, "bench", sky_url, stream_fn=quiet)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                states = list(pool.map(orch.run_mission, _missions("t", missions)))
+            elapsed = time.perf_counter() - start
+            results["threads"] = {
+                "workers": threads,
+                "seconds": round(elapsed, 3),
+                "missions_per_sec": round(missions / elapsed, 1),
+                "completed": sum(s["state"] == "COMPLETED" for s in states),
+            }
+
+            aorch = AsyncOrchestrator(Path(tmp) / "async.db", llm_url, "bench", sky_url, stream_fn=quiet)
+            start = time.perf_counter()
+            states = asyncio.run(aorch.run_many(_missions("a", missions), concurrency=concurrency))
+            elapsed = time.perf_counter() - start
+            results["asyncio"] = {
+                "concurrency": concurrency,
+                "seconds": round(elapsed, 3),
+                "missions_per_sec": round(missions / elapsed, 1),
+                "completed": sum(s["state"] == "COMPLETED" for s in states),
+            }
+    finally:
+        llm.shutdown()
+        sky.shutdown()
+    results["speedup"] = round(results["asyncio"]["missions_per_sec"] / results["threads"]["missions_per_sec"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
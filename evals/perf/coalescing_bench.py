@@ -0,0 +1,46 @@
+"""Burst of identical planner prompts from concurrent missions: every call hits
+LiteLLM vs single-flight coalescing of in-flight duplicates."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+
+from evals.perf.stubs import start_stub
+from skyagentos.runtime.httpclient import AsyncHttpClient
+from skyagentos.runtime.model_router import ModelRouter
+
+
+async def _burst(router: ModelRouter, missions: int, templates: int) -> list[ModelRouter]:
+    scoped = [router.scoped() for _ in range(missions)]
+    await asyncio.gather(*(r.acomplete("planner", f"plan for template {n % templates}") for n, r in enumerate(scoped)))
+    return scoped
+
+
+def run_benchmark(missions: int = 100, templates: int = 4, delay_s: float = 0.05) -> dict:
+    os.environ["SKYAGENT_DRY_RUN"] = "false"
+    server, url = start_stub("litellm", delay_s=delay_s)
+    results = {}
+    try:
+        for name, roles in (("no_coalescing", {}), ("single_flight", None)):
+            client = AsyncHttpClient()
+            router = ModelRouter(url, "k", budget_usd=1000.0, ahttp=client, coalesce_keys=roles)
+            start = time.perf_counter()
+            scoped = asyncio.run(_burst(router, missions, templates))
+            results[name] = {
+                "missions": missions,
+                "templates": templates,
+                "wall_s": round(time.perf_counter() - start, 3),
+                "llm_requests": client.stats()["requests"],
+                "spend_usd": round(sum(r.spent_usd for r in scoped), 4),
+                "flights": router.flights.stats(),
+            }
+    finally:
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
@@ -0,0 +1,52 @@
+"""Fan-out mission wall time: sequential Dispatcher.dispatch vs DagExecutor."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from services.orchestrator.src.mission.models import StepV2
+from services.orchestrator.src.runtime.dag import DagExecutor, topological_order
+from services.orchestrator.src.runtime.dispatcher import Dispatcher
+
+
+class SleepRuntime:
+    def __init__(self, name: str, delay_s: float):
+        self.name = name
+        self.delay_s = delay_s
+
+    def execute(self, action: str, payload: dict) -> dict:
+        time.sleep(self.delay_s)
+        return {"status": "ok", "runtime": self.name, "action": action}
+
+
+def _mission(sources: int) -> list[StepV2]:
+    runtimes = ["browser", "browser", "desktop", "tools"]
+    steps = [StepV2(step_id=f"src-{i}", mission_id="bench", runtime=runtimes[i % len(runtimes)], action="collect") for i in range(sources)]
+    steps.append(StepV2(step_id="report", mission_id="bench", runtime="workspace", action="summarize", depends_on=[s.step_id for s in steps]))
+    return steps
+
+
+def run_benchmark(sources: int = 8, delay_s: float = 0.05) -> dict:
+    dispatcher = Dispatcher(*(SleepRuntime(n, delay_s) for n in ("browser", "desktop", "workspace", "tools")))
+    limits = {"browser": 4, "desktop": 2, "workspace": 1, "tools": 4}
+
+    steps = {s.step_id: s for s in _mission(sources)}
+    start = time.perf_counter()
+    for sid in topological_order(list(steps.values())):
+        dispatcher.dispatch(steps[sid])
+    sequential = time.perf_counter() - start
+
+    result = DagExecutor(dispatcher, limits=limits).run(_mission(sources))
+    return {
+        "sources": sources,
+        "step_delay_s": delay_s,
+        "sequential_s": round(sequential, 4),
+        "dag_s": result.elapsed_s,
+        "longest_branch_s": 2 * delay_s,
+        "speedup": round(sequential / result.elapsed_s, 2),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
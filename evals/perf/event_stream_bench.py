@@ -0,0 +1,62 @@
+"""Fan-out of run progress to many watchers: publish cost on the orchestrator
+side and publish-to-delivery latency per watcher, one thread per watcher as
+with the SSE endpoint."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from skyagentos.runtime.events import EventBus
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_benchmark(watchers: int = 1000, events: int = 20, interval_s: float = 0.02) -> dict:
+    bus = EventBus()
+    latencies: list[float] = []
+    lock = threading.Lock()
+    ready = threading.Barrier(watchers + 1)
+
+    def watch() -> None:
+        sub = bus.subscribe("run-bench")
+        ready.wait()
+        seen = 0
+        while seen < events and not sub.dropped:
+            batch = sub.get(timeout=5)
+            now = time.time()
+            with lock:
+                latencies.extend(now - e.ts for e in batch)
+            seen += len(batch)
+        sub.close()
+
+    threads = [threading.Thread(target=watch, daemon=True) for _ in range(watchers)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    publish_s = []
+    for n in range(events):
+        start = time.perf_counter()
+        bus.publish("progress", {"run_id": "run-bench", "step": n, "state": "EXECUTING"})
+        publish_s.append(time.perf_counter() - start)
+        time.sleep(interval_s)
+    for t in threads:
+        t.join()
+    return {
+        "watchers": watchers,
+        "events": events,
+        "delivered": len(latencies),
+        "publish_p50_ms": round(_percentile(publish_s, 0.5) * 1000, 3),
+        "publish_max_ms": round(max(publish_s) * 1000, 3),
+        "delivery_p50_ms": round(_percentile(latencies, 0.5) * 1000, 2),
+        "delivery_p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "bus": bus.stats(),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
@@ -0,0 +1,41 @@
+"""Per-call latency: new urllib connection per request vs the shared keep-alive HttpPool."""
+
+from __future__ import annotations
+
+import json
+import time
+from urllib import request
+
+from evals.perf.stubs import start_stub
+from skyagentos.runtime.httpclient import HttpPool
+
+PAYLOAD = {"model": "planner", "messages": [{"role": "user", "content": "plan"}], "temperature": 0.2}
+
+
+def _urllib_call(url: str) -> dict:
+    req = request.Request(url, data=json.dumps(PAYLOAD).encode("utf-8"), headers={"Content-Type": "application/json"}, method="POST")
+    with request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def run_benchmark(calls: int = 500) -> dict:
+    server, base = start_stub("litellm")
+    url = f"{base}/v1/chat/completions"
+    pool = HttpPool()
+    results = {}
+    try:
+        for name, fn in (("urllib_per_call", lambda: _urllib_call(url)), ("pooled_keepalive", lambda: pool.post_json(url, PAYLOAD))):
+            start = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            elapsed = time.perf_counter() - start
+            results[name] = {"calls": calls, "mean_ms": round(elapsed / calls * 1000, 3)}
+        results["pool"] = pool.stats()
+    finally:
+        pool.close()
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
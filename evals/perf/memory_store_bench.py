@@ -0,0 +1,67 @@
+"""Writes/sec for a many-step run: per-call sqlite3.connect vs the pooled MemoryStore."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from skyagentos.memory.migrations import V1_SCHEMA
+from skyagentos.memory.store import MemoryStore
+from skyagentos.models.schemas import Step, TelemetryEvent
+
+
+def _steps(run_id: str, n: int) -> list[tuple[Step, TelemetryEvent]]:
+    out = []
+    for i in range(n):
+        step = Step(id=f"{run_id}-step-{i}", run_id=run_id, role="browser_executor", action="browser.execute", output={"status": "ok"})
+        event = TelemetryEvent(run_id=run_id, step_id=step.id, name="browser_call_ms", value=float(i), tags={"iteration": str(i)})
+        out.append((step, event))
+    return out
+
+
+def _connect_per_call(db: Path, rows: list[tuple[Step, TelemetryEvent]]) -> None:
+    """Baseline: the pre-pooling store opened a connection and committed per write."""
+    with sqlite3.connect(db) as conn:
+        conn.executescript(V1_SCHEMA)
+    for step, event in rows:
+        with sqlite3.connect(db) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO steps (id, run_id, role, action, payload) VALUES (?,?,?,?,?)",
+                (step.id, step.run_id, step.role, step.action, step.model_dump_json()),
+            )
+        with sqlite3.connect(db) as conn:
+            conn.execute(
+                "INSERT INTO telemetry (run_id, step_id, name, value, tags, created_at) VALUES (?,?,?,?,?,?)",
+                (event.run_id, event.step_id, event.name, event.value, json.dumps(event.tags), event.created_at),
+            )
+
+
+def _pooled(db: Path, rows: list[tuple[Step, TelemetryEvent]]) -> None:
+    store = MemoryStore(db)
+    store.init()
+    for step, event in rows:
+        store.save_step(step)
+        store.save_telemetry(event)
+    store.close()
+
+
+def run_benchmark(steps: int = 2000) -> dict:
+    rows = _steps("bench-run", steps)
+    writes = steps * 2
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn in (("connect_per_call", _connect_per_call), ("pooled_wal", _pooled)):
+            db = Path(tmp) / f"{name}.db"
+            start = time.perf_counter()
+            fn(db, rows)
+            elapsed = time.perf_counter() - start
+            results[name] = {"writes": writes, "seconds": round(elapsed, 4), "writes_per_sec": round(writes / elapsed, 1)}
+    results["speedup"] = round(results["pooled_wal"]["writes_per_sec"] / results["connect_per_call"]["writes_per_sec"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
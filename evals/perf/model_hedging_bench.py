@@ -0,0 +1,54 @@
+"""Tail latency of ModelRouter.complete with a primary that stalls on 3% of calls:
+fixed fallback order vs health-tracked hedging."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+
+from skyagentos.runtime.model_health import ModelHealth
+from skyagentos.runtime.model_router import ModelRouter
+
+
+class _SyntheticRouter(ModelRouter):
+    def __init__(self, hedge: bool, seed: int):
+        super().__init__("http://llm", "k", budget_usd=1e9, health=ModelHealth(hedge=hedge, hedge_min_s=0.02))
+        self.rng = random.Random(seed)
+
+    def _call(self, model: str, prompt: str) -> str:
+        if model == "planner":
+            time.sleep(0.5 if self.rng.random() < 0.03 else 0.01)
+        else:
+            time.sleep(0.03)
+        return model
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_benchmark(calls: int = 400) -> dict:
+    results = {}
+    for name, hedge in (("fixed_order", False), ("hedged", True)):
+        router = _SyntheticRouter(hedge, seed=7)
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            router.complete("planner", "plan")
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "calls": calls,
+            "p50_ms": round(_percentile(latencies, 0.5), 2),
+            "p95_ms": round(_percentile(latencies, 0.95), 2),
+            "p99_ms": round(_percentile(latencies, 0.99), 2),
+            "hedges": router.hedges,
+            "hedge_spend_usd": round(router.hedge_spend_usd, 4),
+            "health": router.health.snapshot(),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
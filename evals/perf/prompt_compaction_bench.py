@@ -0,0 +1,48 @@
+"""Prompt size per iteration for a bulky Skyvern result and redundant memory:
+uncompacted prompts (full plan, first 1800 chars of the result JSON, raw memory
+list) vs budgeted prompts from ``PromptContext``."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from skyagentos.runtime.prompt_context import PromptContext, estimate_tokens
+
+
+def _result(n: int) -> dict:
+    return {
+        "run_id": f"tsk_{n}",
+        "html": "<tr><td>cell</td></tr>" * 400,
+        "request": {"prompt": "Collect the quarterly revenue table " * 20, "url": "https://example.com/ir"},
+        "steps": [{"action": "click", "element": f"#row-{i}", "reasoning": "scrolling to the table " * 5} for i in range(30)],
+        "status": "completed" if n % 3 else "failed",
+        "error": None if n % 3 else "table not found after pagination",
+        "extracted_information": {"quarter": "Q3", "revenue": "12.4M"},
+        "evidence": [f"https://example.com/ir/q3/{n}.png", f"https://example.com/ir/q3/{n}.pdf"],
+    }
+
+
+def run_benchmark(iterations: int = 200) -> dict:
+    plan = "\n".join(f"{n}. " + "open the investor relations page and locate the table " * 2 for n in range(1, 25))
+    memory = ["Q3 revenue is on the IR page under Financials"] * 3 + ["IR page", "Use the PDF export, the HTML table paginates " * 8]
+    results = {}
+    for name, ctx in (("uncompacted", PromptContext(enabled=False)), ("compacted", PromptContext())):
+        start = time.perf_counter()
+        validator = [ctx.validator("web", plan, _result(n)) for n in range(iterations)]
+        planner = [ctx.planner("web", "Collect Q3 revenue with citations", "timeout x2; pagination x1", memory) for _ in range(iterations)]
+        build_s = time.perf_counter() - start
+        tokens = [estimate_tokens(p) for p in validator]
+        results[name] = {
+            "validator_tokens_mean": round(sum(tokens) / len(tokens), 1),
+            "validator_tokens_max": max(tokens),
+            "planner_tokens": estimate_tokens(planner[0]),
+            "evidence_kept": sum("/q3/" in p for p in validator) / iterations,
+            "errors_kept": sum("table not found" in p for p in validator) / sum(1 for n in range(iterations) if n % 3 == 0),
+            "build_us_per_prompt": round(build_s / (2 * iterations) * 1e6, 1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
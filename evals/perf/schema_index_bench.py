@@ -0,0 +1,75 @@
+"""Hot-path query latency against row count, before and after the secondary-index migration."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from skyagentos.memory.migrations import MIGRATIONS, migrate
+from skyagentos.memory.store import MemoryStore
+
+QUERIES = {
+    "read_memory": ("SELECT content FROM episodic_memory WHERE namespace=? ORDER BY id DESC LIMIT 20", ("ns-3",)),
+    "run_steps": ("SELECT payload FROM steps WHERE run_id=?", ("run-7",)),
+    "run_telemetry": ("SELECT value FROM telemetry WHERE run_id=? AND name=?", ("run-7", "browser_call_ms")),
+    "next_job": ("SELECT id FROM queue_jobs WHERE state='queued' ORDER BY priority DESC, id LIMIT 1", ()),
+}
+
+
+def _fill(conn: sqlite3.Connection, rows: int) -> None:
+    runs = max(rows // 50, 1)
+    with conn:
+        conn.executemany(
+            "INSERT INTO episodic_memory (namespace, content) VALUES (?,?)",
+            ((f"ns-{i % 16}", f"failure: step {i} timed out") for i in range(rows)),
+        )
+        conn.executemany(
+            "INSERT INTO steps (id, run_id, role, action, payload) VALUES (?,?,?,?,?)",
+            ((f"step-{i}", f"run-{i % runs}", "browser_executor", "browser.execute", "{}") for i in range(rows)),
+        )
+        conn.executemany(
+            "INSERT INTO telemetry (run_id, step_id, name, value, tags, created_at) VALUES (?,?,?,?,?,?)",
+            ((f"run-{i % runs}", f"step-{i}", ("browser_call_ms", "validator_ms")[i % 2], float(i), "{}", "") for i in range(rows)),
+        )
+        # Mostly finished jobs with a small queued tail, as in a long-lived deployment.
+        conn.executemany(
+            "INSERT INTO queue_jobs (run_id, payload, state, priority) VALUES (?,?,?,?)",
+            ((f"run-{i}", "{}", "queued" if i > rows * 0.99 else "done", i % 3) for i in range(rows)),
+        )
+
+
+def _time(conn: sqlite3.Connection, repeat: int) -> dict[str, float]:
+    out = {}
+    for name, (sql, params) in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        out[name] = round((time.perf_counter() - start) / repeat * 1e6, 1)
+    return out
+
+
+def run_benchmark(row_counts: tuple[int, ...] = (1_000, 10_000, 100_000), repeat: int = 50) -> dict:
+    before_indexes = next(m.version for m in MIGRATIONS if m.name == "secondary and partial indexes") - 1
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            store = MemoryStore(Path(tmp) / f"bench-{rows}.db")
+            migrate(store, target=before_indexes)
+            conn = store._conn()
+            _fill(conn, rows)
+            before = _time(conn, repeat)
+            migrate(store)
+            after = _time(conn, repeat)
+            results[str(rows)] = {
+                name: {"before_us": before[name], "after_us": after[name], "speedup": round(before[name] / max(after[name], 0.1), 1)}
+                for name in QUERIES
+            }
+            store.close()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
@@ -0,0 +1,55 @@
+"""Time to first planner token and validator verdict latency: buffered vs streamed completions."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from evals.perf.stubs import start_stub
+from skyagentos.runtime.httpclient import HttpPool
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.streaming import IncrementalJson
+
+
+def _timed(fn) -> tuple[float, float]:
+    first: list[float] = []
+    start = time.perf_counter()
+    fn(lambda _: first or first.append(time.perf_counter() - start))
+    total = time.perf_counter() - start
+    return (first[0] if first else total) * 1000, total * 1000
+
+
+def run_benchmark(calls: int = 20, token_delay_s: float = 0.01) -> dict:
+    os.environ["SKYAGENT_DRY_RUN"] = "false"
+    server, url = start_stub("litellm", token_delay_s=token_delay_s)
+    pool = HttpPool()
+    router = ModelRouter(url, "k", budget_usd=1000.0, http=pool)
+
+    def verdict(on_token):
+        parser = IncrementalJson()
+        router.complete_stream("validator", "check", on_token=lambda d: (parser.feed(d), on_token(d)), stop=lambda _: "passed" in parser.fields)
+
+    cases = {
+        "planner_buffered": lambda on_token: on_token(router.complete("planner", "plan")),
+        "planner_streamed": lambda on_token: router.complete_stream("planner", "plan", on_token=on_token),
+        "validator_buffered": lambda on_token: on_token(router.complete("validator", "check")),
+        "validator_streamed": verdict,
+    }
+    results = {}
+    try:
+        for name, fn in cases.items():
+            samples = [_timed(fn) for _ in range(calls)]
+            results[name] = {
+                "calls": calls,
+                "first_token_ms": round(sum(s[0] for s in samples) / calls, 2),
+                "total_ms": round(sum(s[1] for s in samples) / calls, 2),
+            }
+    finally:
+        pool.close()
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
@@ -0,0 +1,104 @@
+"""Local stub LiteLLM / Skyvern / desktop servers for performance benchmarks."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def _tokens(content: str) -> list[str]:
+    return re.findall(r"\S+\s*", content)
+
+
+def _handler(respond, delay_s: float, token_delay_s: float = 0.0, slots: threading.Semaphore | None = None):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", "0"))
+            payload = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+            if slots is None:
+                return self._reply(payload)
+            # Bounded serving capacity, like a model server with a fixed number of slots.
+            with slots:
+                return self._reply(payload)
+
+        def _reply(self, payload: dict):
+            if delay_s:
+                time.sleep(delay_s)
+            reply = respond(self.path, payload)
+            if payload.get("stream"):
+                return self._stream(reply["choices"][0]["message"]["content"])
+            if token_delay_s and "choices" in reply:
+                # A buffered completion arrives only after every token was generated.
+                time.sleep(token_delay_s * (len(_tokens(reply["choices"][0]["message"]["content"])) - 1))
+            body = json.dumps(reply).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, content: str):
+            """OpenAI-style SSE chat completion, one chunked-encoding chunk per token."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            tokens = [{"choices": [{"delta": {"content": t}}]} for t in _tokens(content)]
+            for n, event in enumerate(tokens + ["[DONE]"]):
+                if n and token_delay_s:
+                    time.sleep(token_delay_s)
+                data = f"data: {event if isinstance(event, str) else json.dumps(event)}\n\n".encode("utf-8")
+                try:
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                    return
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+_BATCH_ITEM = re.compile(r"^### Item (\d+)$", re.M)
+
+
+def _litellm_reply(path: str, payload: dict) -> dict:
+    prompt = "".join(m.get("content", "") for m in payload.get("messages", []))
+    items = _BATCH_ITEM.findall(prompt)
+    if payload.get("model") == "local_reflector" and items:
+        content = json.dumps({"results": [{"id": int(n), "passed": True, "reason": "stub validated", "next_action": "none"} for n in items]})
+    elif payload.get("model") == "local_reflector":
+        content = '{"passed": true, "reason": "stub validated", "next_action": "none"}'
+    else:
+        content = "1. open source page 2. extract figures. Success: figures cited."
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+def _skyvern_reply(path: str, payload: dict) -> dict:
+    return {"status": "ok", "run_id": "stub-run", "summary": "stub task", "evidence": ["https://example.com"], "request": payload}
+
+
+def _desktop_reply(path: str, payload: dict) -> dict:
+    return {"status": "ok", "runtime": "desktop", "action": payload.get("action"), "evidence": "stub.png"}
+
+
+def start_stub(kind: str, delay_s: float = 0.0, token_delay_s: float = 0.0, max_concurrency: int | None = None) -> tuple[ThreadingHTTPServer, str]:
+    respond = {"litellm": _litellm_reply, "skyvern": _skyvern_reply, "desktop": _desktop_reply}[kind]
+    slots = threading.Semaphore(max_concurrency) if max_concurrency else None
+    server = _StubServer(("127.0.0.1", 0), _handler(respond, delay_s, token_delay_s, slots))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,64 @@
+"""Validator calls from many concurrent runs against a LiteLLM stub with a fixed
+number of serving slots: one request per validation vs micro-batched requests
+(one multi-item request per batch, or a bounded parallel burst)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from evals.perf.stubs import start_stub
+from skyagentos.runtime.httpclient import AsyncHttpClient, HttpPool
+from skyagentos.runtime.model_health import ModelHealth
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.validator_batch import BURST, MULTI, ValidatorBatcher
+
+
+def _prompt(n: int) -> str:
+    return f"Return strict JSON only: {{passed:boolean,reason:string,next_action:string}}.\nPlan:\nstep {n}\nRuntime:\nweb\nExecution:\n{{\"status\": \"ok\", \"n\": {n}}}"
+
+
+async def _aburst(router: ModelRouter, runs: int) -> list[str]:
+    return await asyncio.gather(*(router.scoped().acomplete("validator", _prompt(n)) for n in range(runs)))
+
+
+def _burst(router: ModelRouter, runs: int) -> list[str]:
+    with ThreadPoolExecutor(max_workers=runs) as pool:
+        return list(pool.map(lambda n: router.scoped().complete("validator", _prompt(n)), range(runs)))
+
+
+def run_benchmark(runs: int = 64, delay_s: float = 0.05, server_slots: int = 4, window_ms: int = 10, max_batch: int = 16) -> dict:
+    os.environ["SKYAGENT_DRY_RUN"] = "false"
+    os.environ["SKYAGENT_VALIDATOR_BATCH"] = "off"
+    server, url = start_stub("litellm", delay_s=delay_s, max_concurrency=server_slots)
+    results: dict = {}
+    try:
+        for flavor in ("threads", "asyncio"):
+            for name, mode in (("unbatched", None), ("burst", BURST), ("multi_item", MULTI)):
+                http, client = HttpPool(), AsyncHttpClient()
+                router = ModelRouter(url, "k", budget_usd=1000.0, http=http, ahttp=client, health=ModelHealth(hedge=False), coalesce_keys={})
+                if mode is not None:
+                    router.batcher = ValidatorBatcher(router, window_s=window_ms / 1000.0, max_batch=max_batch, mode=mode, concurrency=server_slots)
+                start = time.perf_counter()
+                replies = _burst(router, runs) if flavor == "threads" else asyncio.run(_aburst(router, runs))
+                wall = time.perf_counter() - start
+                assert all(json.loads(r)["passed"] for r in replies)
+                stats = (http if flavor == "threads" else client).stats()
+                results[f"{flavor}_{name}"] = {
+                    "runs": runs,
+                    "wall_s": round(wall, 3),
+                    "validations_per_s": round(runs / wall, 1),
+                    "llm_requests": stats["requests"],
+                    "batches": router.batcher.stats() if router.batcher else None,
+                }
+                http.close()
+    finally:
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
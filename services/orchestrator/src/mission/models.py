@@ -40,6 +40,8 @@ class StepV2:
     output: dict[str, Any] = field(default_factory=dict)
     attempt: int = 1
     state: str = "pending"
+    depends_on: list[str] = field(default_factory=list)
+    max_attempts: int = 1
 
 
 @dataclass
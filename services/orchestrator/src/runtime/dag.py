@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from services.orchestrator.src.mission.models import StepV2, ValidationV2
+from services.orchestrator.src.runtime.dispatcher import Dispatcher
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+DEFAULT_LIMITS = {"browser": 2, "desktop": 1, "workspace": 4, "tools": 8}
+
+
+class StepValidator(Protocol):
+    def validate(self, step: StepV2) -> ValidationV2: ...
+
+
+def runtime_limits() -> dict[str, int]:
+    """Per-runtime concurrency from ``DAG_LIMIT_<RUNTIME>`` env vars."""
+    return {rt: int(os.getenv(f"DAG_LIMIT_{rt.upper()}", str(n))) for rt, n in DEFAULT_LIMITS.items()}
+
+
+def topological_order(steps: list[StepV2]) -> list[str]:
+    ids = {s.step_id for s in steps}
+    if len(ids) != len(steps):
+        raise ValueError("duplicate step ids")
+    indegree = {s.step_id: 0 for s in steps}
+    children: dict[str, list[str]] = {s.step_id: [] for s in steps}
+    for s in steps:
+        for dep in s.depends_on:
+            if dep not in ids:
+                raise ValueError(f"step {s.step_id} depends on unknown step {dep}")
+            indegree[s.step_id] += 1
+            children[dep].append(s.step_id)
+    ready = [sid for sid, n in indegree.items() if n == 0]
+    order = []
+    while ready:
+        sid = ready.pop()
+        order.append(sid)
+        for child in children[sid]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if len(order) != len(steps):
+        raise ValueError("step dependencies contain a cycle")
+    return order
+
+
+@dataclass
+class DagResult:
+    steps: dict[str, StepV2]
+    completed: list[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return all(s.state == SUCCEEDED for s in self.steps.values())
+
+    def failed(self) -> list[str]:
+        return [sid for sid, s in self.steps.items() if s.state in (FAILED, SKIPPED)]
+
+
+class DagExecutor:
+    """Runs a v2 step graph, starting every step whose dependencies have succeeded.
+
+    Independent steps run concurrently on a thread pool, capped per runtime by
+    ``limits``. A step is retried up to ``max_attempts`` times when dispatch
+    raises or the optional validator rejects (or raises on) its output; once it
+    fails for good, everything downstream of it is marked ``skipped`` while
+    unrelated branches carry on. Outputs of dependencies are passed to a step as ``input["upstream"]``.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, limits: dict[str, int] | None = None, validator: StepValidator | None = None):
+        self.dispatcher = dispatcher
+        self.limits = limits if limits is not None else runtime_limits()
+        self.validator = validator
+
+    def run(self, steps: list[StepV2]) -> DagResult:
+        topological_order(steps)
+        for runtime in sorted({s.runtime for s in steps}):
+            if self.limits.get(runtime, 1) < 1:
+                # A zero limit would leave these steps pending forever.
+                raise ValueError(f"runtime {runtime} has no concurrency (limit {self.limits[runtime]})")
+        start = time.perf_counter()
+        result = DagResult(steps={s.step_id: s for s in steps})
+        pending = {s.step_id: s for s in steps}
+        running: dict[Future, StepV2] = {}
+        busy: dict[str, int] = {}
+        workers = max(1, sum(self.limits.get(rt, 1) for rt in {s.runtime for s in steps}))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dag") as pool:
+            while pending or running:
+                self._skip_blocked(result, pending)
+                for step in self._ready(result, pending, busy):
+                    del pending[step.step_id]
+                    busy[step.runtime] = busy.get(step.runtime, 0) + 1
+                    step.state = RUNNING
+                    upstream = {dep: result.steps[dep].output for dep in step.depends_on}
+                    running[pool.submit(self._attempt, step, upstream)] = step
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    busy[step.runtime] -= 1
+                    if future.result():
+                        step.state = SUCCEEDED
+                        result.completed.append(step.step_id)
+                    elif step.attempt < step.max_attempts:
+                        step.attempt += 1
+                        step.state = PENDING
+                        pending[step.step_id] = step
+                    else:
+                        step.state = FAILED
+                        result.completed.append(step.step_id)
+        result.elapsed_s = round(time.perf_counter() - start, 4)
+        return result
+
+    def _ready(self, result: DagResult, pending: dict[str, StepV2], busy: dict[str, int]) -> list[StepV2]:
+        ready = []
+        slots = dict(busy)
+        for step in pending.values():
+            if any(result.steps[dep].state != SUCCEEDED for dep in step.depends_on):
+                continue
+            if slots.get(step.runtime, 0) >= self.limits.get(step.runtime, 1):
+                continue
+            slots[step.runtime] = slots.get(step.runtime, 0) + 1
+            ready.append(step)
+        return ready
+
+    @staticmethod
+    def _skip_blocked(result: DagResult, pending: dict[str, StepV2]) -> None:
+        changed = True
+        while changed:
+            changed = False
+            for sid, step in list(pending.items()):
+                if any(result.steps[dep].state in (FAILED, SKIPPED) for dep in step.depends_on):
+                    step.state = SKIPPED
+                    step.output = {"status": "skipped", "reason": "upstream step failed"}
+                    del pending[sid]
+                    result.completed.append(sid)
+                    changed = True
+
+    def _attempt(self, step: StepV2, upstream: dict[str, dict]) -> bool:
+        if upstream:
+            step.input["upstream"] = upstream
+        try:
+            step.output = self.dispatcher.dispatch(step)
+            if self.validator is None:
+                return step.output.get("status", "ok") != "error"
+            return self.validator.validate(step).passed
+        except Exception as exc:
+            step.output = {"status": "error", "error": str(exc)}
+            return False
@@ -17,13 +17,16 @@ class Dispatcher:
     workspace_worker: RuntimeClient
     tool_worker: RuntimeClient
 
+    def client(self, runtime: str) -> RuntimeClient:
+        if runtime == "browser":
+            return self.browser_worker
+        if runtime == "desktop":
+            return self.desktop_worker
+        if runtime == "workspace":
+            return self.workspace_worker
+        if runtime == "tools":
+            return self.tool_worker
+        raise ValueError(f"unknown runtime: {runtime}")
+
     def dispatch(self, step: StepV2) -> dict:
-        if step.runtime == "browser":
-            return self.browser_worker.execute(step.action, step.input)
-        if step.runtime == "desktop":
-            return self.desktop_worker.execute(step.action, step.input)
-        if step.runtime == "workspace":
-            return self.workspace_worker.execute(step.action, step.input)
-        if step.runtime == "tools":
-            return self.tool_worker.execute(step.action, step.input)
-        raise ValueError(f"unknown runtime: {step.runtime}")
+        return self.client(step.runtime).execute(step.action, step.input)
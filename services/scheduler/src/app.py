@@ -2,6 +2,28 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 
 def jobs() -> list[str]:
-    return ["nightly-index", "retention-cleanup", "model-health-check"]
+    return ["nightly-index", "retention-cleanup", "memory-consolidation", "model-health-check"]
+
+
+def retention_cleanup(store: Any, dry_run: bool = False) -> dict:
+    from skyagentos.memory.retention import RetentionEngine
+
+    return RetentionEngine.from_env(store).run(dry_run=dry_run).as_dict()
+
+
+def memory_consolidation(store: Any) -> dict:
+    from skyagentos.memory.consolidation import MemoryConsolidator
+
+    return MemoryConsolidator.from_env(store).run().as_dict()
+
+
+def run_job(name: str, store: Any) -> dict:
+    if name == "retention-cleanup":
+        return retention_cleanup(store)
+    if name == "memory-consolidation":
+        return memory_consolidation(store)
+    raise KeyError(f"job not implemented: {name}")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from skyagentos.memory.store import MemoryStore
+from skyagentos.runtime.events import EventBus
+from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.stream import StreamFn, default_stream, tee
+from skyagentos.runtime.worker import MissionWorkerPool
+
+
+def _stream_fn(events: EventBus) -> StreamFn:
+    return tee(events.publish, default_stream) if os.getenv("SKYAGENT_STREAM_STDOUT", "true").lower() == "true" else events.publish
+
+
+@dataclass
+class AppContext:
+    """Everything the API process shares across requests, built once at startup.
+
+    The orchestrator owns the store (migrated once), model router, tool clients
+    and their HTTP pools; request threads borrow pooled SQLite connections via
+    ``db()``. ``close`` stops the embedded workers, flushes buffered writes and
+    releases connections.
+    """
+
+    orchestrator: Orchestrator
+    events: EventBus
+    workers: MissionWorkerPool | None = None
+
+    @classmethod
+    def from_env(cls) -> AppContext:
+        events = EventBus.from_env()
+        orchestrator = Orchestrator(
+            db_path=Path(os.getenv("MEMORY_DB_PATH", "/data/memory/skyagentos.db")),
+            litellm_base_url=os.getenv("LITELLM_BASE_URL", "http://litellm:4000"),
+            litellm_key=os.getenv("LITELLM_MASTER_KEY", "skyagentos-dev-key"),
+            skyvern_url=os.getenv("SKYVERN_BASE_URL", "http://skyvern:8000"),
+            stream_fn=_stream_fn(events),
+        )
+        # Missions run on an embedded worker pool unless ORCHESTRATOR_WORKERS=0, in
+        # which case separate `skyagentos worker` processes drain the queue.
+        concurrency = int(os.getenv("ORCHESTRATOR_WORKERS", "2"))
+        workers = MissionWorkerPool(orchestrator, concurrency=concurrency) if concurrency > 0 else None
+        return cls(orchestrator=orchestrator, events=events, workers=workers)
+
+    @property
+    def store(self) -> MemoryStore:
+        return self.orchestrator.store
+
+    @contextmanager
+    def db(self) -> Iterator[MemoryStore]:
+        with self.store.borrowed():
+            yield self.store
+
+    def start(self) -> None:
+        if self.workers is not None:
+            self.workers.start()
+
+    def close(self, timeout: float | None = None) -> None:
+        if self.workers is not None:
+            self.workers.stop(timeout=timeout or float(os.getenv("ORCHESTRATOR_SHUTDOWN_S", "30")))
+        self.orchestrator.close()
+        clients = (self.orchestrator.router, self.orchestrator.skyvern, self.orchestrator.desktop)
+        for http in {id(c.http): c.http for c in clients}.values():
+            http.close()
@@ -10,8 +10,12 @@ from uuid import uuid4
 
 from skyagentos.api.server import run_server
 from skyagentos.config import load_settings
+from skyagentos.memory.consolidation import MemoryConsolidator
+from skyagentos.memory.retention import RetentionEngine
+from skyagentos.memory.store import MemoryStore
 from skyagentos.models.schemas import Mission
 from skyagentos.runtime.orchestrator import Orchestrator, specialist_catalog
+from skyagentos.runtime.worker import MissionWorkerPool
 
 
 def load_template(name: str | None) -> dict:
@@ -67,6 +71,32 @@ def run_benchmark() -> None:
     print(json.dumps({"benchmark": results}, indent=2))
 
 
+def run_worker(args: argparse.Namespace) -> None:
+    pool = MissionWorkerPool(_orchestrator(), concurrency=args.concurrency)
+    print(f"mission workers started: concurrency={pool.concurrency} id={pool.name}")
+    pool.run_forever()
+
+
+def _store() -> MemoryStore:
+    store = MemoryStore(Path(load_settings().memory_db_path))
+    store.init()
+    return store
+
+
+def run_retention(args: argparse.Namespace) -> None:
+    store = _store()
+    report = RetentionEngine.from_env(store).run(dry_run=args.dry_run)
+    store.close()
+    print(json.dumps({"retention": report.as_dict(), "dry_run": args.dry_run}, indent=2))
+
+
+def run_consolidation(args: argparse.Namespace) -> None:
+    store = _store()
+    report = MemoryConsolidator.from_env(store).run(namespace=args.namespace)
+    store.close()
+    print(json.dumps({"consolidation": report.as_dict()}, indent=2))
+
+
 def _check_tcp(host: str, port: int, timeout: float = 1.0) -> bool:
     try:
         with socket.create_connection((host, port), timeout=timeout):
@@ -110,6 +140,12 @@ def main() -> None:
     run_cmd.add_argument("--runtime", choices=["browser", "desktop", "workspace"], default=None)
 
     sub.add_parser("serve", help="Start orchestrator HTTP API")
+    worker_cmd = sub.add_parser("worker", help="Run mission executors draining the job queue")
+    worker_cmd.add_argument("--concurrency", type=int, default=int(os.getenv("SKYAGENT_WORKER_CONCURRENCY", "4")))
+    retention_cmd = sub.add_parser("retention", help="Apply retention policies to memory, telemetry and queue tables")
+    retention_cmd.add_argument("--dry-run", action="store_true", help="Only count the rows that would be removed")
+    consolidate_cmd = sub.add_parser("consolidate", help="Collapse duplicate memory rows and roll up old episodic events")
+    consolidate_cmd.add_argument("--namespace", default=None)
     sub.add_parser("benchmark", help="Run small benchmark/eval harness")
     sub.add_parser("doctor", help="Validate local runtime prerequisites")
     sub.add_parser("up", help="Bring up local stack via scripts/dev/up.sh")
@@ -120,6 +156,12 @@ def main() -> None:
 
     if args.command == "serve":
         run_server()
+    elif args.command == "worker":
+        run_worker(args)
+    elif args.command == "retention":
+        run_retention(args)
+    elif args.command == "consolidate":
+        run_consolidation(args)
     elif args.command == "benchmark":
         run_benchmark()
     elif args.command == "doctor":
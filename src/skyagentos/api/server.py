@@ -2,22 +2,38 @@ from __future__ import annotations
 
 import json
 import os
+import signal
+import threading
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from pathlib import Path
+from typing import ContextManager
+from urllib.parse import parse_qs, urlsplit
 from uuid import uuid4
 
+from skyagentos.api.context import AppContext
 from skyagentos.memory.store import MemoryStore
 from skyagentos.models.schemas import Mission
-from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.events import TERMINAL_STATES
 
 
-def _store() -> MemoryStore:
-    s = MemoryStore(Path(os.getenv("MEMORY_DB_PATH", "/data/memory/skyagentos.db")))
-    s.init()
-    return s
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], handler: type[BaseHTTPRequestHandler], ctx: AppContext):
+        super().__init__(address, handler)
+        self.ctx = ctx
 
 
 class MissionHandler(BaseHTTPRequestHandler):
+    server: ApiServer
+
+    @property
+    def ctx(self) -> AppContext:
+        return self.server.ctx
+
+    def store(self) -> ContextManager[MemoryStore]:
+        """Shared store with a pooled connection lent to this request thread."""
+        return self.ctx.db()
+
     def _json(self, code: int, payload: dict):
         body = json.dumps(payload).encode("utf-8")
         self.send_response(code)
@@ -27,24 +43,87 @@ class MissionHandler(BaseHTTPRequestHandler):
         self.wfile.write(body)
 
     def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.startswith("/runs/") and url.path.endswith("/events"):
+            return self._run_events(url.path.split("/")[2], parse_qs(url.query))
         if self.path.startswith("/runs/"):
             run_id = self.path.split("/")[2]
-            run = _store().get_run_payload(run_id)
+            with self.store() as store:
+                run = store.get_run_payload(run_id)
+                control = store.get_run_control(run_id) if run else None
             if not run:
                 return self._json(404, {"error": "run not found"})
-            return self._json(200, {"run": run, "control": _store().get_run_control(run_id)})
+            return self._json(200, {"run": run, "control": control})
         return self._json(404, {"error": "not found"})
 
+    def _run_events(self, run_id: str, query: dict[str, list[str]]):
+        """Server-sent events for one run, replayed after ``Last-Event-ID`` (or
+        ``?last_event_id=``) when given and starting at the latest event otherwise.
+        The stream ends once the run reaches a terminal state."""
+        bus = self.ctx.events
+        stored = None
+        if not bus.known(run_id):
+            with self.store() as store:
+                stored = store.get_run_payload(run_id)
+            if not stored:
+                return self._json(404, {"error": "run not found"})
+        latest = bus.latest(run_id)
+        last = self.headers.get("Last-Event-ID") or (query.get("last_event_id") or [None])[0]
+        try:
+            last = int(last) if last is not None else (latest.id - 1 if latest else None)
+        except ValueError:
+            return self._json(400, {"error": "invalid Last-Event-ID"})
+        # Finished with nothing left to replay (or finished before this process saw it).
+        done = (latest is not None and latest.payload.get("state") in TERMINAL_STATES and last is not None and last >= latest.id) or (
+            latest is None and (stored or {}).get("state") in TERMINAL_STATES
+        )
+        sub = bus.subscribe(run_id, last)
+        keepalive_s = float(os.getenv("SSE_KEEPALIVE_S", "15"))
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while not done:
+                events = sub.get(timeout=keepalive_s)
+                if not events and not sub.dropped and self._finished_elsewhere(run_id):
+                    return
+                self.wfile.write(b"".join(e.sse() for e in events) or (b"" if sub.dropped else b": keepalive\n\n"))
+                if sub.dropped:
+                    # Too far behind: the client reconnects with its last event id.
+                    self.wfile.write(b"event: dropped\ndata: {}\n\n")
+                self.wfile.flush()
+                if sub.dropped or any(e.payload.get("state") in TERMINAL_STATES for e in events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            sub.close()
+
+    def _finished_elsewhere(self, run_id: str) -> bool:
+        # Runs executed by a separate worker process never reach this bus; fall back to the stored state.
+        with self.store() as store:
+            stored = store.get_run_payload(run_id) or {}
+        if stored.get("state") not in TERMINAL_STATES:
+            return False
+        self.wfile.write(f"event: progress\ndata: {json.dumps({'run_id': run_id, 'state': stored['state']})}\n\n".encode("utf-8"))
+        self.wfile.flush()
+        return True
+
     def do_POST(self):
         if self.path == "/missions":
             return self._create_mission()
         if self.path.startswith("/runs/") and self.path.endswith("/pause"):
             run_id = self.path.split("/")[2]
-            _store().set_run_control(run_id, "paused")
+            with self.store() as store:
+                store.set_run_control(run_id, "paused")
             return self._json(200, {"run_id": run_id, "status": "paused"})
         if self.path.startswith("/runs/") and self.path.endswith("/resume"):
             run_id = self.path.split("/")[2]
-            _store().set_run_control(run_id, "active")
+            with self.store() as store:
+                store.set_run_control(run_id, "active")
             return self._json(200, {"run_id": run_id, "status": "active"})
         return self._json(404, {"error": "not found"})
 
@@ -63,19 +142,32 @@ class MissionHandler(BaseHTTPRequestHandler):
             max_steps=int(payload.get("max_steps", os.getenv("MAX_SELF_CORRECTIONS", "3"))),
             metadata=payload.get("metadata", {}),
         )
-        orchestrator = Orchestrator(
-            db_path=Path(os.getenv("MEMORY_DB_PATH", "/data/memory/skyagentos.db")),
-            litellm_base_url=os.getenv("LITELLM_BASE_URL", "http://litellm:4000"),
-            litellm_key=os.getenv("LITELLM_MASTER_KEY", "skyagentos-dev-key"),
-            skyvern_url=os.getenv("SKYVERN_BASE_URL", "http://skyvern:8000"),
-        )
-        result = orchestrator.run_mission(mission)
-        self._json(200, {"mission_id": mission.id, "result": result})
+        with self.store():
+            try:
+                result = self.ctx.orchestrator.submit(mission, priority=int(payload.get("priority", 0)))
+            except ValueError as exc:
+                return self._json(400, {"error": str(exc)})
+        self._json(202, {"mission_id": mission.id, "run_id": result["run_id"], "result": result})
 
 
-def run_server() -> None:
+def make_server(ctx: AppContext, handler: type[BaseHTTPRequestHandler] = MissionHandler) -> ApiServer:
     host = os.getenv("ORCHESTRATOR_HOST", "0.0.0.0")
     port = int(os.getenv("ORCHESTRATOR_PORT", "8787"))
-    server = ThreadingHTTPServer((host, port), MissionHandler)
-    print(f"orchestrator-api listening on {host}:{port}")
-    server.serve_forever()
+    return ApiServer((host, port), handler, ctx)
+
+
+def run_server(ctx: AppContext | None = None) -> None:
+    ctx = ctx or AppContext.from_env()
+    server = make_server(ctx)
+    if threading.current_thread() is threading.main_thread():
+        # SIGTERM (docker stop) drains like Ctrl-C: stop serving, then close the context.
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    ctx.start()
+    print(f"orchestrator-api listening on {server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        ctx.close()
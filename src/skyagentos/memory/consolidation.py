@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import time
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from skyagentos.memory.retrieval import tokenize
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+CONSOLIDATED_TABLES = ("episodic_memory", "semantic_memory")
+MEMORY_COLUMNS = {
+    "content_hash": "TEXT",
+    "minhash": "BLOB",
+    "dup_count": "INTEGER NOT NULL DEFAULT 1",
+}
+SUMMARY_PREFIX = "summary:"
+NUM_PERM = 32
+_BANDS = 8
+_ROWS = NUM_PERM // _BANDS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(_normalize(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def shingles(text: str, size: int = 5) -> set[int]:
+    norm = _normalize(text)
+    grams = {norm[i : i + size] for i in range(max(1, len(norm) - size + 1))}
+    return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams}
+
+
+def minhash(text: str) -> array:
+    """MinHash signature (``NUM_PERM`` universal hashes) over character 5-gram shingles."""
+    hashes = shingles(text)
+    return array("I", (min((a * h + b) % _PRIME for h in hashes) & 0xFFFFFFFF for a, b in _PERMS))
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def _bands(sig: array) -> list[tuple[int, tuple[int, ...]]]:
+    return [(i, tuple(sig[i * _ROWS : (i + 1) * _ROWS])) for i in range(_BANDS)]
+
+
+@dataclass
+class _Cluster:
+    id: int
+    content: str
+    count: int
+    merged: list[int] = field(default_factory=list)
+
+
+@dataclass
+class ConsolidationReport:
+    merged: dict[str, int] = field(default_factory=dict)
+    rolled_up: int = 0
+    summaries: int = 0
+    namespaces: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class MemoryConsolidator:
+    """Collapses duplicate memory rows and rolls old episodic events into summaries.
+
+    Rows are scanned newest first per namespace. Exact duplicates share a
+    ``content_hash``; near duplicates have an estimated Jaccard similarity of at
+    least ``min_similarity``, with candidates found by LSH over 8 bands of 4
+    MinHash values (pairs at 0.8 similarity collide with ~98% probability). The
+    newest row of a cluster survives with the summed ``dup_count``; the rest are
+    deleted, which also removes them from the search indexes via triggers.
+    Episodic events older than ``rollup_age_days`` collapse into one
+    ``summary:`` row per pass once there are at least ``rollup_min`` of them.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        min_similarity: float = 0.8,
+        rollup_age_days: float = 7.0,
+        rollup_min: int = 20,
+        chunk_size: int = 500,
+    ):
+        self.store = store
+        self.min_similarity = min_similarity
+        self.rollup_age_days = rollup_age_days
+        self.rollup_min = rollup_min
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_env(cls, store: MemoryStore) -> MemoryConsolidator:
+        return cls(
+            store,
+            min_similarity=float(os.getenv("MEMORY_CONSOLIDATE_MIN_SIMILARITY", "0.8")),
+            rollup_age_days=float(os.getenv("MEMORY_CONSOLIDATE_ROLLUP_DAYS", "7")),
+            rollup_min=int(os.getenv("MEMORY_CONSOLIDATE_ROLLUP_MIN", "20")),
+        )
+
+    def run(self, namespace: str | None = None, now: float | None = None) -> ConsolidationReport:
+        start = time.perf_counter()
+        now = time.time() if now is None else now
+        report = ConsolidationReport()
+        seen: set[str] = set()
+        for table in CONSOLIDATED_TABLES:
+            namespaces = [namespace] if namespace is not None else self._namespaces(table)
+            seen.update(namespaces)
+            report.merged[table] = sum(self.dedupe(table, ns) for ns in namespaces)
+        for ns in [namespace] if namespace is not None else self._namespaces("episodic_memory"):
+            rolled = self.rollup(ns, now)
+            report.rolled_up += rolled
+            report.summaries += 1 if rolled else 0
+        report.namespaces = len(seen)
+        report.seconds = round(time.perf_counter() - start, 4)
+        return report
+
+    def _namespaces(self, table: str) -> list[str]:
+        return [row[0] for row in self.store._conn().execute(f"SELECT DISTINCT namespace FROM {table}")]
+
+    def dedupe(self, table: str, namespace: str) -> int:
+        rows = self.store._conn().execute(
+            f"SELECT id, content, content_hash, minhash, dup_count FROM {table} WHERE namespace=? ORDER BY id DESC",
+            (namespace,),
+        ).fetchall()
+        by_hash: dict[str, _Cluster] = {}
+        by_band: dict[tuple[int, tuple[int, ...]], list[tuple[array, _Cluster]]] = {}
+        signatures: list[tuple[str, bytes, int]] = []
+        clusters: list[_Cluster] = []
+        for row_id, content, digest, blob, count in rows:
+            if digest is None or blob is None:
+                digest, sig = content_hash(content), minhash(content)
+                signatures.append((digest, sig.tobytes(), row_id))
+            else:
+                sig = array("I", blob)
+            cluster = by_hash.get(digest) or self._near(by_band, sig)
+            if cluster is not None:
+                cluster.count += count
+                cluster.merged.append(row_id)
+                continue
+            cluster = _Cluster(row_id, content, count)
+            clusters.append(cluster)
+            by_hash[digest] = cluster
+            for band in _bands(sig):
+                by_band.setdefault(band, []).append((sig, cluster))
+
+        merged = [c for c in clusters if c.merged]
+        with self.store.immediate() as conn:
+            conn.executemany(f"UPDATE {table} SET content_hash=?, minhash=? WHERE id=?", signatures)
+        for i in range(0, len(merged), self.chunk_size):
+            with self.store.immediate() as conn:
+                for cluster in merged[i : i + self.chunk_size]:
+                    conn.execute(f"UPDATE {table} SET dup_count=? WHERE id=?", (cluster.count, cluster.id))
+                    conn.executemany(f"DELETE FROM {table} WHERE id=?", ((row_id,) for row_id in cluster.merged))
+        return sum(len(c.merged) for c in merged)
+
+    def _near(self, by_band: dict, sig: array) -> _Cluster | None:
+        for band in _bands(sig):
+            for other, cluster in by_band.get(band, ()):
+                if similarity(other, sig) >= self.min_similarity:
+                    return cluster
+        return None
+
+    def rollup(self, namespace: str, now: float) -> int:
+        cutoff = datetime.fromtimestamp(now - self.rollup_age_days * 86400, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self.store.immediate() as conn:
+            rows = conn.execute(
+                "SELECT id, content, dup_count, created_at FROM episodic_memory "
+                "WHERE namespace=? AND created_at < ? AND content NOT LIKE 'summary:%' ORDER BY id",
+                (namespace, cutoff),
+            ).fetchall()
+            if len(rows) < self.rollup_min:
+                return 0
+            themes: Counter[str] = Counter()
+            for _, content, count, _ in rows:
+                themes[content[:120]] += count
+            total = sum(themes.values())
+            summary = (
+                f"{SUMMARY_PREFIX}{total} events {rows[0][3]} to {rows[-1][3]}: "
+                + "; ".join(f"{theme} x{count}" for theme, count in themes.most_common(8))
+            )
+            conn.executemany("DELETE FROM episodic_memory WHERE id=?", ((row[0],) for row in rows))
+            # Reuse the newest rolled-up id so the summary keeps its place in id order.
+            conn.execute(
+                "INSERT INTO episodic_memory (id, namespace, content, created_at, content_hash, dup_count) VALUES (?,?,?,?,?,?)",
+                (rows[-1][0], namespace, summary, rows[-1][3], content_hash(summary), total),
+            )
+        return len(rows)
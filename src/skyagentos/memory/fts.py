@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+from skyagentos.memory.retrieval import tokenize
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+FTS_TABLES = ("episodic_memory", "semantic_memory")
+
+_FTS_TEMPLATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(content, namespace UNINDEXED, content='{table}', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+  INSERT INTO {fts} (rowid, content, namespace) VALUES (new.id, new.content, new.namespace);
+END;
+CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+  INSERT INTO {fts} ({fts}, rowid, content, namespace) VALUES ('delete', old.id, old.content, old.namespace);
+END;
+CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF content, namespace ON {table} BEGIN
+  INSERT INTO {fts} ({fts}, rowid, content, namespace) VALUES ('delete', old.id, old.content, old.namespace);
+  INSERT INTO {fts} (rowid, content, namespace) VALUES (new.id, new.content, new.namespace);
+END;
+"""
+
+
+def fts_name(table: str) -> str:
+    return table.replace("_memory", "_fts")
+
+
+def match_expression(query: str) -> str:
+    """OR of quoted query terms, so user text can't inject FTS5 syntax."""
+    terms = dict.fromkeys(tokenize(query))
+    return " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+class FullTextSearch:
+    """FTS5 mirrors of episodic/semantic memory, kept in sync by triggers.
+
+    Ranking uses FTS5's built-in ``bm25()`` so relevance is computed inside SQLite.
+    If the SQLite build lacks FTS5, ``enabled`` is False and callers fall back.
+    """
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+        self.enabled = False
+
+    def ensure(self, conn: sqlite3.Connection) -> None:
+        from skyagentos.memory.migrations import execute_script
+
+        try:
+            for table in FTS_TABLES:
+                fts = fts_name(table)
+                exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name=?", (fts,)).fetchone()
+                execute_script(conn, _FTS_TEMPLATE.format(fts=fts, table=table))
+                if not exists:
+                    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+            self.enabled = True
+        except sqlite3.OperationalError as exc:
+            if "fts5" not in str(exc):
+                raise
+            self.enabled = False
+
+    def detect(self, conn: sqlite3.Connection) -> bool:
+        names = [fts_name(t) for t in FTS_TABLES]
+        found = conn.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({','.join('?' * len(names))})", names
+        ).fetchone()[0]
+        self.enabled = found == len(names)
+        return self.enabled
+
+    def search(self, table: str, namespace: str, query: str, k: int = 5) -> list[tuple[int, float, str]]:
+        if table not in FTS_TABLES:
+            raise ValueError(f"no full-text index for table: {table}")
+        expr = match_expression(query)
+        if not expr:
+            return []
+        fts = fts_name(table)
+        return self.store._conn().execute(
+            f"SELECT rowid, bm25({fts}) AS score, content FROM {fts} WHERE {fts} MATCH ? AND namespace = ? ORDER BY score LIMIT ?",
+            (expr, namespace, k),
+        ).fetchall()
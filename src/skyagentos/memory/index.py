@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import heapq
+import math
+import sqlite3
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from skyagentos.memory.retrieval import tokenize
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic_postings (namespace TEXT NOT NULL, term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (namespace, term, doc_id)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_semantic_postings_doc ON semantic_postings (doc_id);
+CREATE TABLE IF NOT EXISTS semantic_terms (namespace TEXT NOT NULL, term TEXT NOT NULL, df INTEGER NOT NULL, PRIMARY KEY (namespace, term)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS semantic_doclen (doc_id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, length INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS semantic_index_stats (namespace TEXT PRIMARY KEY, docs INTEGER NOT NULL, total_len INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS semantic_memory_unindex AFTER DELETE ON semantic_memory BEGIN
+  UPDATE semantic_index_stats
+     SET docs = docs - 1, total_len = total_len - (SELECT length FROM semantic_doclen WHERE doc_id = old.id)
+   WHERE namespace = old.namespace AND EXISTS (SELECT 1 FROM semantic_doclen WHERE doc_id = old.id);
+  UPDATE semantic_terms SET df = df - 1
+   WHERE namespace = old.namespace AND term IN (SELECT term FROM semantic_postings WHERE doc_id = old.id);
+  DELETE FROM semantic_postings WHERE doc_id = old.id;
+  DELETE FROM semantic_doclen WHERE doc_id = old.id;
+END;
+"""
+
+SQL_ADD_POSTING = "INSERT OR REPLACE INTO semantic_postings (namespace, term, doc_id, tf) VALUES (?,?,?,?)"
+SQL_BUMP_DF = "INSERT INTO semantic_terms (namespace, term, df) VALUES (?,?,1) ON CONFLICT(namespace, term) DO UPDATE SET df = df + 1"
+SQL_ADD_DOCLEN = "INSERT OR REPLACE INTO semantic_doclen (doc_id, namespace, length) VALUES (?,?,?)"
+SQL_BUMP_STATS = (
+    "INSERT INTO semantic_index_stats (namespace, docs, total_len) VALUES (?,1,?) "
+    "ON CONFLICT(namespace) DO UPDATE SET docs = docs + 1, total_len = total_len + excluded.total_len"
+)
+SQL_POSTINGS = (
+    "SELECT p.doc_id, p.tf, d.length FROM semantic_postings p JOIN semantic_doclen d ON d.doc_id = p.doc_id "
+    "WHERE p.namespace=? AND p.term=?"
+)
+
+
+class SemanticIndex:
+    """Incremental BM25 inverted index over ``semantic_memory``.
+
+    Postings, document frequencies and document lengths are written in the same
+    transaction as the memory row, and removed by a trigger when the row is
+    deleted. A query only reads the posting lists of its own terms, so cost scales
+    with matching postings rather than namespace size; terms present in more than
+    ``max_df_ratio`` of documents carry almost no BM25 weight and are skipped when
+    the query has rarer terms.
+    """
+
+    def __init__(self, store: MemoryStore, k1: float = 1.2, b: float = 0.75, max_df_ratio: float = 0.5):
+        self.store = store
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+
+    def add(self, conn: sqlite3.Connection, namespace: str, doc_id: int, content: str) -> None:
+        terms = Counter(tokenize(content))
+        conn.executemany(SQL_ADD_POSTING, [(namespace, t, doc_id, tf) for t, tf in terms.items()])
+        conn.executemany(SQL_BUMP_DF, [(namespace, t) for t in terms])
+        conn.execute(SQL_ADD_DOCLEN, (doc_id, namespace, sum(terms.values())))
+        conn.execute(SQL_BUMP_STATS, (namespace, sum(terms.values())))
+
+    def backfill(self, batch: int = 1000) -> int:
+        """Index rows written before the index existed (or by other writers)."""
+        indexed = 0
+        while True:
+            with self.store._conn() as conn:
+                rows = conn.execute(
+                    "SELECT id, namespace, content FROM semantic_memory "
+                    "WHERE id > (SELECT COALESCE(MAX(doc_id), 0) FROM semantic_doclen) ORDER BY id LIMIT ?",
+                    (batch,),
+                ).fetchall()
+                for doc_id, namespace, content in rows:
+                    self.add(conn, namespace, doc_id, content)
+            indexed += len(rows)
+            if len(rows) < batch:
+                return indexed
+
+    def search(self, namespace: str, query: str, k: int = 5) -> list[tuple[int, float]]:
+        conn = self.store._conn()
+        stats = conn.execute("SELECT docs, total_len FROM semantic_index_stats WHERE namespace=?", (namespace,)).fetchone()
+        if not stats or stats[0] <= 0:
+            return []
+        n_docs, avg_len = stats[0], max(1.0, stats[1] / stats[0])
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        placeholders = ",".join("?" * len(terms))
+        dfs = dict(
+            conn.execute(
+                f"SELECT term, df FROM semantic_terms WHERE namespace=? AND df > 0 AND term IN ({placeholders})",
+                (namespace, *terms),
+            ).fetchall()
+        )
+        if not dfs:
+            return []
+        rare = {t: df for t, df in dfs.items() if df <= self.max_df_ratio * n_docs}
+        scores: dict[int, float] = {}
+        for term, df in (rare or dfs).items():
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf, length in conn.execute(SQL_POSTINGS, (namespace, term)):
+                norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_len))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+        return heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], kv[0]))
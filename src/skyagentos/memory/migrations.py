@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from skyagentos.memory.consolidation import CONSOLIDATED_TABLES, MEMORY_COLUMNS
+from skyagentos.memory.index import INDEX_SCHEMA
+from skyagentos.memory.queue import QUEUE_COLUMNS
+from skyagentos.memory.themes import THEME_SCHEMA
+from skyagentos.memory.vectors import VECTOR_SCHEMA
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+# SQLite counterpart of data/migrations/*.sql (which target Postgres). Every step
+# is idempotent, so databases created before versioning was introduced simply
+# get their existing objects recorded on first start.
+MIGRATIONS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at REAL NOT NULL)"
+)
+
+# Frozen: databases that recorded version 1 ran exactly this. Schema changes go in
+# new numbered migrations, never here.
+V1_SCHEMA = """
+CREATE TABLE IF NOT EXISTS missions (id TEXT PRIMARY KEY, payload TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS runs (id TEXT PRIMARY KEY, mission_id TEXT NOT NULL, state TEXT NOT NULL, payload TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS steps (id TEXT PRIMARY KEY, run_id TEXT NOT NULL, role TEXT NOT NULL, action TEXT NOT NULL, payload TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS artifacts (id TEXT PRIMARY KEY, run_id TEXT NOT NULL, step_id TEXT NOT NULL, payload TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS queue_jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'queued', priority INTEGER NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL DEFAULT 3, lease_until REAL, worker_id TEXT, last_error TEXT, updated_at REAL);
+CREATE TABLE IF NOT EXISTS telemetry (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, step_id TEXT NOT NULL, name TEXT NOT NULL, value REAL NOT NULL, tags TEXT NOT NULL, created_at TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS episodic_memory (id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT NOT NULL, content TEXT NOT NULL, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS semantic_memory (id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT NOT NULL, content TEXT NOT NULL, embedding_hint TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS run_controls (run_id TEXT PRIMARY KEY, status TEXT NOT NULL, updated_at TEXT DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE IF NOT EXISTS model_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_hit REAL NOT NULL);
+"""
+
+SECONDARY_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_runs_mission ON runs(mission_id);
+CREATE INDEX IF NOT EXISTS idx_steps_run ON steps(run_id);
+CREATE INDEX IF NOT EXISTS idx_artifacts_run ON artifacts(run_id);
+CREATE INDEX IF NOT EXISTS idx_telemetry_run_name ON telemetry(run_id, name);
+CREATE INDEX IF NOT EXISTS idx_episodic_ns_id ON episodic_memory(namespace, id DESC);
+CREATE INDEX IF NOT EXISTS idx_semantic_ns_id ON semantic_memory(namespace, id DESC);
+CREATE INDEX IF NOT EXISTS idx_queue_jobs_ready ON queue_jobs(priority DESC, id) WHERE state='queued';
+CREATE INDEX IF NOT EXISTS idx_queue_jobs_leased ON queue_jobs(lease_until) WHERE state='processing';
+CREATE INDEX IF NOT EXISTS idx_queue_jobs_run ON queue_jobs(run_id);
+CREATE INDEX IF NOT EXISTS idx_model_cache_last_hit ON model_cache(last_hit);
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[MemoryStore, sqlite3.Connection], None]
+    # Work that cannot run inside a transaction (VACUUM), done after the version is recorded.
+    after: Callable[[MemoryStore, sqlite3.Connection], None] | None = None
+
+
+def execute_script(conn: sqlite3.Connection, sql: str) -> None:
+    """Like ``executescript`` but without its implicit COMMIT, so the statements
+    stay inside the migration's transaction."""
+    statement = ""
+    for part in sql.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \t\n;"):
+                conn.execute(statement)
+            statement = ""
+
+
+def _script(sql: str) -> Callable[[MemoryStore, sqlite3.Connection], None]:
+    return lambda store, conn: execute_script(conn, sql)
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, columns: dict[str, str]) -> None:
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+def _queue_lease_columns(store: MemoryStore, conn: sqlite3.Connection) -> None:
+    _add_columns(conn, "queue_jobs", QUEUE_COLUMNS)
+
+
+def _consolidation_columns(store: MemoryStore, conn: sqlite3.Connection) -> None:
+    for table in CONSOLIDATED_TABLES:
+        _add_columns(conn, table, MEMORY_COLUMNS)
+
+
+def _full_text(store: MemoryStore, conn: sqlite3.Connection) -> None:
+    store.fts.ensure(conn)
+
+
+def _incremental_vacuum(store: MemoryStore, conn: sqlite3.Connection) -> None:
+    # auto_vacuum only changes on a VACUUM once tables exist; after this, retention
+    # can hand freed pages back with PRAGMA incremental_vacuum.
+    # Runs outside the migration transaction (VACUUM cannot run inside one).
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+
+
+def _episodic_themes(store: MemoryStore, conn: sqlite3.Connection) -> None:
+    execute_script(conn, THEME_SCHEMA)
+    store.themes.rebuild(conn)
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "core tables", _script(V1_SCHEMA)),
+    Migration(2, "queue lease columns", _queue_lease_columns),
+    Migration(3, "semantic inverted index", _script(INDEX_SCHEMA)),
+    Migration(4, "semantic vectors", _script(VECTOR_SCHEMA)),
+    Migration(5, "full-text search", _full_text),
+    Migration(6, "secondary and partial indexes", _script(SECONDARY_INDEXES)),
+    Migration(7, "incremental auto-vacuum", _script(""), after=_incremental_vacuum),
+    Migration(8, "memory consolidation columns", _consolidation_columns),
+    Migration(9, "episodic themes", _episodic_themes),
+]
+
+
+def applied_versions(conn: sqlite3.Connection) -> set[int]:
+    conn.execute(MIGRATIONS_SCHEMA)
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+
+
+def migrate(store: MemoryStore, target: int | None = None) -> list[int]:
+    """Apply pending migrations in version order; returns the versions applied.
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction and re-checks
+    ``schema_migrations`` once it holds the write lock, so processes starting
+    together apply every version exactly once. ``after`` steps are idempotent
+    and re-run on every start, so one interrupted after its version was
+    recorded (e.g. a VACUUM that hit SQLITE_BUSY) is completed later.
+    """
+    conn = store._conn()
+    done = applied_versions(conn)
+    applied = []
+    for migration in MIGRATIONS:
+        if target is not None and migration.version > target:
+            break
+        if migration.version not in done:
+            with store.immediate() as conn:
+                if migration.version not in applied_versions(conn):
+                    migration.apply(store, conn)
+                    conn.execute(
+                        "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?,?,?)",
+                        (migration.version, migration.name, time.time()),
+                    )
+                    applied.append(migration.version)
+        if migration.after is not None:
+            migration.after(store, conn)
+    return applied
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+DEAD = "dead"
+
+# Columns added on top of the original (id, run_id, payload, state) table.
+QUEUE_COLUMNS = {
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "max_attempts": "INTEGER NOT NULL DEFAULT 3",
+    "lease_until": "REAL",
+    "worker_id": "TEXT",
+    "last_error": "TEXT",
+    "updated_at": "REAL",
+}
+
+SQL_DEAD_LETTER_EXPIRED = (
+    "UPDATE queue_jobs SET state='dead', last_error='lease expired on final attempt', updated_at=? "
+    "WHERE state='processing' AND lease_until < ? AND attempts >= max_attempts"
+)
+SQL_REQUEUE_EXPIRED = (
+    "UPDATE queue_jobs SET state='queued', worker_id=NULL, lease_until=NULL, updated_at=? "
+    "WHERE state='processing' AND lease_until < ?"
+)
+# Expired leases are requeued first so the claim itself only reads the
+# idx_queue_jobs_ready partial index, already in (priority DESC, id) order.
+SQL_CLAIM = (
+    "UPDATE queue_jobs SET state='processing', worker_id=?, lease_until=?, attempts=attempts+1, updated_at=? "
+    "WHERE id IN ("
+    "SELECT id FROM queue_jobs WHERE state='queued' ORDER BY priority DESC, id LIMIT ?"
+    ") RETURNING id, run_id, payload, priority, attempts, max_attempts"
+)
+SQL_CLAIM_ONE = (
+    "UPDATE queue_jobs SET state='processing', worker_id=?, lease_until=?, attempts=attempts+1, updated_at=? "
+    "WHERE id=? AND (state='queued' OR (state='processing' AND lease_until < ?)) "
+    "RETURNING id, run_id, payload, priority, attempts, max_attempts"
+)
+
+
+@dataclass
+class QueueJob:
+    id: int
+    run_id: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = 3
+    worker_id: str = ""
+
+
+class JobQueue:
+    """Leased job queue over ``queue_jobs``, safe across threads and processes.
+
+    Claims run inside ``BEGIN IMMEDIATE`` so only one writer can pick rows at a
+    time. A claimed job carries a lease; if the worker stops heartbeating, the job
+    becomes claimable again once the lease expires, and a job whose final attempt
+    expires or fails is moved to the ``dead`` state.
+    """
+
+    def __init__(self, store: MemoryStore, lease_s: float | None = None, max_attempts: int | None = None):
+        self.store = store
+        self.lease_s = lease_s if lease_s is not None else float(os.getenv("QUEUE_LEASE_S", "300"))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+
+    def enqueue(self, run_id: str, payload: dict[str, Any], priority: int = 0, max_attempts: int | None = None) -> int:
+        with self.store._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO queue_jobs (run_id, payload, state, priority, max_attempts, updated_at) VALUES (?,?,'queued',?,?,?)",
+                (run_id, json.dumps(payload), priority, max_attempts or self.max_attempts, time.time()),
+            )
+            return int(cur.lastrowid)
+
+    def claim(self, worker_id: str, n: int = 1, lease_s: float | None = None) -> list[QueueJob]:
+        now = time.time()
+        with self.store.immediate() as conn:
+            conn.execute(SQL_DEAD_LETTER_EXPIRED, (now, now))
+            conn.execute(SQL_REQUEUE_EXPIRED, (now, now))
+            rows = conn.execute(SQL_CLAIM, (worker_id, now + (lease_s or self.lease_s), now, n)).fetchall()
+        jobs = [self._job(row, worker_id) for row in rows]
+        jobs.sort(key=lambda j: (-j.priority, j.id))
+        return jobs
+
+    def dequeue(self, worker_id: str, lease_s: float | None = None) -> QueueJob | None:
+        jobs = self.claim(worker_id, 1, lease_s)
+        return jobs[0] if jobs else None
+
+    def claim_job(self, job_id: int, worker_id: str, lease_s: float | None = None) -> QueueJob | None:
+        now = time.time()
+        with self.store.immediate() as conn:
+            row = conn.execute(SQL_CLAIM_ONE, (worker_id, now + (lease_s or self.lease_s), now, job_id, now)).fetchone()
+        return self._job(row, worker_id) if row else None
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_s: float | None = None) -> bool:
+        """Extend the lease; returns False if the job is no longer held by this worker."""
+        now = time.time()
+        with self.store._conn() as conn:
+            cur = conn.execute(
+                "UPDATE queue_jobs SET lease_until=?, updated_at=? WHERE id=? AND state='processing' AND worker_id=?",
+                (now + (lease_s or self.lease_s), now, job_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def ack(self, job_id: int, worker_id: str | None = None) -> bool:
+        sql = "UPDATE queue_jobs SET state='done', lease_until=NULL, updated_at=? WHERE id=?"
+        params: tuple[Any, ...] = (time.time(), job_id)
+        if worker_id is not None:
+            sql += " AND state='processing' AND worker_id=?"
+            params += (worker_id,)
+        with self.store._conn() as conn:
+            return conn.execute(sql, params).rowcount == 1
+
+    def fail(self, job_id: int, error: str, worker_id: str | None = None, retry: bool = True) -> str | None:
+        """Requeue a failed job, or dead-letter it when out of attempts. Returns the new state."""
+        with self.store.immediate() as conn:
+            row = conn.execute("SELECT attempts, max_attempts, state, worker_id FROM queue_jobs WHERE id=?", (job_id,)).fetchone()
+            if not row or row[2] != PROCESSING or (worker_id is not None and row[3] != worker_id):
+                return None
+            state = QUEUED if retry and row[0] < row[1] else DEAD
+            conn.execute(
+                "UPDATE queue_jobs SET state=?, last_error=?, lease_until=NULL, worker_id=NULL, updated_at=? WHERE id=?",
+                (state, error[:1000], time.time(), job_id),
+            )
+        return state
+
+    def requeue_expired(self) -> int:
+        """Eagerly return expired leases to the queue (claims also pick them up)."""
+        now = time.time()
+        with self.store.immediate() as conn:
+            conn.execute(SQL_DEAD_LETTER_EXPIRED, (now, now))
+            cur = conn.execute(SQL_REQUEUE_EXPIRED, (now, now))
+        return cur.rowcount
+
+    def stats(self) -> dict[str, int]:
+        rows = self.store._conn().execute("SELECT state, COUNT(*) FROM queue_jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    @staticmethod
+    def _job(row: tuple, worker_id: str) -> QueueJob:
+        return QueueJob(
+            id=row[0],
+            run_id=row[1],
+            payload=json.loads(row[2]),
+            priority=row[3],
+            attempts=row[4],
+            max_attempts=row[5],
+            worker_id=worker_id,
+        )
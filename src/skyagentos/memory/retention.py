@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+
+def _sqlite_timestamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _iso_timestamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+@dataclass(frozen=True)
+class _Table:
+    name: str
+    time_column: str
+    time_value: Callable[[float], Any]
+    namespace_column: str | None = None
+    # Rows outside this filter are never touched (e.g. queue jobs still in flight).
+    eligible: str = "1=1"
+
+
+TABLES = {
+    t.name: t
+    for t in (
+        _Table("episodic_memory", "created_at", _sqlite_timestamp, "namespace"),
+        _Table("semantic_memory", "created_at", _sqlite_timestamp, "namespace"),
+        _Table("telemetry", "created_at", _iso_timestamp),
+        # Jobs finished before queue_jobs had updated_at have none; they count as oldest.
+        _Table("queue_jobs", "COALESCE(updated_at, 0)", float, eligible="state IN ('done','dead')"),
+    )
+}
+
+
+@dataclass
+class RetentionPolicy:
+    """Which rows of ``table`` may go: older than ``max_age_days`` or beyond the
+    newest ``max_rows``, but never the newest ``keep_last``. Limits apply per
+    namespace; a policy with ``namespace`` set overrides the table-wide one."""
+
+    table: str
+    max_age_days: float | None = None
+    max_rows: int | None = None
+    keep_last: int = 0
+    namespace: str | None = None
+    archive: bool = True
+
+    def __post_init__(self) -> None:
+        if self.table not in TABLES:
+            raise ValueError(f"no retention support for table: {self.table}")
+
+
+# semantic_memory is learned knowledge and has no default limit; opt in via RETENTION_POLICIES.
+DEFAULT_POLICIES = [
+    RetentionPolicy("queue_jobs", max_age_days=7, archive=False),
+    RetentionPolicy("telemetry", max_age_days=30),
+    RetentionPolicy("episodic_memory", max_age_days=90, keep_last=200),
+]
+
+
+@dataclass
+class RetentionReport:
+    deleted: dict[str, int] = field(default_factory=dict)
+    archived: int = 0
+    chunks: int = 0
+    vacuumed_pages: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class RetentionEngine:
+    """Applies retention policies in small chunks so the write lock is held briefly.
+
+    Each chunk is selected, archived to ``<archive_dir>/<table>/<date>.jsonl.gz``
+    and deleted inside one ``BEGIN IMMEDIATE`` transaction; the engine sleeps
+    ``pause_s`` between chunks to let other writers in. Freed pages are returned
+    to the filesystem with ``PRAGMA incremental_vacuum``.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        policies: list[RetentionPolicy] | None = None,
+        archive_dir: Path | None = None,
+        chunk_size: int = 500,
+        pause_s: float = 0.0,
+        vacuum_pages: int = 2000,
+    ):
+        self.store = store
+        self.policies = list(DEFAULT_POLICIES if policies is None else policies)
+        self.archive_dir = archive_dir
+        self.chunk_size = chunk_size
+        self.pause_s = pause_s
+        self.vacuum_pages = vacuum_pages
+
+    @classmethod
+    def from_env(cls, store: MemoryStore) -> RetentionEngine:
+        raw = os.getenv("RETENTION_POLICIES", "")
+        policies = [RetentionPolicy(**item) for item in json.loads(raw)] if raw else None
+        archive = os.getenv("RETENTION_ARCHIVE_DIR", "")
+        return cls(
+            store,
+            policies=policies,
+            archive_dir=Path(archive) if archive else None,
+            chunk_size=int(os.getenv("RETENTION_CHUNK_ROWS", "500")),
+            pause_s=int(os.getenv("RETENTION_PAUSE_MS", "0")) / 1000.0,
+        )
+
+    def run(self, now: float | None = None, dry_run: bool = False) -> RetentionReport:
+        start = time.perf_counter()
+        now = time.time() if now is None else now
+        report = RetentionReport()
+        self.store.flush()
+        for table in TABLES.values():
+            policies = [p for p in self.policies if p.table == table.name]
+            if not policies:
+                continue
+            overrides = {p.namespace: p for p in policies if p.namespace is not None}
+            default = next((p for p in policies if p.namespace is None), None)
+            for namespace in self._namespaces(table, overrides, default):
+                policy = overrides.get(namespace, default) if namespace is not None else default
+                if policy is None:
+                    continue
+                where, params = self._victims(table, policy, namespace, now)
+                if where is None:
+                    continue
+                deleted = self._count(table, where, params) if dry_run else self._purge(table, policy, where, params, now, report)
+                report.deleted[table.name] = report.deleted.get(table.name, 0) + deleted
+        if not dry_run and any(report.deleted.values()):
+            report.vacuumed_pages = self.vacuum()
+        report.seconds = round(time.perf_counter() - start, 4)
+        return report
+
+    def vacuum(self, pages: int | None = None) -> int:
+        conn = self.store._conn()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages or self.vacuum_pages)})").fetchall()
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def _namespaces(self, table: _Table, overrides: dict, default: RetentionPolicy | None) -> list[str | None]:
+        if table.namespace_column is None:
+            return [None]
+        if default is None:
+            return list(overrides)
+        col = table.namespace_column
+        return [row[0] for row in self.store._conn().execute(f"SELECT DISTINCT {col} FROM {table.name}")]
+
+    def _nth_newest_id(self, table: _Table, namespace: str | None, n: int) -> int | None:
+        sql = f"SELECT id FROM {table.name} WHERE {table.eligible}"
+        params: tuple[Any, ...] = ()
+        if namespace is not None:
+            sql += f" AND {table.namespace_column}=?"
+            params = (namespace,)
+        row = self.store._conn().execute(sql + " ORDER BY id DESC LIMIT 1 OFFSET ?", params + (n - 1,)).fetchone()
+        return row[0] if row else None
+
+    def _victims(self, table: _Table, policy: RetentionPolicy, namespace: str | None, now: float) -> tuple[str | None, tuple]:
+        expired: list[str] = []
+        params: list[Any] = []
+        if policy.max_age_days is not None:
+            expired.append(f"{table.time_column} < ?")
+            params.append(table.time_value(now - policy.max_age_days * 86400))
+        if policy.max_rows is not None:
+            cap = self._nth_newest_id(table, namespace, policy.max_rows + 1)
+            if cap is not None:
+                expired.append("id <= ?")
+                params.append(cap)
+        if not expired:
+            return None, ()
+        where = f"{table.eligible} AND ({' OR '.join(expired)})"
+        if namespace is not None:
+            where += f" AND {table.namespace_column}=?"
+            params.append(namespace)
+        if policy.keep_last > 0:
+            protected = self._nth_newest_id(table, namespace, policy.keep_last)
+            if protected is not None:
+                where += " AND id < ?"
+                params.append(protected)
+        return where, tuple(params)
+
+    def _count(self, table: _Table, where: str, params: tuple) -> int:
+        return self.store._conn().execute(f"SELECT COUNT(*) FROM {table.name} WHERE {where}", params).fetchone()[0]
+
+    def _purge(self, table: _Table, policy: RetentionPolicy, where: str, params: tuple, now: float, report: RetentionReport) -> int:
+        archive = self._archive_path(table, now) if policy.archive and self.archive_dir is not None else None
+        select = f"SELECT * FROM {table.name} WHERE {where} ORDER BY id LIMIT ?"
+        total = 0
+        while True:
+            with self.store.immediate() as conn:
+                cur = conn.execute(select, params + (self.chunk_size,))
+                columns = [d[0] for d in cur.description]
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                if archive is not None:
+                    self._append(archive, columns, rows)
+                    report.archived += len(rows)
+                conn.executemany(f"DELETE FROM {table.name} WHERE id=?", ((row[0],) for row in rows))
+            total += len(rows)
+            report.chunks += 1
+            if len(rows) < self.chunk_size:
+                break
+            if self.pause_s:
+                time.sleep(self.pause_s)
+        return total
+
+    def _archive_path(self, table: _Table, now: float) -> Path:
+        day = datetime.fromtimestamp(now, tz=timezone.utc).strftime("%Y-%m-%d")
+        return self.archive_dir / table.name / f"{day}.jsonl.gz"
+
+    @staticmethod
+    def _append(path: Path, columns: list[str], rows: list[tuple]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Each chunk is its own gzip member; concatenated members read back as one stream.
+        with gzip.open(path, "at", encoding="utf-8") as fh:
+            for row in rows:
+                fh.write(json.dumps(dict(zip(columns, row))) + "\n")
@@ -3,8 +3,13 @@ from __future__ import annotations
 from collections import Counter
 
 
+def tokenize(text: str) -> list[str]:
+    terms = (t.strip('.,:;!?()[]{}"\'').lower() for t in text.split())
+    return [t for t in terms if t]
+
+
 def _tokenize(text: str) -> set[str]:
-    return {t.strip('.,:;!?()[]{}"\'').lower() for t in text.split() if t.strip()}
+    return set(tokenize(text))
 
 
 def semantic_rank(query: str, docs: list[str], k: int = 5) -> list[str]:
@@ -1,116 +1,286 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-from skyagentos.models.schemas import Artifact, Mission, Run, Step, TelemetryEvent
+from skyagentos.memory.consolidation import content_hash
+from skyagentos.memory.fts import FullTextSearch
+from skyagentos.memory.index import SemanticIndex
+from skyagentos.memory.migrations import migrate
+from skyagentos.memory.queue import JobQueue
+from skyagentos.memory.retrieval import semantic_rank
+from skyagentos.memory.themes import ThemeIndex
+from skyagentos.memory.vectors import VectorIndex
+from skyagentos.memory.write_buffer import WriteBehindBuffer
+from skyagentos.models.schemas import Artifact, Mission, Run, RunState, Step, TelemetryEvent
+
+# SQL is kept in module constants so sqlite3's per-connection statement cache
+# (keyed on the exact SQL text) reuses the prepared statements across calls.
+SQL_SAVE_MISSION = "INSERT OR REPLACE INTO missions (id,payload) VALUES (?,?)"
+SQL_SAVE_RUN = "INSERT OR REPLACE INTO runs (id, mission_id, state, payload) VALUES (?,?,?,?)"
+SQL_GET_RUN = "SELECT payload FROM runs WHERE id=?"
+SQL_SAVE_STEP = "INSERT OR REPLACE INTO steps (id, run_id, role, action, payload) VALUES (?,?,?,?,?)"
+SQL_SAVE_ARTIFACT = "INSERT OR REPLACE INTO artifacts (id, run_id, step_id, payload) VALUES (?,?,?,?)"
+SQL_SAVE_TELEMETRY = "INSERT INTO telemetry (run_id, step_id, name, value, tags, created_at) VALUES (?,?,?,?,?,?)"
+SQL_SET_CONTROL = (
+    "INSERT INTO run_controls (run_id, status) VALUES (?,?) "
+    "ON CONFLICT(run_id) DO UPDATE SET status=excluded.status, updated_at=CURRENT_TIMESTAMP"
+)
+SQL_GET_CONTROL = "SELECT status FROM run_controls WHERE run_id=?"
+SQL_PUSH_EPISODIC = "INSERT INTO episodic_memory (namespace,content,content_hash) VALUES (?,?,?)"
+SQL_PUSH_SEMANTIC = "INSERT INTO semantic_memory (namespace,content,embedding_hint,content_hash) VALUES (?,?,?,?)"
+
+# Saving a run in one of these states drains the write-behind buffer first, so a
+# reader that sees the final run state also sees every step/artifact/telemetry row.
+FLUSH_ON_STATES = {RunState.COMPLETED, RunState.FAILED, RunState.HUMAN_REVIEW}
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
 
 
 class MemoryStore:
-    def __init__(self, db_path: Path):
+    """SQLite-backed run/memory store with one long-lived connection per thread.
+
+    Connections run in WAL mode so readers never block the writer; the remaining
+    pragmas are tunable through the constructor or ``MEMORY_DB_*`` env vars.
+    With ``write_behind`` enabled, steps, artifacts and telemetry are buffered and
+    written in batches off the caller's thread (see ``WriteBehindBuffer``).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        synchronous: str | None = None,
+        cache_size_kb: int | None = None,
+        mmap_size_mb: int | None = None,
+        busy_timeout_ms: int | None = None,
+        statement_cache_size: int = 128,
+        write_behind: bool | None = None,
+    ):
         self.db_path = db_path
+        self.synchronous = (synchronous or os.getenv("MEMORY_DB_SYNCHRONOUS", "NORMAL")).upper()
+        self.cache_size_kb = cache_size_kb if cache_size_kb is not None else _env_int("MEMORY_DB_CACHE_KB", 16384)
+        self.mmap_size_mb = mmap_size_mb if mmap_size_mb is not None else _env_int("MEMORY_DB_MMAP_MB", 64)
+        self.busy_timeout_ms = busy_timeout_ms if busy_timeout_ms is not None else _env_int("MEMORY_DB_BUSY_TIMEOUT_MS", 30000)
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns: list[sqlite3.Connection] = []
+        self._idle: list[sqlite3.Connection] = []
+        if write_behind is None:
+            write_behind = os.getenv("MEMORY_WRITE_BEHIND", "true").lower() == "true"
+        self.buffer = (
+            WriteBehindBuffer(
+                self,
+                max_batch=_env_int("MEMORY_WRITE_BEHIND_BATCH", 256),
+                flush_interval_s=_env_int("MEMORY_WRITE_BEHIND_INTERVAL_MS", 250) / 1000.0,
+            )
+            if write_behind
+            else None
+        )
+        self.queue = JobQueue(self)
+        self.index = SemanticIndex(self)
+        self.vectors = VectorIndex(self)
+        self.fts = FullTextSearch(self)
+        self.themes = ThemeIndex(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size_mb) * 1024 * 1024}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    @contextmanager
+    def borrowed(self) -> Iterator[None]:
+        """Lend the calling thread a pooled connection for the block.
+
+        For short-lived threads (one per HTTP request) that would otherwise each
+        open, and leave behind, their own connection.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+            with self._lock:
+                self._conns.append(conn)
+        self._local.conn = conn
+        try:
+            yield
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                if conn in self._conns:
+                    self._idle.append(conn)
+
+    def _write(self, sql: str, params: tuple[Any, ...]) -> None:
+        if self.buffer is not None:
+            self.buffer.add(sql, params)
+            return
+        with self._conn() as conn:
+            conn.execute(sql, params)
+
+    @contextmanager
+    def immediate(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside BEGIN IMMEDIATE, taking the write lock up front."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def flush(self) -> None:
+        if self.buffer is not None:
+            self.buffer.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            conns, self._conns, self._idle = self._conns, [], []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
 
     def init(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS missions (id TEXT PRIMARY KEY, payload TEXT NOT NULL);
-                CREATE TABLE IF NOT EXISTS runs (id TEXT PRIMARY KEY, mission_id TEXT NOT NULL, state TEXT NOT NULL, payload TEXT NOT NULL);
-                CREATE TABLE IF NOT EXISTS steps (id TEXT PRIMARY KEY, run_id TEXT NOT NULL, role TEXT NOT NULL, action TEXT NOT NULL, payload TEXT NOT NULL);
-                CREATE TABLE IF NOT EXISTS artifacts (id TEXT PRIMARY KEY, run_id TEXT NOT NULL, step_id TEXT NOT NULL, payload TEXT NOT NULL);
-                CREATE TABLE IF NOT EXISTS queue_jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'queued');
-                CREATE TABLE IF NOT EXISTS telemetry (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, step_id TEXT NOT NULL, name TEXT NOT NULL, value REAL NOT NULL, tags TEXT NOT NULL, created_at TEXT NOT NULL);
-                CREATE TABLE IF NOT EXISTS episodic_memory (id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT NOT NULL, content TEXT NOT NULL, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
-                CREATE TABLE IF NOT EXISTS semantic_memory (id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT NOT NULL, content TEXT NOT NULL, embedding_hint TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
-                CREATE TABLE IF NOT EXISTS run_controls (run_id TEXT PRIMARY KEY, status TEXT NOT NULL, updated_at TEXT DEFAULT CURRENT_TIMESTAMP);
-                """
-            )
+        migrate(self)
+        self.fts.detect(self._conn())
+        self.index.backfill()
+        self.vectors.backfill()
 
     def save_mission(self, mission: Mission) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("INSERT OR REPLACE INTO missions (id,payload) VALUES (?,?)", (mission.id, mission.model_dump_json()))
+        with self._conn() as conn:
+            conn.execute(SQL_SAVE_MISSION, (mission.id, mission.model_dump_json()))
 
     def save_run(self, run: Run) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO runs (id, mission_id, state, payload) VALUES (?,?,?,?)",
-                (run.id, run.mission_id, run.state.value, run.model_dump_json()),
-            )
+        if run.state in FLUSH_ON_STATES:
+            self.flush()
+        with self._conn() as conn:
+            conn.execute(SQL_SAVE_RUN, (run.id, run.mission_id, run.state.value, run.model_dump_json()))
 
     def get_run_payload(self, run_id: str) -> dict[str, Any] | None:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute("SELECT payload FROM runs WHERE id=?", (run_id,)).fetchone()
+        row = self._conn().execute(SQL_GET_RUN, (run_id,)).fetchone()
         return json.loads(row[0]) if row else None
 
     def save_step(self, step: Step) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO steps (id, run_id, role, action, payload) VALUES (?,?,?,?,?)",
-                (step.id, step.run_id, step.role, step.action, step.model_dump_json()),
-            )
+        self._write(SQL_SAVE_STEP, (step.id, step.run_id, step.role, step.action, step.model_dump_json()))
 
     def save_artifact(self, artifact: Artifact) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO artifacts (id, run_id, step_id, payload) VALUES (?,?,?,?)",
-                (artifact.id, artifact.run_id, artifact.step_id, artifact.model_dump_json()),
-            )
+        self._write(SQL_SAVE_ARTIFACT, (artifact.id, artifact.run_id, artifact.step_id, artifact.model_dump_json()))
 
     def save_telemetry(self, event: TelemetryEvent) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO telemetry (run_id, step_id, name, value, tags, created_at) VALUES (?,?,?,?,?,?)",
-                (event.run_id, event.step_id, event.name, event.value, json.dumps(event.tags), event.created_at),
-            )
+        self._write(
+            SQL_SAVE_TELEMETRY,
+            (event.run_id, event.step_id, event.name, event.value, json.dumps(event.tags), event.created_at),
+        )
 
-    def enqueue(self, run_id: str, payload: dict[str, Any]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("INSERT INTO queue_jobs (run_id, payload, state) VALUES (?,?,'queued')", (run_id, json.dumps(payload)))
+    def enqueue(self, run_id: str, payload: dict[str, Any], priority: int = 0) -> int:
+        return self.queue.enqueue(run_id, payload, priority=priority)
 
-    def dequeue(self) -> tuple[int, str, dict[str, Any]] | None:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute(
-                "SELECT id, run_id, payload FROM queue_jobs WHERE state='queued' ORDER BY id LIMIT 1"
-            ).fetchone()
-            if not row:
-                return None
-            conn.execute("UPDATE queue_jobs SET state='processing' WHERE id=?", (row[0],))
-            return row[0], row[1], json.loads(row[2])
+    def dequeue(self, worker_id: str | None = None) -> tuple[int, str, dict[str, Any]] | None:
+        job = self.queue.dequeue(worker_id or f"{os.getpid()}-{threading.get_ident()}")
+        return (job.id, job.run_id, job.payload) if job else None
 
     def ack(self, job_id: int) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("UPDATE queue_jobs SET state='done' WHERE id=?", (job_id,))
+        self.queue.ack(job_id)
 
     def set_run_control(self, run_id: str, status: str) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO run_controls (run_id, status) VALUES (?,?) ON CONFLICT(run_id) DO UPDATE SET status=excluded.status, updated_at=CURRENT_TIMESTAMP",
-                (run_id, status),
-            )
+        with self._conn() as conn:
+            conn.execute(SQL_SET_CONTROL, (run_id, status))
 
     def get_run_control(self, run_id: str) -> str:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute("SELECT status FROM run_controls WHERE run_id=?", (run_id,)).fetchone()
+        row = self._conn().execute(SQL_GET_CONTROL, (run_id,)).fetchone()
         return row[0] if row else "active"
 
     def push_episodic(self, namespace: str, content: str) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("INSERT INTO episodic_memory (namespace,content) VALUES (?,?)", (namespace, content))
+        with self._conn() as conn:
+            conn.execute(SQL_PUSH_EPISODIC, (namespace, content, content_hash(content)))
+            self.themes.add(conn, namespace, content)
 
     def push_semantic(self, namespace: str, content: str, embedding_hint: str = "") -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
+            cur = conn.execute(SQL_PUSH_SEMANTIC, (namespace, content, embedding_hint, content_hash(content)))
+            self.index.add(conn, namespace, cur.lastrowid, content)
+            self.vectors.add(conn, namespace, cur.lastrowid, content)
+
+    def search_memory(self, table: str, namespace: str, query: str, k: int = 5) -> list[str]:
+        """FTS5 bm25-ranked search over episodic_memory or semantic_memory."""
+        if not self.fts.enabled:
+            return semantic_rank(query, self.read_memory(table, namespace, limit=200), k)
+        return [content for _, _, content in self.fts.search(table, namespace, query, k)]
+
+    def search_semantic(self, namespace: str, query: str, k: int = 5, mode: str = "index") -> list[str]:
+        """Top-k over the whole namespace: BM25 (``index``), FTS5 (``fts``) or embedding cosine (``vector``)."""
+        if mode == "fts":
+            return self.search_memory("semantic_memory", namespace, query, k)
+        hits = self.vectors.search(namespace, query, k) if mode == "vector" else self.index.search(namespace, query, k)
+        if not hits:
+            return []
+        ids = [doc_id for doc_id, _ in hits]
+        rows = dict(
+            self._conn().execute(f"SELECT id, content FROM semantic_memory WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+        )
+        return [rows[i] for i in ids if i in rows]
+
+    def get_cached_response(self, key: str, now: float) -> str | None:
+        row = self._conn().execute("SELECT value, expires_at FROM model_cache WHERE key=?", (key,)).fetchone()
+        if not row or row[1] <= now:
+            return None
+        with self._conn() as conn:
+            conn.execute("UPDATE model_cache SET last_hit=? WHERE key=?", (now, key))
+        return row[0]
+
+    def put_cached_response(self, key: str, value: str, expires_at: float) -> None:
+        with self._conn() as conn:
             conn.execute(
-                "INSERT INTO semantic_memory (namespace,content,embedding_hint) VALUES (?,?,?)",
-                (namespace, content, embedding_hint),
+                "INSERT OR REPLACE INTO model_cache (key, value, expires_at, last_hit) VALUES (?,?,?,?)",
+                (key, value, expires_at, time.time()),
             )
 
+    def prune_cached_responses(self, max_rows: int, now: float) -> int:
+        with self._conn() as conn:
+            removed = conn.execute("DELETE FROM model_cache WHERE expires_at <= ?", (now,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM model_cache WHERE key IN (SELECT key FROM model_cache ORDER BY last_hit DESC LIMIT -1 OFFSET ?)",
+                (max_rows,),
+            ).rowcount
+        return removed
+
     def read_memory(self, table: str, namespace: str, limit: int = 10) -> list[str]:
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
-                f"SELECT content FROM {table} WHERE namespace=? ORDER BY id DESC LIMIT ?",
-                (namespace, limit),
-            ).fetchall()
+        rows = self._conn().execute(
+            f"SELECT content FROM {table} WHERE namespace=? ORDER BY id DESC LIMIT ?",
+            (namespace, limit),
+        ).fetchall()
         return [r[0] for r in rows]
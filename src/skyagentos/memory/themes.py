@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from skyagentos.memory.retrieval import tokenize
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+THEME_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodic_theme_landmarks (namespace TEXT PRIMARY KEY, landmark REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS episodic_themes (namespace TEXT NOT NULL, kind TEXT NOT NULL, term TEXT NOT NULL, score REAL NOT NULL, PRIMARY KEY (namespace, kind, term)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_episodic_themes_top ON episodic_themes (namespace, kind, score DESC);
+CREATE TABLE IF NOT EXISTS episodic_theme_buckets (namespace TEXT NOT NULL, kind TEXT NOT NULL, bucket INTEGER NOT NULL, term TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (namespace, kind, bucket, term)) WITHOUT ROWID;
+"""
+
+SQL_BUMP_THEME = (
+    "INSERT INTO episodic_themes (namespace, kind, term, score) VALUES (?,?,?,?) "
+    "ON CONFLICT(namespace, kind, term) DO UPDATE SET score = score + excluded.score"
+)
+SQL_BUMP_BUCKET = (
+    "INSERT INTO episodic_theme_buckets (namespace, kind, bucket, term, count) VALUES (?,?,?,?,?) "
+    "ON CONFLICT(namespace, kind, bucket, term) DO UPDATE SET count = count + excluded.count"
+)
+SQL_TOP = "SELECT term, score FROM episodic_themes WHERE namespace=? AND kind=? ORDER BY score DESC LIMIT ?"
+SQL_WINDOW = (
+    "SELECT term, SUM(count) AS n FROM episodic_theme_buckets WHERE namespace=? AND kind=? AND bucket >= ? "
+    "GROUP BY term ORDER BY n DESC, term LIMIT ?"
+)
+
+_KIND = re.compile(r"^([a-z_]{1,24}):(.*)$", re.S)
+# Rescale before exp() of the landmark offset gets anywhere near float overflow.
+_MAX_EXPONENT = 200.0
+
+
+def split_kind(content: str) -> tuple[str, str]:
+    """``"failure:login timeout"`` -> ``("failure", "login timeout")``."""
+    match = _KIND.match(content)
+    return (match.group(1), match.group(2)) if match else ("event", content)
+
+
+class ThemeIndex:
+    """Time-decayed token frequencies of episodic events, maintained on write.
+
+    Scores use forward decay: an event at time ``t`` adds ``exp((t - L) / tau)``
+    relative to a per-namespace landmark ``L``, so stored scores never need
+    touching as time passes and ``(namespace, kind, score DESC)`` always orders
+    terms by their decayed weight. Reading top-k is an index range scan. Hourly
+    buckets of raw counts answer windowed queries (last hour/day) without
+    rescanning history and are pruned past ``keep_s``.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        half_life_s: float | None = None,
+        bucket_s: int = 3600,
+        keep_s: int = 7 * 86400,
+    ):
+        self.store = store
+        half_life_s = half_life_s if half_life_s is not None else float(os.getenv("MEMORY_THEME_HALF_LIFE_H", "24")) * 3600
+        self.tau = half_life_s / math.log(2)
+        self.bucket_s = bucket_s
+        self.keep_s = keep_s
+        self._pruned: dict[str, int] = {}
+
+    def _landmark(self, conn: sqlite3.Connection, namespace: str, now: float) -> float:
+        conn.execute("INSERT OR IGNORE INTO episodic_theme_landmarks (namespace, landmark) VALUES (?,?)", (namespace, now))
+        landmark = conn.execute("SELECT landmark FROM episodic_theme_landmarks WHERE namespace=?", (namespace,)).fetchone()[0]
+        if (now - landmark) / self.tau > _MAX_EXPONENT:
+            conn.execute("UPDATE episodic_themes SET score = score * ? WHERE namespace=?", (math.exp((landmark - now) / self.tau), namespace))
+            conn.execute("UPDATE episodic_theme_landmarks SET landmark=? WHERE namespace=?", (now, namespace))
+            landmark = now
+        return landmark
+
+    def add(self, conn: sqlite3.Connection, namespace: str, content: str, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        kind, text = split_kind(content)
+        counts: dict[str, int] = {}
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        if not counts:
+            return
+        weight = math.exp((now - self._landmark(conn, namespace, now)) / self.tau)
+        bucket = int(now // self.bucket_s)
+        conn.executemany(SQL_BUMP_THEME, ((namespace, kind, term, n * weight) for term, n in counts.items()))
+        conn.executemany(SQL_BUMP_BUCKET, ((namespace, kind, bucket, term, n) for term, n in counts.items()))
+        if self._pruned.get(namespace) != bucket:
+            self._pruned[namespace] = bucket
+            conn.execute(
+                "DELETE FROM episodic_theme_buckets WHERE namespace=? AND bucket < ?",
+                (namespace, int((now - self.keep_s) // self.bucket_s)),
+            )
+
+    def top(self, namespace: str, k: int = 5, kind: str = "failure", now: float | None = None) -> list[tuple[str, float]]:
+        """Top-k terms by decayed weight, scaled to ``now`` (one event now weighs 1.0)."""
+        now = time.time() if now is None else now
+        conn = self.store._conn()
+        row = conn.execute("SELECT landmark FROM episodic_theme_landmarks WHERE namespace=?", (namespace,)).fetchone()
+        if row is None:
+            return []
+        scale = math.exp((row[0] - now) / self.tau)
+        return [(term, score * scale) for term, score in conn.execute(SQL_TOP, (namespace, kind, k))]
+
+    def window(self, namespace: str, seconds: float, k: int = 5, kind: str = "failure", now: float | None = None) -> list[tuple[str, int]]:
+        """Top-k raw term counts over the trailing window, widened to whole buckets."""
+        now = time.time() if now is None else now
+        first = int((now - seconds) // self.bucket_s)
+        return self.store._conn().execute(SQL_WINDOW, (namespace, kind, first, k)).fetchall()
+
+    def summary(self, namespace: str, limit: int = 5, kind: str = "failure") -> str:
+        return ", ".join(term for term, _ in self.top(namespace, limit, kind))
+
+    def rebuild(self, conn: sqlite3.Connection) -> None:
+        """Replay existing episodic rows in id order (used when the tables are first created)."""
+        for namespace, content, created_at in conn.execute(
+            "SELECT namespace, content, created_at FROM episodic_memory ORDER BY id"
+        ).fetchall():
+            ts = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp() if created_at else None
+            self.add(conn, namespace, content, now=ts)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import os
+import random
+import sqlite3
+import threading
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from skyagentos.memory.retrieval import tokenize
+
+try:  # optional: `pip install skyagentos[vector]`
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+VECTOR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic_vectors (doc_id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, bucket INTEGER NOT NULL, vec BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_semantic_vectors_bucket ON semantic_vectors (namespace, bucket);
+CREATE TRIGGER IF NOT EXISTS semantic_memory_unvector AFTER DELETE ON semantic_memory BEGIN
+  DELETE FROM semantic_vectors WHERE doc_id = old.id;
+END;
+"""
+
+
+def _slot(feature: str, dim: int) -> tuple[int, float]:
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+
+def embed(text: str, dim: int = 256) -> array:
+    """Deterministic hashed word + char-trigram features, L2 normalised, float32."""
+    vec = [0.0] * dim
+    for token in tokenize(text):
+        idx, sign = _slot(f"w:{token}", dim)
+        vec[idx] += sign
+        padded = f"^{token}$"
+        for i in range(len(padded) - 2):
+            idx, sign = _slot(f"c:{padded[i:i + 3]}", dim)
+            vec[idx] += 0.5 * sign
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return array("f", (v / norm for v in vec))
+
+
+def _dot(a: array, b: array) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def vector_rank(query: str, docs: list[str], k: int = 5, dim: int = 256) -> list[str]:
+    """Drop-in alternative to ``semantic_rank`` using cosine over hashed embeddings."""
+    q = embed(query, dim)
+    scored = [(_dot(q, embed(doc, dim)), doc) for doc in docs]
+    return [d for s, d in heapq.nlargest(k, scored, key=lambda x: x[0]) if s > 0]
+
+
+@dataclass
+class _Matrix:
+    ids: list[int] = field(default_factory=list)
+    flat: array = field(default_factory=lambda: array("f"))
+    max_id: int = 0
+
+
+class VectorIndex:
+    """Per-namespace float32 vector store with batched cosine top-k.
+
+    Vectors live as float32 blobs in ``semantic_vectors`` and are loaded once per
+    namespace into a contiguous float32 matrix that grows as rows arrive.
+    Scoring is one matrix-vector product when NumPy is installed (pure-Python
+    fallback otherwise). Namespaces larger than ``exact_max`` are searched through
+    a random-projection LSH: each vector stores an ``lsh_bits`` signature and only
+    buckets within Hamming distance 1 of the query's are scored.
+    """
+
+    def __init__(self, store: MemoryStore, dim: int | None = None, lsh_bits: int = 12, exact_max: int | None = None):
+        self.store = store
+        self.dim = dim or int(os.getenv("MEMORY_VECTOR_DIM", "256"))
+        self.lsh_bits = lsh_bits
+        default_exact = "20000" if np is not None else "2000"
+        self.exact_max = exact_max if exact_max is not None else int(os.getenv("MEMORY_VECTOR_EXACT_MAX", default_exact))
+        rng = random.Random(1729)
+        self._planes = [array("f", (rng.gauss(0.0, 1.0) for _ in range(self.dim))) for _ in range(lsh_bits)]
+        self._matrices: dict[str, _Matrix] = {}
+        self._lock = threading.Lock()
+
+    def signature(self, vec: array) -> int:
+        sig = 0
+        for bit, plane in enumerate(self._planes):
+            if _dot(vec, plane) >= 0:
+                sig |= 1 << bit
+        return sig
+
+    def add(self, conn: sqlite3.Connection, namespace: str, doc_id: int, content: str) -> None:
+        vec = embed(content, self.dim)
+        conn.execute(
+            "INSERT OR REPLACE INTO semantic_vectors (doc_id, namespace, bucket, vec) VALUES (?,?,?,?)",
+            (doc_id, namespace, self.signature(vec), vec.tobytes()),
+        )
+
+    def backfill(self, batch: int = 1000) -> int:
+        indexed = 0
+        while True:
+            with self.store._conn() as conn:
+                rows = conn.execute(
+                    "SELECT id, namespace, content FROM semantic_memory "
+                    "WHERE id > (SELECT COALESCE(MAX(doc_id), 0) FROM semantic_vectors) ORDER BY id LIMIT ?",
+                    (batch,),
+                ).fetchall()
+                for doc_id, namespace, content in rows:
+                    self.add(conn, namespace, doc_id, content)
+            indexed += len(rows)
+            if len(rows) < batch:
+                return indexed
+
+    def _refresh(self, namespace: str) -> _Matrix:
+        """Caller holds ``self._lock``. Appends rows added since the last load."""
+        conn = self.store._conn()
+        count = conn.execute("SELECT COUNT(*) FROM semantic_vectors WHERE namespace=?", (namespace,)).fetchone()[0]
+        matrix = self._matrices.get(namespace) or _Matrix()
+        for _ in range(2):
+            for doc_id, blob in conn.execute(
+                "SELECT doc_id, vec FROM semantic_vectors WHERE namespace=? AND doc_id > ? ORDER BY doc_id", (namespace, matrix.max_id)
+            ):
+                matrix.ids.append(doc_id)
+                matrix.flat.frombytes(blob)
+                matrix.max_id = doc_id
+            if len(matrix.ids) == count:
+                break
+            matrix = _Matrix()  # rows were deleted since the last load: rebuild
+        self._matrices[namespace] = matrix
+        return matrix
+
+    def _candidates(self, namespace: str, sig: int) -> tuple[list[int], array]:
+        buckets = [sig] + [sig ^ (1 << bit) for bit in range(self.lsh_bits)]
+        ids: list[int] = []
+        flat = array("f")
+        for doc_id, blob in self.store._conn().execute(
+            f"SELECT doc_id, vec FROM semantic_vectors WHERE namespace=? AND bucket IN ({','.join('?' * len(buckets))})",
+            (namespace, *buckets),
+        ):
+            ids.append(doc_id)
+            flat.frombytes(blob)
+        return ids, flat
+
+    def _score(self, q: array, ids: list[int], flat: array, k: int) -> list[tuple[int, float]]:
+        if not ids:
+            return []
+        if np is not None:
+            scores = np.frombuffer(flat, dtype=np.float32).reshape(len(ids), self.dim) @ np.frombuffer(q, dtype=np.float32)
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(ids) else np.arange(len(ids))
+            top = top[np.argsort(-scores[top])]
+            return [(ids[i], float(scores[i])) for i in top if scores[i] > 0]
+        dim = self.dim
+        scored = ((doc_id, _dot(q, flat[i * dim : (i + 1) * dim])) for i, doc_id in enumerate(ids))
+        return [(d, s) for d, s in heapq.nlargest(k, scored, key=lambda x: x[1]) if s > 0]
+
+    def search(self, namespace: str, query: str, k: int = 5) -> list[tuple[int, float]]:
+        q = embed(query, self.dim)
+        total = self.store._conn().execute("SELECT COUNT(*) FROM semantic_vectors WHERE namespace=?", (namespace,)).fetchone()[0]
+        if total == 0:
+            return []
+        if total > self.exact_max:
+            ids, flat = self._candidates(namespace, self.signature(q))
+            return self._score(q, ids, flat, k)
+        with self._lock:
+            matrix = self._refresh(namespace)
+            return self._score(q, matrix.ids, matrix.flat, k)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+_LIVE: weakref.WeakSet[WriteBehindBuffer] = weakref.WeakSet()
+
+
+class WriteBehindBuffer:
+    """Collects hot-path inserts and flushes them with executemany in one transaction.
+
+    A flush happens when ``max_batch`` rows are pending, every ``flush_interval_s``
+    while rows are pending, or when ``flush()`` is called explicitly. The flusher
+    thread only lives while there is pending work, so idle stores hold no thread,
+    and it borrows a pooled connection rather than opening one per thread.
+    """
+
+    def __init__(self, store: MemoryStore, max_batch: int = 256, flush_interval_s: float = 0.25):
+        self.store = store
+        self.max_batch = max_batch
+        self.flush_interval_s = flush_interval_s
+        self._pending: dict[str, list[tuple[Any, ...]]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.flushes = 0
+        self.rows_flushed = 0
+        _LIVE.add(self)
+
+    def add(self, sql: str, params: tuple[Any, ...]) -> None:
+        with self._lock:
+            self._pending.setdefault(sql, []).append(params)
+            self._count += 1
+            full = self._count >= self.max_batch
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._count
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending, self._count = self._pending, {}, 0
+            if not batch:
+                return 0
+            try:
+                # Borrowed: the short-lived flusher threads share pooled connections.
+                with self.store.borrowed(), self.store._conn() as conn:
+                    for sql, rows in batch.items():
+                        conn.executemany(sql, rows)
+            except Exception:
+                with self._lock:
+                    for sql, rows in batch.items():
+                        self._pending.setdefault(sql, [])[:0] = rows
+                        self._count += len(rows)
+                raise
+            flushed = sum(len(rows) for rows in batch.values())
+            self.flushes += 1
+            self.rows_flushed += flushed
+            return flushed
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"memory write-behind flush failed, will retry: {exc}", file=sys.stderr)
+            with self._lock:
+                if self._count == 0:
+                    self._thread = None
+                    return
+
+
+@atexit.register
+def _flush_all() -> None:
+    for buf in list(_LIVE):
+        try:
+            buf.flush()
+        except Exception as exc:
+            print(f"memory write-behind flush at shutdown failed: {exc}", file=sys.stderr)
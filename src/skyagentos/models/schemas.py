@@ -60,6 +60,7 @@ class Run(JsonModel):
     state: RunState = RunState.CREATED
     attempt: int = 0
     cost_usd: float = 0.0
+    error: str | None = None
     created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 
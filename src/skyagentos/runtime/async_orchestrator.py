@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from uuid import uuid4
+
+from skyagentos.memory.queue import QueueJob
+from skyagentos.models.schemas import Artifact, Mission, Run, Step, ValidationResult
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.orchestrator import Orchestrator, PreparedIteration, RunContext
+from skyagentos.runtime.retry import async_retry_sleep
+from skyagentos.runtime.streaming import IncrementalJson
+
+
+class AsyncOrchestrator(Orchestrator):
+    """asyncio execution path with the same state machine as ``Orchestrator``.
+
+    Model and tool calls go through non-blocking HTTP clients and backoff uses
+    ``asyncio.sleep``, so one event loop can multiplex many in-flight missions.
+    Store writes stay synchronous: they are short WAL/write-behind operations.
+    """
+
+    async def run_mission_async(self, mission: Mission) -> dict:
+        submitted = self.submit(mission)
+        worker_id = f"async-{uuid4().hex[:8]}"
+        job = self.store.queue.claim_job(submitted["job_id"], worker_id)
+        if not job:
+            raise RuntimeError(f"queued job {submitted['job_id']} was claimed by another worker")
+        try:
+            return await self.execute_job_async(job, final=True)
+        finally:
+            self.store.queue.ack(job.id, worker_id)
+
+    async def run_many(self, missions: list[Mission], concurrency: int = 100) -> list[dict]:
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(mission: Mission) -> dict:
+            async with gate:
+                return await self.run_mission_async(mission)
+
+        return await asyncio.gather(*(one(m) for m in missions))
+
+    async def execute_job_async(self, job: QueueJob, final: bool | None = None) -> dict:
+        loaded = self._load_job(job)
+        if isinstance(loaded, dict):
+            return loaded
+        run, mission = loaded
+        router = self.router.scoped()
+        try:
+            return await self._execute_run_async(run, mission, router)
+        except Exception as exc:
+            outcome = self._job_error(job, run, exc, final)
+            if outcome is None:
+                raise
+            return outcome
+        finally:
+            self._record_usage(run, router)
+            self.store.flush()
+
+    async def _execute_run_async(self, run: Run, mission: Mission, router: ModelRouter) -> dict:
+        ctx = self._begin_run(run, mission)
+        if isinstance(ctx, dict):
+            return ctx
+
+        ctx.plan = await self._aplan(ctx, router)
+        self._planned(ctx)
+        if self._speculative_attempts(mission) > 1:
+            return await self._execute_speculative_async(ctx, router)
+
+        pipeline = self._pipelined(mission)
+        ahead: asyncio.Task | None = None
+        for i in range(1, mission.max_steps + 1):
+            paused = self._check_paused(ctx)
+            if paused:
+                return paused
+
+            prepared = await self._atake_prepared(ahead, i)
+            ahead = None
+            exec_step = prepared.exec_step if prepared else self._executor_step(ctx, i)
+            payload = prepared.payload if prepared else self._executor_payload(ctx, i)
+            start = time.time()
+            try:
+                self._charge_executor(ctx, router)
+                result, artifact = await self._acall_executor(ctx, exec_step, payload)
+                self._record_execution(ctx, exec_step, result, artifact, start)
+
+                if pipeline and i < mission.max_steps:
+                    ahead = asyncio.ensure_future(self._aprepare_iteration(ctx, i + 1))
+                parsed = await self._avalidate(ctx, router, result, i)
+
+                outcome = self._after_validation(ctx, parsed, result, artifact, i)
+                if outcome:
+                    if ahead:
+                        ahead.cancel()
+                    return outcome
+                await async_retry_sleep(self.retry, i)
+            except Exception as exc:
+                outcome = self._after_error(ctx, exec_step, exc, start, i)
+                if outcome:
+                    if ahead:
+                        ahead.cancel()
+                    return outcome
+                await async_retry_sleep(self.retry, i)
+
+        return self._exhausted(ctx)
+
+    async def _execute_speculative_async(self, ctx: RunContext, router: ModelRouter) -> dict:
+        """asyncio twin of ``_execute_speculative``; losing attempts are cancelled outright."""
+        i = 1
+        while i <= ctx.mission.max_steps:
+            paused = self._check_paused(ctx)
+            if paused:
+                return paused
+            width = self._speculation_width(ctx, router, i)
+            tasks = {}
+            for j in range(width):
+                exec_step = self._executor_step(ctx, i + j)
+                payload = self._executor_payload(ctx, i + j, j)
+                self._charge_executor(ctx, router)
+                tasks[asyncio.ensure_future(self._acall_executor(ctx, exec_step, payload))] = (exec_step, time.time())
+            try:
+                pending = set(tasks)
+                n = 0
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        exec_step, start = tasks[task]
+                        outcome = await self._asettle_attempt(ctx, router, exec_step, task, start, i + n)
+                        n += 1
+                        if outcome:
+                            self._record_speculation(ctx, exec_step, width, n)
+                            return outcome
+            finally:
+                for task in tasks:
+                    task.cancel()
+            self._record_speculation(ctx, None, width, width)
+            i += width
+            await async_retry_sleep(self.retry, i - 1)
+        return self._exhausted(ctx)
+
+    async def _acall_executor(self, ctx: RunContext, exec_step: Step, payload: dict) -> tuple[dict, Artifact]:
+        if ctx.runtime == "desktop":
+            return await self.desktop.aexecute(ctx.run.id, exec_step.id, "operate", payload)
+        return await self.skyvern.aexecute(ctx.run.id, exec_step.id, payload)
+
+    async def _avalidate(self, ctx: RunContext, router: ModelRouter, result: dict, i: int) -> ValidationResult:
+        val_step = self._validator_step(ctx, result, i)
+        vstart = time.time()
+        ruled = ctx.rules.evaluate(result) if ctx.rules is not None else None
+        if ruled is not None:
+            parsed, rule = ruled
+            return self._record_validation(ctx, val_step, None, result, vstart, parsed=parsed, rule=rule)
+        # Batched validator calls are not streamed; the batch answers all items at once.
+        if not self.stream_completions or router.batcher is not None:
+            raw = await router.acomplete("validator", self._validate_prompt(ctx, result))
+            return self._record_validation(ctx, val_step, raw, result, vstart)
+        verdict = IncrementalJson()
+        raw = await router.acomplete_stream("validator", self._validate_prompt(ctx, result), on_token=verdict.feed, stop=lambda _: self._verdict_ready(verdict))
+        return self._record_validation(ctx, val_step, raw, result, vstart, parsed=self._streamed_verdict(verdict))
+
+    async def _aplan(self, ctx: RunContext, router: ModelRouter) -> str:
+        if not self.stream_completions:
+            return await router.acomplete("planner", self._plan_prompt(ctx))
+        deltas = self._plan_delta(ctx)
+        try:
+            return await router.acomplete_stream("planner", self._plan_prompt(ctx), on_token=deltas)
+        finally:
+            deltas.flush()
+
+    async def _aprepare_iteration(self, ctx: RunContext, i: int) -> PreparedIteration:
+        start = time.perf_counter()
+        prepared = PreparedIteration(i, self._executor_step(ctx, i), self._executor_payload(ctx, i))
+        try:
+            await (self.desktop if ctx.runtime == "desktop" else self.skyvern).awarm()
+        except (ConnectionError, TimeoutError):
+            pass
+        prepared.prep_ms = (time.perf_counter() - start) * 1000
+        return prepared
+
+    async def _atake_prepared(self, ahead: asyncio.Task | None, i: int) -> PreparedIteration | None:
+        if ahead is None:
+            return None
+        try:
+            prepared = await ahead
+        except Exception:
+            return None
+        return self._use_prepared(prepared, i)
+
+    async def _asettle_attempt(self, ctx: RunContext, router: ModelRouter, exec_step: Step, task: asyncio.Future, start: float, n: int) -> dict | None:
+        try:
+            result, artifact = task.result()
+            self._record_execution(ctx, exec_step, result, artifact, start)
+            parsed = await self._avalidate(ctx, router, result, exec_step.input["iteration"])
+            return self._after_validation(ctx, parsed, result, artifact, n)
+        except Exception as exc:
+            return self._after_error(ctx, exec_step, exc, start, n)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# States after which a run publishes nothing more (HUMAN_REVIEW runs are not resumed in place).
+TERMINAL_STATES = {"COMPLETED", "FAILED", "HUMAN_REVIEW"}
+
+
+@dataclass
+class Event:
+    id: int
+    run_id: str
+    channel: str
+    payload: dict[str, Any]
+    ts: float = field(default_factory=time.time)
+
+    def sse(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.channel}\ndata: {json.dumps(self.payload)}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """One watcher's bounded buffer. The bus never waits on it: when the
+    buffer is full the subscription is dropped and the watcher reconnects
+    with its last event id."""
+
+    def __init__(self, bus: EventBus, run_id: str, maxsize: int):
+        self.bus = bus
+        self.run_id = run_id
+        self.maxsize = maxsize
+        self.dropped = False
+        self.closed = False
+        self.last_id = 0
+        # Events up to this id were published before subscribing (and replayed if asked for).
+        self.floor = 0
+        self._events: deque[Event] = deque()
+        self._cond = threading.Condition()
+
+    def _offer(self, event: Event) -> bool:
+        if event.id <= self.floor:
+            return True
+        with self._cond:
+            if self.dropped or len(self._events) >= self.maxsize:
+                self.dropped = True
+                self._cond.notify()
+                return False
+            self._events.append(event)
+            self._cond.notify()
+            return True
+
+    def get(self, timeout: float | None = None) -> list[Event]:
+        """Waits up to ``timeout`` for events and returns every buffered one
+        (empty on timeout, drop or close)."""
+        with self._cond:
+            if not self._events and not self.dropped and not self.closed:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+        if events:
+            self.last_id = events[-1].id
+        return events
+
+    def close(self) -> None:
+        self.bus._unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class EventBus:
+    """In-process pub/sub for run progress.
+
+    ``publish`` has the ``StreamFn`` signature, so it plugs into the
+    orchestrator directly. Events get a bus-wide increasing id and are kept in
+    a per-run replay buffer (``history`` events, for the ``max_runs`` most
+    recently active runs), so a watcher reconnecting with ``Last-Event-ID``
+    misses nothing still buffered. ``publish`` only appends; a dispatcher
+    thread fans events out to the watchers' bounded buffers.
+    """
+
+    def __init__(self, history: int = 256, max_runs: int = 1024, subscriber_buffer: int = 1024):
+        self.history = history
+        self.max_runs = max_runs
+        self.subscriber_buffer = subscriber_buffer
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._seq = 0
+        self._routed = 0
+        self._delivered = 0
+        self._runs: OrderedDict[str, deque[Event]] = OrderedDict()
+        self._subs: dict[str, set[Subscription]] = {}
+        self._pending: deque[Event] = deque()
+        self._dispatcher: threading.Thread | None = None
+        self.published = 0
+        self.drops = 0
+
+    @classmethod
+    def from_env(cls) -> EventBus:
+        return cls(
+            history=int(os.getenv("EVENT_BUS_HISTORY", "256")),
+            max_runs=int(os.getenv("EVENT_BUS_MAX_RUNS", "1024")),
+            subscriber_buffer=int(os.getenv("EVENT_BUS_SUBSCRIBER_BUFFER", "1024")),
+        )
+
+    def publish(self, channel: str, payload: dict) -> None:
+        run_id = str(payload.get("run_id", ""))
+        with self._cond:
+            self._seq += 1
+            event = Event(self._seq, run_id, channel, payload)
+            log = self._runs.get(run_id)
+            if log is None:
+                log = self._runs[run_id] = deque(maxlen=self.history)
+                if len(self._runs) > self.max_runs:
+                    self._runs.popitem(last=False)
+            else:
+                self._runs.move_to_end(run_id)
+            log.append(event)
+            self.published += 1
+            if run_id in self._subs:
+                self._pending.append(event)
+                self._routed = event.id
+                if self._dispatcher is None:
+                    self._dispatcher = threading.Thread(target=self._dispatch, name="event-bus", daemon=True)
+                    self._dispatcher.start()
+                self._cond.notify_all()
+
+    def _dispatch(self) -> None:
+        # Fan-out happens here so the publishing orchestrator thread never waits on watchers.
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch = list(self._pending)
+                self._pending.clear()
+                targets = [(event, list(self._subs.get(event.run_id, ()))) for event in batch]
+            slow = {sub for event, subs in targets for sub in subs if not sub._offer(event)}
+            for sub in slow:
+                self._unsubscribe(sub)
+            with self._cond:
+                self.drops += len(slow)
+                self._delivered = max(self._delivered, batch[-1].id)
+                self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Waits until every published event was handed to its watchers."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._delivered >= self._routed, timeout)
+
+    def subscribe(self, run_id: str, last_event_id: int | None = None, maxsize: int | None = None) -> Subscription:
+        """Watch ``run_id``; buffered events after ``last_event_id`` are delivered first."""
+        sub = Subscription(self, run_id, maxsize or self.subscriber_buffer)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._runs.get(run_id, ()):
+                    if event.id > last_event_id:
+                        sub._events.append(event)
+            sub.floor = self._seq
+            self._subs.setdefault(run_id, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.run_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.run_id]
+
+    def known(self, run_id: str) -> bool:
+        with self._lock:
+            return run_id in self._runs
+
+    def latest(self, run_id: str) -> Event | None:
+        with self._lock:
+            log = self._runs.get(run_id)
+            return log[-1] if log else None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "published": self.published,
+                "runs": len(self._runs),
+                "subscribers": sum(len(s) for s in self._subs.values()),
+                "dropped_subscribers": self.drops,
+            }
@@ -0,0 +1,555 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import ssl
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator
+from urllib.parse import urlsplit
+
+
+class HttpError(RuntimeError):
+    def __init__(self, status: int, reason: str, body: bytes = b""):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = status
+        self.reason = reason
+        self.body = body
+
+
+# Errors that mean a pooled keep-alive connection was closed by the peer while idle;
+# the request is retried once on a fresh connection.
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, BrokenPipeError, ConnectionResetError)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def _target(url: str) -> tuple[str, str, int, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return scheme, parts.hostname or "localhost", port, path
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    stale_retries: int = 0
+    errors: int = 0
+    per_host: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        reuse = self.connections_reused / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(reuse, 3),
+            "stale_retries": self.stale_retries,
+            "errors": self.errors,
+            "per_host_requests": dict(self.per_host),
+        }
+
+
+class _HostSlots:
+    def __init__(self, limit: int):
+        self.slots = threading.BoundedSemaphore(limit)
+        self.idle: deque[tuple[Any, float]] = deque()
+        self.lock = threading.Lock()
+
+
+class HttpPool:
+    """Thread-safe keep-alive HTTP/1.1 connection pool with per-host limits.
+
+    Shared by ``ModelRouter``, ``SkyvernTool`` and ``DesktopTool`` so planner,
+    validator and executor calls reuse TCP (and TLS) connections per endpoint.
+    """
+
+    def __init__(self, max_per_host: int = 16, timeout: float = 120.0, idle_ttl_s: float = 60.0):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.idle_ttl_s = idle_ttl_s
+        self.metrics = PoolStats()
+        self._hosts: dict[tuple[str, str, int], _HostSlots] = {}
+        self._lock = threading.Lock()
+        self._ssl = ssl.create_default_context()
+
+    def _slots(self, key: tuple[str, str, int]) -> _HostSlots:
+        with self._lock:
+            slots = self._hosts.get(key)
+            if slots is None:
+                slots = self._hosts[key] = _HostSlots(self.max_per_host)
+            return slots
+
+    def _checkout(self, key: tuple[str, str, int], slots: _HostSlots, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with slots.lock:
+            while slots.idle:
+                conn, last_used = slots.idle.pop()
+                if now - last_used < self.idle_ttl_s:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self.metrics.connections_opened += 1
+        return conn, False
+
+    def warm(self, url: str, timeout: float | None = None) -> bool:
+        """Open an idle connection to ``url``'s host ahead of use; False if one is already idle."""
+        timeout = timeout or self.timeout
+        scheme, host, port, _ = _target(url)
+        key = (scheme, host, port)
+        slots = self._slots(key)
+        now = time.monotonic()
+        with slots.lock:
+            if any(now - last_used < self.idle_ttl_s for _, last_used in slots.idle):
+                return False
+        conn, _ = self._checkout(key, slots, timeout)
+        try:
+            conn.connect()
+        except OSError as exc:
+            conn.close()
+            raise ConnectionError(f"connection to {host}:{port} failed: {exc}") from exc
+        self._checkin(slots, conn, True)
+        return True
+
+    def _checkin(self, slots: _HostSlots, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with slots.lock:
+                slots.idle.append((conn, time.monotonic()))
+        else:
+            conn.close()
+
+    def _send(
+        self,
+        key: tuple[str, str, int],
+        slots: _HostSlots,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str] | None,
+        timeout: float,
+        idempotent: bool | None = None,
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse, bool]:
+        """Send the request and read the response head, retrying once on a stale pooled connection.
+
+        A failure while sending is always retried. A failure while waiting for the
+        response is only retried for idempotent requests: the peer may already have
+        acted on it, and replaying e.g. ``POST /tasks`` would start a second task.
+        """
+        _, host, port, path = _target(url)
+        if idempotent is None:
+            idempotent = method.upper() in _IDEMPOTENT_METHODS
+        for attempt in range(2):
+            conn, reused = self._checkout(key, slots, timeout)
+            sent = False
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                sent = True
+                return conn, conn.getresponse(), reused
+            except _STALE_ERRORS:
+                conn.close()
+                if reused and attempt == 0 and (not sent or idempotent):
+                    with self._lock:
+                        self.metrics.stale_retries += 1
+                    continue
+                self._count_error()
+                raise ConnectionError(f"connection to {host}:{port} closed unexpectedly")
+            except socket.timeout as exc:
+                conn.close()
+                self._count_error()
+                raise TimeoutError(f"timeout after {timeout}s calling {url}") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                self._count_error()
+                raise ConnectionError(f"connection to {host}:{port} failed: {exc}") from exc
+        raise ConnectionError(f"connection to {host}:{port} failed")
+
+    def _count_request(self, host: str, port: int, reused: bool) -> None:
+        with self._lock:
+            self.metrics.requests += 1
+            self.metrics.connections_reused += int(reused)
+            hostkey = f"{host}:{port}"
+            self.metrics.per_host[hostkey] = self.metrics.per_host.get(hostkey, 0) + 1
+
+    def _acquire(self, url: str, timeout: float) -> tuple[tuple[str, str, int], _HostSlots]:
+        scheme, host, port, _ = _target(url)
+        key = (scheme, host, port)
+        slots = self._slots(key)
+        if not slots.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"timeout waiting for a pooled connection to {host}:{port}")
+        return key, slots
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        idempotent: bool | None = None,
+    ) -> tuple[int, str, bytes]:
+        timeout = timeout or self.timeout
+        key, slots = self._acquire(url, timeout)
+        _, host, port = key
+        try:
+            conn, resp, reused = self._send(key, slots, method, url, body, headers, timeout, idempotent)
+            try:
+                data = resp.read()
+            except socket.timeout as exc:
+                conn.close()
+                self._count_error()
+                raise TimeoutError(f"timeout after {timeout}s calling {url}") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                self._count_error()
+                raise ConnectionError(f"connection to {host}:{port} failed: {exc}") from exc
+            self._checkin(slots, conn, not resp.will_close)
+            self._count_request(host, port, reused)
+            return resp.status, resp.reason, data
+        finally:
+            slots.slots.release()
+
+    def stream_lines(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        idempotent: bool = False,
+    ) -> Iterator[bytes]:
+        """POST JSON and yield the response body line by line as it arrives (e.g. SSE).
+
+        The connection goes back to the pool only if the body is read to the end;
+        closing the generator early (a caller that has seen enough) drops it.
+        """
+        timeout = timeout or self.timeout
+        hdrs = {"Content-Type": "application/json", **(headers or {})}
+        key, slots = self._acquire(url, timeout)
+        _, host, port = key
+        conn = None
+        reusable = False
+        try:
+            conn, resp, reused = self._send(key, slots, "POST", url, json.dumps(payload).encode("utf-8"), hdrs, timeout, idempotent)
+            if resp.status >= 400:
+                data = resp.read()
+                reusable = not resp.will_close
+                raise HttpError(resp.status, resp.reason, data)
+            self._count_request(host, port, reused)
+            try:
+                while True:
+                    line = resp.readline()
+                    if not line:
+                        break
+                    yield line
+            except socket.timeout as exc:
+                self._count_error()
+                raise TimeoutError(f"timeout after {timeout}s streaming {url}") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                self._count_error()
+                raise ConnectionError(f"connection to {host}:{port} failed: {exc}") from exc
+            reusable = not resp.will_close
+        finally:
+            if conn is not None:
+                self._checkin(slots, conn, reusable)
+            slots.slots.release()
+
+    def post_json(
+        self, url: str, payload: dict[str, Any], headers: dict[str, str] | None = None, timeout: float | None = None, idempotent: bool = False
+    ) -> dict[str, Any]:
+        """POST JSON; pass ``idempotent=True`` only when replaying the request is harmless."""
+        hdrs = {"Content-Type": "application/json", **(headers or {})}
+        status, reason, data = self.request("POST", url, json.dumps(payload).encode("utf-8"), hdrs, timeout, idempotent)
+        if status >= 400:
+            raise HttpError(status, reason, data)
+        return json.loads(data.decode("utf-8"))
+
+    def _count_error(self) -> None:
+        with self._lock:
+            self.metrics.errors += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            out = self.metrics.as_dict()
+            hosts = list(self._hosts.items())
+        out["idle_connections"] = {f"{h}:{p}": len(s.idle) for (_, h, p), s in hosts}
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            hosts = list(self._hosts.values())
+        for slots in hosts:
+            with slots.lock:
+                while slots.idle:
+                    slots.idle.pop()[0].close()
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[int, str, dict[str, str]]:
+    status_line = (await reader.readline()).decode("latin-1").strip()
+    if not status_line:
+        raise ConnectionResetError("connection closed before response")
+    _, status, *reason = status_line.split(" ", 2)
+    headers: dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() != "chunked" and "content-length" not in headers:
+        headers["connection"] = "close"
+    return int(status), (reason[0] if reason else ""), headers
+
+
+async def _iter_body(reader: asyncio.StreamReader, headers: dict[str, str]) -> AsyncIterator[bytes]:
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await reader.readline()
+                return
+            yield await reader.readexactly(size)
+            await reader.readline()
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            data = await reader.read(min(remaining, 65536))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(data)
+            yield data
+    else:
+        while data := await reader.read(65536):
+            yield data
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, str, dict[str, str], bytes]:
+    status, reason, headers = await _read_head(reader)
+    body = b"".join([chunk async for chunk in _iter_body(reader, headers)])
+    return status, reason, headers, body
+
+
+async def _aiter_timeout(chunks: AsyncIterator[bytes], timeout: float, url: str) -> AsyncIterator[bytes]:
+    """Apply ``timeout`` to each read rather than to the whole (open-ended) stream."""
+    while True:
+        try:
+            chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError(f"timeout after {timeout}s streaming {url}") from exc
+        yield chunk
+
+
+class _AsyncHostSlots:
+    def __init__(self, limit: int):
+        self.slots = asyncio.Semaphore(limit)
+        self.idle: deque[tuple[asyncio.StreamReader, asyncio.StreamWriter, float]] = deque()
+
+
+class AsyncHttpClient:
+    """asyncio HTTP/1.1 JSON client with keep-alive pooling per (event loop, host)."""
+
+    def __init__(self, timeout: float = 120.0, max_per_host: int | None = None, idle_ttl_s: float | None = None):
+        self.timeout = timeout
+        self.max_per_host = max_per_host or int(os.getenv("HTTP_POOL_MAX_PER_HOST_ASYNC", "64"))
+        self.idle_ttl_s = idle_ttl_s if idle_ttl_s is not None else float(os.getenv("HTTP_POOL_IDLE_S", "60"))
+        self.metrics = PoolStats()
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str, int], _AsyncHostSlots]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._ssl = ssl.create_default_context()
+
+    def _slots(self, key: tuple[str, str, int]) -> _AsyncHostSlots:
+        pools = self._loops.setdefault(asyncio.get_running_loop(), {})
+        slots = pools.get(key)
+        if slots is None:
+            slots = pools[key] = _AsyncHostSlots(self.max_per_host)
+        return slots
+
+    async def _open(self, key: tuple[str, str, int], timeout: float):
+        scheme, host, port = key
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None), timeout
+            )
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError(f"timeout connecting to {host}:{port}") from exc
+        except OSError as exc:
+            raise ConnectionError(f"connection to {host}:{port} failed: {exc}") from exc
+        self.metrics.connections_opened += 1
+        return reader, writer
+
+    async def warm(self, url: str, timeout: float | None = None) -> bool:
+        scheme, host, port, _ = _target(url)
+        key = (scheme, host, port)
+        slots = self._slots(key)
+        now = time.monotonic()
+        if any(now - last_used < self.idle_ttl_s and not writer.is_closing() for _, writer, last_used in slots.idle):
+            return False
+        reader, writer = await self._open(key, timeout or self.timeout)
+        slots.idle.append((reader, writer, time.monotonic()))
+        return True
+
+    @staticmethod
+    def _message(url: str, payload: dict[str, Any], headers: dict[str, str] | None) -> bytes:
+        _, host, port, path = _target(url)
+        body = json.dumps(payload).encode("utf-8")
+        lines = [f"POST {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: keep-alive", f"Content-Length: {len(body)}"]
+        lines += [f"{k}: {v}" for k, v in {"Content-Type": "application/json", **(headers or {})}.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _send(
+        self, key: tuple[str, str, int], slots: _AsyncHostSlots, message: bytes, url: str, timeout: float, read_body: bool, idempotent: bool = False
+    ):
+        """Send on a pooled (or new) connection, retrying once if a reused one turns out stale.
+
+        As with ``HttpPool._send``, a failure after the request went out is only
+        retried when ``idempotent`` is set. Returns ``(reader, writer, reused, status, reason, headers, body)``; ``body``
+        is None when ``read_body`` is false and the caller consumes it.
+        """
+        _, host, port = key
+        for attempt in range(2):
+            reused = False
+            now = time.monotonic()
+            while slots.idle:
+                reader, writer, last_used = slots.idle.pop()
+                if now - last_used < self.idle_ttl_s and not writer.is_closing():
+                    reused = True
+                    break
+                writer.close()
+            if not reused:
+                reader, writer = await self._open(key, timeout)
+            sent = False
+            try:
+                writer.write(message)
+                await writer.drain()
+                sent = True
+                if read_body:
+                    status, reason, headers, data = await asyncio.wait_for(_read_response(reader), timeout)
+                else:
+                    (status, reason, headers), data = await asyncio.wait_for(_read_head(reader), timeout), None
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError) as exc:
+                writer.close()
+                if reused and attempt == 0 and (not sent or idempotent):
+                    self.metrics.stale_retries += 1
+                    continue
+                self.metrics.errors += 1
+                raise ConnectionError(f"connection to {host}:{port} closed unexpectedly") from exc
+            except asyncio.TimeoutError as exc:
+                writer.close()
+                self.metrics.errors += 1
+                raise TimeoutError(f"timeout after {timeout}s calling {url}") from exc
+            except asyncio.CancelledError:
+                # The response may be half read; the connection cannot be reused.
+                writer.close()
+                raise
+            self.metrics.requests += 1
+            self.metrics.connections_reused += int(reused)
+            hostkey = f"{host}:{port}"
+            self.metrics.per_host[hostkey] = self.metrics.per_host.get(hostkey, 0) + 1
+            return reader, writer, reused, status, reason, headers, data
+        raise ConnectionError(f"connection to {host}:{port} failed")
+
+    def _release(self, slots: _AsyncHostSlots, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: dict[str, str], done: bool) -> None:
+        if done and headers.get("connection", "").lower() != "close":
+            slots.idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    async def post_json(
+        self, url: str, payload: dict[str, Any], headers: dict[str, str] | None = None, timeout: float | None = None, idempotent: bool = False
+    ) -> dict[str, Any]:
+        timeout = timeout or self.timeout
+        scheme, host, port, _ = _target(url)
+        key = (scheme, host, port)
+        slots = self._slots(key)
+        async with slots.slots:
+            reader, writer, _, status, reason, resp_headers, data = await self._send(key, slots, self._message(url, payload, headers), url, timeout, True, idempotent)
+            self._release(slots, reader, writer, resp_headers, True)
+
+        if status >= 400:
+            raise HttpError(status, reason, data)
+        return json.loads(data.decode("utf-8"))
+
+    async def stream_lines(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        idempotent: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Async counterpart of ``HttpPool.stream_lines``."""
+        timeout = timeout or self.timeout
+        scheme, host, port, _ = _target(url)
+        key = (scheme, host, port)
+        slots = self._slots(key)
+        async with slots.slots:
+            reader, writer, _, status, reason, resp_headers, _ = await self._send(key, slots, self._message(url, payload, headers), url, timeout, False, idempotent)
+            done = False
+            try:
+                if status >= 400:
+                    data = b"".join([chunk async for chunk in _iter_body(reader, resp_headers)])
+                    done = True
+                    raise HttpError(status, reason, data)
+                buffered = b""
+                async for chunk in _aiter_timeout(_iter_body(reader, resp_headers), timeout, url):
+                    buffered += chunk
+                    *lines, buffered = buffered.split(b"\n")
+                    for line in lines:
+                        yield line + b"\n"
+                if buffered:
+                    yield buffered
+                done = True
+            except (ConnectionResetError, asyncio.IncompleteReadError) as exc:
+                self.metrics.errors += 1
+                raise ConnectionError(f"connection to {host}:{port} closed unexpectedly") from exc
+            finally:
+                self._release(slots, reader, writer, resp_headers, done)
+
+    def stats(self) -> dict[str, Any]:
+        return self.metrics.as_dict()
+
+
+_shared_lock = threading.Lock()
+_shared_pool: HttpPool | None = None
+_shared_async: AsyncHttpClient | None = None
+
+
+def shared_pool() -> HttpPool:
+    """Process-wide pool used by default by the model router and tool clients."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = HttpPool(
+                max_per_host=int(os.getenv("HTTP_POOL_MAX_PER_HOST", "16")),
+                timeout=float(os.getenv("HTTP_POOL_TIMEOUT_S", "120")),
+                idle_ttl_s=float(os.getenv("HTTP_POOL_IDLE_S", "60")),
+            )
+        return _shared_pool
+
+
+def shared_async_client() -> AsyncHttpClient:
+    global _shared_async
+    with _shared_lock:
+        if _shared_async is None:
+            _shared_async = AsyncHttpClient(timeout=float(os.getenv("HTTP_POOL_TIMEOUT_S", "120")))
+        return _shared_async
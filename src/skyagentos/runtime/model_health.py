@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, model: str):
+        super().__init__(f"circuit open for model={model}")
+        self.model = model
+
+
+@dataclass
+class _ModelState:
+    samples: deque[tuple[float, bool]]
+    state: str = CLOSED
+    opened_at: float = 0.0
+    consecutive_failures: int = 0
+    probing: bool = False
+    calls: int = 0
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class ModelHealth:
+    """Rolling latency/error statistics and a circuit breaker per model.
+
+    A breaker opens after ``failure_threshold`` consecutive failures, or when
+    the error rate over the last ``window`` calls reaches ``error_rate`` (after
+    ``min_calls`` calls). Once ``cooldown_s`` has passed, a single half-open
+    probe is let through. Its success closes the breaker and its failure
+    re-opens it. ``order`` ranks a role's fallback chain by observed p50
+    inflated by the error rate, with a per-position ``order_bias`` so the
+    configured order still wins among comparable models.
+    """
+
+    window: int = 50
+    min_calls: int = 5
+    error_rate: float = 0.5
+    failure_threshold: int = 5
+    cooldown_s: float = 30.0
+    order_bias: float = 0.5
+    # Off by default: a hedge pays for a second request, often to a pricier model.
+    hedge: bool = False
+    hedge_min_s: float = 0.05
+    hedge_quantile: float = 0.95
+    _models: dict[str, _ModelState] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def from_env(cls) -> ModelHealth:
+        return cls(
+            window=int(os.getenv("MODEL_HEALTH_WINDOW", "50")),
+            min_calls=int(os.getenv("MODEL_HEALTH_MIN_CALLS", "5")),
+            error_rate=float(os.getenv("MODEL_BREAKER_ERROR_RATE", "0.5")),
+            failure_threshold=int(os.getenv("MODEL_BREAKER_FAILURES", "5")),
+            cooldown_s=float(os.getenv("MODEL_BREAKER_COOLDOWN_S", "30")),
+            order_bias=float(os.getenv("MODEL_ORDER_BIAS", "0.5")),
+            hedge=os.getenv("MODEL_HEDGE", "false").lower() == "true",
+            hedge_min_s=int(os.getenv("MODEL_HEDGE_MIN_MS", "50")) / 1000.0,
+            hedge_quantile=float(os.getenv("MODEL_HEDGE_QUANTILE", "0.95")),
+        )
+
+    def _state(self, model: str) -> _ModelState:
+        st = self._models.get(model)
+        if st is None:
+            st = self._models[model] = _ModelState(samples=deque(maxlen=self.window))
+        return st
+
+    def _available(self, st: _ModelState, now: float) -> bool:
+        if st.state == OPEN:
+            return now - st.opened_at >= self.cooldown_s
+        if st.state == HALF_OPEN:
+            return not st.probing
+        return True
+
+    def acquire(self, model: str, now: float | None = None) -> None:
+        """Claim a call slot; raises ``CircuitOpenError`` while the breaker rejects calls."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            st = self._state(model)
+            if not self._available(st, now):
+                raise CircuitOpenError(model)
+            if st.state == OPEN:
+                st.state = HALF_OPEN
+            if st.state == HALF_OPEN:
+                st.probing = True
+            st.calls += 1
+
+    def release(self, model: str) -> None:
+        """Give back a slot whose call was abandoned (cancelled) without an outcome."""
+        with self._lock:
+            self._state(model).probing = False
+
+    def record(self, model: str, latency_s: float, ok: bool, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            st = self._state(model)
+            st.samples.append((latency_s, ok))
+            st.probing = False
+            if ok:
+                st.consecutive_failures = 0
+                if st.state != CLOSED:
+                    st.state = CLOSED
+                    st.samples.clear()
+                    st.samples.append((latency_s, ok))
+                return
+            st.consecutive_failures += 1
+            failures = sum(1 for _, good in st.samples if not good)
+            tripped = st.consecutive_failures >= self.failure_threshold or (
+                len(st.samples) >= self.min_calls and failures / len(st.samples) >= self.error_rate
+            )
+            if st.state == HALF_OPEN or tripped:
+                st.state = OPEN
+                st.opened_at = now
+
+    def _latencies(self, st: _ModelState) -> list[float]:
+        return [lat for lat, ok in st.samples if ok]
+
+    def _score(self, st: _ModelState) -> float | None:
+        latencies = self._latencies(st)
+        if len(st.samples) < self.min_calls:
+            return None
+        if not latencies:
+            return float("inf")
+        errors = sum(1 for _, ok in st.samples if not ok) / len(st.samples)
+        return _percentile(latencies, 0.5) / max(0.05, 1.0 - errors)
+
+    def order(self, models: list[str], now: float | None = None) -> list[str]:
+        """Available models, fastest-and-healthiest first. Models with too few
+        samples are scored like the worst measured one, so they neither jump
+        ahead of a healthy primary nor get buried behind a failing one."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            scored = [(pos, model, self._score(self._state(model))) for pos, model in enumerate(models) if self._available(self._state(model), now)]
+        known = [score for _, _, score in scored if score is not None and score != float("inf")]
+        default = max(known, default=0.0)
+
+        def rank(item: tuple[int, str, float | None]) -> tuple[float, int]:
+            pos, _, score = item
+            return (default if score is None else score) * (1.0 + pos * self.order_bias), pos
+
+        return [model for _, model, _ in sorted(scored, key=rank)]
+
+    def hedge_delay(self, model: str) -> float | None:
+        """Seconds to wait for ``model`` before sending a backup request: its
+        ``hedge_quantile`` latency (p95 by default, at least ``hedge_min_s``), or
+        None until enough calls were observed."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            latencies = self._latencies(self._state(model))
+        if len(latencies) < self.min_calls:
+            return None
+        return max(self.hedge_min_s, _percentile(latencies, self.hedge_quantile))
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            out = {}
+            for model, st in self._models.items():
+                latencies = self._latencies(st)
+                out[model] = {
+                    "state": st.state,
+                    "calls": st.calls,
+                    "error_rate": round(sum(1 for _, ok in st.samples if not ok) / len(st.samples), 3) if st.samples else 0.0,
+                    "p50_ms": round(_percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+                    "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+                }
+            return out
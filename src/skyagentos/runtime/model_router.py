@@ -1,59 +1,480 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import hashlib
 import os
-from urllib import request
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Callable, Iterator
+
+from skyagentos.runtime.httpclient import AsyncHttpClient, HttpPool, shared_async_client, shared_pool
+from skyagentos.runtime.model_health import ModelHealth
+from skyagentos.runtime.response_cache import ResponseCache
+from skyagentos.runtime.singleflight import SingleFlight
+from skyagentos.runtime.streaming import asse_deltas, sse_deltas
+from skyagentos.runtime.validator_batch import ValidatorBatcher
+
+TokenFn = Callable[[str], None]
+# Maps a prompt to its coalescing key; None means the call is never shared.
+PromptKeyFn = Callable[[str], "str | None"]
+# Called with the text so far after each delta; True ends the stream early.
+StopFn = Callable[[str], bool]
+
+_hedge_lock = threading.Lock()
+_hedge_executor: ThreadPoolExecutor | None = None
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    """Threads for hedged calls; a losing request runs to completion here, unobserved."""
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=int(os.getenv("MODEL_HEDGE_THREADS", "16")), thread_name_prefix="hedge")
+        return _hedge_executor
 
 
 class ModelRouter:
-    def __init__(self, base_url: str, api_key: str, budget_usd: float):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        budget_usd: float,
+        http: HttpPool | None = None,
+        ahttp: AsyncHttpClient | None = None,
+        timeout_s: float | None = None,
+        cache: ResponseCache | None = None,
+        cache_roles: set[str] | None = None,
+        health: ModelHealth | None = None,
+        flights: SingleFlight | None = None,
+        coalesce_keys: dict[str, PromptKeyFn] | None = None,
+        batcher: ValidatorBatcher | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.budget_usd = budget_usd
         self.spent_usd = 0.0
+        self.tool_spend_usd = 0.0
         self.fallbacks = {
             "planner": ["planner", "manager", "local_reflector"],
             "vision_executor": ["vision_executor", "planner"],
             "validator": ["local_reflector", "planner"],
             "manager": ["manager", "planner"],
         }
+        self.http = http or shared_pool()
+        self.aclient = ahttp or shared_async_client()
+        self.timeout_s = timeout_s or float(os.getenv("LITELLM_TIMEOUT_S", "120"))
+        self.temperature = 0.2
+        self.cache = cache
+        if cache_roles is None:
+            cache_roles = {r.strip() for r in os.getenv("MODEL_CACHE_ROLES", "planner").split(",") if r.strip()}
+        self.cache_roles = cache_roles
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.health = health or ModelHealth.from_env()
+        self.hedges = 0
+        self.hedge_spend_usd = 0.0
+        self.flights = flights or SingleFlight()
+        if coalesce_keys is None:
+            roles = {r.strip() for r in os.getenv("MODEL_COALESCE_ROLES", "planner").split(",") if r.strip()}
+            coalesce_keys = {role: self.prompt_key(role) for role in roles}
+        self.coalesce_keys = coalesce_keys
+        self.coalesced = 0
+        # Shared by scoped views: batches gather validator calls across runs.
+        self.batcher = batcher if batcher is not None else ValidatorBatcher.from_env(self)
+        self.batched = 0
+
+    def scoped(self, budget_usd: float | None = None) -> ModelRouter:
+        """Per-run view sharing configuration but tracking its own spend."""
+        clone = copy.copy(self)
+        clone.budget_usd = self.budget_usd if budget_usd is None else budget_usd
+        clone.spent_usd = 0.0
+        clone.tool_spend_usd = 0.0
+        clone.cache_hits = 0
+        clone.cache_misses = 0
+        clone.hedges = 0
+        clone.hedge_spend_usd = 0.0
+        clone.coalesced = 0
+        clone.batched = 0
+        return clone
+
+    def prompt_key(self, role: str) -> PromptKeyFn:
+        """Default coalescing key: identical role, temperature and prompt."""
+        return lambda prompt: f"{role}:" + hashlib.sha256(f"{self.temperature:.4f}\x00{prompt}".encode("utf-8")).hexdigest()
 
-    def _estimate_cost(self, text: str) -> float:
+    def estimate_cost(self, text: str) -> float:
         return max(0.0002, len(text) / 10000.0)
 
-    def complete(self, role: str, prompt: str) -> str:
-        est = self._estimate_cost(prompt)
+    def _check_budget(self, prompt: str) -> float:
+        est = self.estimate_cost(prompt)
         if self.spent_usd + est > self.budget_usd:
             raise RuntimeError("budget exceeded")
+        return est
+
+    def charge(self, usd: float) -> None:
+        """Count non-model spend (a priced tool call) against the same budget."""
+        if self.spent_usd + usd > self.budget_usd:
+            raise RuntimeError("budget exceeded")
+        self.spent_usd += usd
+        self.tool_spend_usd += usd
+
+    def _cached(self, role: str, models: list[str], prompt: str) -> str | None:
+        """Cache lookup across the role's fallback chain; hits are not charged."""
+        if self.cache is None or role not in self.cache_roles:
+            return None
+        for model in models:
+            hit = self.cache.get(self.cache.key(model, prompt, self.temperature))
+            if hit is not None:
+                self.cache_hits += 1
+                return hit
+        self.cache_misses += 1
+        return None
+
+    def _remember(self, role: str, model: str, prompt: str, out: str) -> None:
+        if self.cache is not None and role in self.cache_roles:
+            self.cache.put(self.cache.key(model, prompt, self.temperature), out)
+
+    def complete(self, role: str, prompt: str) -> str:
+        models = self.fallbacks.get(role, [role])
+        hit = self._cached(role, models, prompt)
+        if hit is not None:
+            return hit
+        key = self._coalesce_key(role, prompt)
+        if key is None:
+            return self._complete_uncached(role, prompt)
+        # Callers sharing an in-flight result are not charged, like cache hits.
+        out, leader = self.flights.do(key, lambda: self._complete_uncached(role, prompt), namespace=f"model:{role}")
+        self.coalesced += 0 if leader else 1
+        return out
+
+    async def acomplete(self, role: str, prompt: str) -> str:
+        models = self.fallbacks.get(role, [role])
+        hit = self._cached(role, models, prompt)
+        if hit is not None:
+            return hit
+        key = self._coalesce_key(role, prompt)
+        if key is None:
+            return await self._acomplete_uncached(role, prompt)
+        out, leader = await self.flights.ado(key, lambda: self._acomplete_uncached(role, prompt), namespace=f"model:{role}")
+        self.coalesced += 0 if leader else 1
+        return out
+
+    def _coalesce_key(self, role: str, prompt: str) -> str | None:
+        key_fn = self.coalesce_keys.get(role)
+        return key_fn(prompt) if key_fn is not None else None
+
+    def _batches(self, role: str) -> bool:
+        return self.batcher is not None and role == self.batcher.role
+
+    def _complete_uncached(self, role: str, prompt: str) -> str:
+        est = self._check_budget(prompt)
+        if self._batches(role):
+            # Each caller is charged for its own item, as if sent alone.
+            out = self.batcher.submit(prompt)
+            self.spent_usd += est
+            self.batched += 1
+            return out
+        model, out = self._first_success(role, prompt, est)
+        self.spent_usd += est
+        self._remember(role, model, prompt, out)
+        return out
+
+    async def _acomplete_uncached(self, role: str, prompt: str) -> str:
+        est = self._check_budget(prompt)
+        if self._batches(role):
+            out = await self.batcher.asubmit(prompt)
+            self.spent_usd += est
+            self.batched += 1
+            return out
+        model, out = await self._afirst_success(role, prompt, est)
+        self.spent_usd += est
+        self._remember(role, model, prompt, out)
+        return out
+
+    def _candidates(self, role: str) -> list[str]:
+        models = self.health.order(self.fallbacks.get(role, [role]))
+        if not models:
+            raise RuntimeError(f"all model fallbacks failed for role={role}: every circuit is open")
+        return models
+
+    def _hedge_delay(self, model: str, queue: list[str], est: float) -> float | None:
+        """Hedge only with a backup to go to and budget for paying both requests."""
+        if not queue or self.spent_usd + 2 * est > self.budget_usd:
+            return None
+        return self.health.hedge_delay(model)
+
+    def _first_success(self, role: str, prompt: str, est: float) -> tuple[str, str]:
+        """Walk the health-ordered chain. When the current model is slower than its
+        p95, send one backup request to the next model and take whichever answers first."""
+        queue = self._candidates(role)
+        pending: dict[Future, str] = {}
+        last_err: Exception | None = None
+        while queue or pending:
+            delay = None
+            if not pending:
+                model = queue.pop(0)
+                delay = self._hedge_delay(model, queue, est)
+                if delay is None:
+                    try:
+                        return model, self._timed_call(model, prompt)
+                    except Exception as exc:
+                        last_err = exc
+                        continue
+                pending[_hedge_pool().submit(self._timed_call, model, prompt)] = model
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                backup = queue.pop(0)
+                self.hedges += 1
+                self.spent_usd += est
+                self.hedge_spend_usd += est
+                pending[_hedge_pool().submit(self._timed_call, backup, prompt)] = backup
+                continue
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    return model, future.result()
+                except Exception as exc:
+                    last_err = exc
+        raise RuntimeError(f"all model fallbacks failed for role={role}: {last_err}")
+
+    async def _afirst_success(self, role: str, prompt: str, est: float) -> tuple[str, str]:
+        queue = self._candidates(role)
+        pending: dict[asyncio.Future, str] = {}
+        last_err: Exception | None = None
+        try:
+            while queue or pending:
+                delay = None
+                if not pending:
+                    model = queue.pop(0)
+                    delay = self._hedge_delay(model, queue, est)
+                    if delay is None:
+                        try:
+                            return model, await self._atimed_call(model, prompt)
+                        except Exception as exc:
+                            last_err = exc
+                            continue
+                    pending[asyncio.ensure_future(self._atimed_call(model, prompt))] = model
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    backup = queue.pop(0)
+                    self.hedges += 1
+                    self.spent_usd += est
+                    self.hedge_spend_usd += est
+                    pending[asyncio.ensure_future(self._atimed_call(backup, prompt))] = backup
+                    continue
+                for task in done:
+                    model = pending.pop(task)
+                    try:
+                        return model, task.result()
+                    except Exception as exc:
+                        last_err = exc
+        finally:
+            # Unlike threads, the losing request can actually be cancelled here.
+            for task in pending:
+                task.cancel()
+        raise RuntimeError(f"all model fallbacks failed for role={role}: {last_err}")
+
+    def _timed_call(self, model: str, prompt: str) -> str:
+        self.health.acquire(model)
+        start = time.perf_counter()
+        try:
+            out = self._call(model, prompt)
+        except Exception:
+            self.health.record(model, time.perf_counter() - start, ok=False)
+            raise
+        self.health.record(model, time.perf_counter() - start, ok=True)
+        return out
+
+    async def _atimed_call(self, model: str, prompt: str) -> str:
+        self.health.acquire(model)
+        start = time.perf_counter()
+        try:
+            out = await self._acall(model, prompt)
+        except asyncio.CancelledError:
+            self.health.release(model)
+            raise
+        except Exception:
+            self.health.record(model, time.perf_counter() - start, ok=False)
+            raise
+        self.health.record(model, time.perf_counter() - start, ok=True)
+        return out
+
+    def _observed(self, model: str, stream: Iterator[str]) -> Iterator[str]:
+        """Health accounting for a stream: time to first token, or the failure before it."""
+        self.health.acquire(model)
+        start = time.perf_counter()
+        recorded = False
+        try:
+            for delta in stream:
+                if not recorded:
+                    self.health.record(model, time.perf_counter() - start, ok=True)
+                    recorded = True
+                yield delta
+        except Exception:
+            if not recorded:
+                self.health.record(model, time.perf_counter() - start, ok=False)
+                recorded = True
+            raise
+        finally:
+            if not recorded:
+                self.health.release(model)
+            stream.close()
 
+    async def _aobserved(self, model: str, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        self.health.acquire(model)
+        start = time.perf_counter()
+        recorded = False
+        try:
+            async for delta in stream:
+                if not recorded:
+                    self.health.record(model, time.perf_counter() - start, ok=True)
+                    recorded = True
+                yield delta
+        except Exception:
+            if not recorded:
+                self.health.record(model, time.perf_counter() - start, ok=False)
+                recorded = True
+            raise
+        finally:
+            if not recorded:
+                self.health.release(model)
+            await stream.aclose()
+
+    def complete_stream(self, role: str, prompt: str, on_token: TokenFn | None = None, stop: StopFn | None = None) -> str:
+        """``complete`` over an SSE stream: deltas go to ``on_token`` as they arrive and
+        the call returns early once ``stop`` accepts the text so far.
+
+        Falls back to the next model only while nothing has been emitted yet.
+        Early-stopped replies are not cached.
+        """
         models = self.fallbacks.get(role, [role])
+        hit = self._cached(role, models, prompt)
+        if hit is not None:
+            if on_token:
+                on_token(hit)
+            return hit
+        est = self._check_budget(prompt)
         last_err = None
-        for model in models:
+        for model in self._candidates(role):
+            text = ""
+            stream = self._observed(model, self._call_stream(model, prompt))
             try:
-                out = self._call(model, prompt)
+                for delta in stream:
+                    text += delta
+                    if on_token:
+                        on_token(delta)
+                    if stop is not None and stop(text):
+                        break
+                else:
+                    self._remember(role, model, prompt, text)
                 self.spent_usd += est
-                return out
+                return text
             except Exception as exc:
+                if text:
+                    self.spent_usd += est
+                    raise
                 last_err = exc
+            finally:
+                stream.close()
         raise RuntimeError(f"all model fallbacks failed for role={role}: {last_err}")
 
-    def _call(self, model: str, prompt: str) -> str:
-        if os.getenv("SKYAGENT_DRY_RUN", "false").lower() == "true":
-            if model == "local_reflector":
-                return '{"passed": true, "reason": "dry-run validated", "next_action": "none"}'
-            return f"[dry-run:{model}] {prompt[:180]}"
+    async def acomplete_stream(self, role: str, prompt: str, on_token: TokenFn | None = None, stop: StopFn | None = None) -> str:
+        models = self.fallbacks.get(role, [role])
+        hit = self._cached(role, models, prompt)
+        if hit is not None:
+            if on_token:
+                on_token(hit)
+            return hit
+        est = self._check_budget(prompt)
+        last_err = None
+        for model in self._candidates(role):
+            text = ""
+            stream = self._aobserved(model, self._acall_stream(model, prompt))
+            try:
+                async for delta in stream:
+                    text += delta
+                    if on_token:
+                        on_token(delta)
+                    if stop is not None and stop(text):
+                        break
+                else:
+                    self._remember(role, model, prompt, text)
+                self.spent_usd += est
+                return text
+            except Exception as exc:
+                if text:
+                    self.spent_usd += est
+                    raise
+                last_err = exc
+            finally:
+                await stream.aclose()
+        raise RuntimeError(f"all model fallbacks failed for role={role}: {last_err}")
+
+    @staticmethod
+    def _dry_run() -> bool:
+        return os.getenv("SKYAGENT_DRY_RUN", "false").lower() == "true"
+
+    @staticmethod
+    def _dry_run_reply(model: str, prompt: str) -> str:
+        if model == "local_reflector":
+            return '{"passed": true, "reason": "dry-run validated", "next_action": "none"}'
+        return f"[dry-run:{model}] {prompt[:180]}"
+
+    @staticmethod
+    def _dry_run_chunks(text: str) -> list[str]:
+        return [text[i : i + 8] for i in range(0, len(text), 8)]
 
+    def _request(self, model: str, prompt: str, stream: bool = False) -> tuple[str, dict, dict[str, str]]:
         payload = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.2,
+            "temperature": self.temperature,
         }
-        req = request.Request(
-            f"{self.base_url}/v1/chat/completions",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"},
-            method="POST",
-        )
-        with request.urlopen(req, timeout=120) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
+        if stream:
+            payload["stream"] = True
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        return f"{self.base_url}/v1/chat/completions", payload, headers
+
+    def _call(self, model: str, prompt: str) -> str:
+        if self._dry_run():
+            return self._dry_run_reply(model, prompt)
+
+        url, payload, headers = self._request(model, prompt)
+        # Completions have no side effects, so a stale keep-alive connection may replay them.
+        body = self.http.post_json(url, payload, headers=headers, timeout=self.timeout_s, idempotent=True)
         return body["choices"][0]["message"]["content"]
+
+    async def _acall(self, model: str, prompt: str) -> str:
+        if self._dry_run():
+            return self._dry_run_reply(model, prompt)
+
+        url, payload, headers = self._request(model, prompt)
+        body = await self.aclient.post_json(url, payload, headers=headers, timeout=self.timeout_s, idempotent=True)
+        return body["choices"][0]["message"]["content"]
+
+    def _call_stream(self, model: str, prompt: str) -> Iterator[str]:
+        if self._dry_run():
+            yield from self._dry_run_chunks(self._dry_run_reply(model, prompt))
+            return
+
+        url, payload, headers = self._request(model, prompt, stream=True)
+        lines = self.http.stream_lines(url, payload, headers=headers, timeout=self.timeout_s, idempotent=True)
+        try:
+            yield from sse_deltas(lines)
+        finally:
+            lines.close()
+
+    async def _acall_stream(self, model: str, prompt: str) -> AsyncIterator[str]:
+        if self._dry_run():
+            for chunk in self._dry_run_chunks(self._dry_run_reply(model, prompt)):
+                yield chunk
+            return
+
+        url, payload, headers = self._request(model, prompt, stream=True)
+        lines = self.aclient.stream_lines(url, payload, headers=headers, timeout=self.timeout_s, idempotent=True)
+        try:
+            async for delta in asse_deltas(lines):
+                yield delta
+        finally:
+            await lines.aclose()
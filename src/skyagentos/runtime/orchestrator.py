@@ -2,24 +2,52 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from uuid import uuid4
 
 from skyagentos.agents.specialists import SPECIALISTS
 from skyagentos.memory.retrieval import episodic_summary, semantic_rank
+from skyagentos.memory.queue import QueueJob
 from skyagentos.memory.store import MemoryStore
-from skyagentos.models.schemas import ErrorType, Mission, Run, RunState, Step, TelemetryEvent, ValidationResult
+from skyagentos.models.schemas import Artifact, ErrorType, Mission, Run, RunState, Step, TelemetryEvent, ValidationResult
 from skyagentos.runtime.filesystem import AgentFilesystem
 from skyagentos.runtime.model_router import ModelRouter
 from skyagentos.runtime.policies import check_permissions, requires_human_review
+from skyagentos.runtime.prompt_context import PromptContext
+from skyagentos.runtime.response_cache import ResponseCache
 from skyagentos.runtime.retry import RetryPolicy, classify_error, retry_sleep
 from skyagentos.runtime.state_machine import transition
 from skyagentos.runtime.stream import StreamFn, default_stream
+from skyagentos.runtime.streaming import DeltaCoalescer, IncrementalJson
+from skyagentos.runtime.validation import TIER_LLM, TIER_RULES, ValidationEngine, rules_enabled
 from skyagentos.tools.desktop_tool import DesktopTool
 from skyagentos.tools.skyvern_tool import SkyvernTool
 
 
+@dataclass
+class RunContext:
+    run: Run
+    mission: Mission
+    runtime: str
+    paths: dict[str, Path]
+    plan: str = ""
+    rules: ValidationEngine | None = None
+
+
+@dataclass
+class PreparedIteration:
+    """Executor step and payload for iteration ``i``, built while ``i - 1`` validates."""
+
+    i: int
+    exec_step: Step
+    payload: dict
+    prep_ms: float = 0.0
+
+
 class Orchestrator:
     def __init__(self, db_path: Path, litellm_base_url: str, litellm_key: str, skyvern_url: str, stream_fn: StreamFn = default_stream):
         self.store = MemoryStore(db_path)
@@ -28,30 +56,108 @@ class Orchestrator:
             litellm_base_url,
             litellm_key,
             budget_usd=float(os.getenv("SKYAGENT_BUDGET_USD", "10.0")),
+            cache=ResponseCache.from_env(self.store),
         )
         self.skyvern = SkyvernTool(skyvern_url, artifact_dir=Path("workspace_artifacts/browser"))
         self.desktop = DesktopTool(os.getenv("DESKTOP_DAEMON_URL", "http://desktop-daemon:8890"), artifact_dir=Path("workspace_artifacts/desktop"))
         self.retry = RetryPolicy(max_attempts=int(os.getenv("MAX_SELF_CORRECTIONS", "3")))
         self.stream = stream_fn
         self.fs = AgentFilesystem()
+        self.retrieval = os.getenv("SKYAGENT_MEMORY_RETRIEVAL", "index")
+        self._prep_executor: ThreadPoolExecutor | None = None
+        self.stream_completions = os.getenv("SKYAGENT_STREAM_COMPLETIONS", "false").lower() == "true"
+        self.plan_delta_chars = int(os.getenv("SKYAGENT_PLAN_DELTA_CHARS", "256"))
+        self.prompts = PromptContext.from_env()
 
-    def run_mission(self, mission: Mission) -> dict:
+    def close(self) -> None:
+        """Flush buffered writes and release threads and connections."""
+        if self._prep_executor is not None:
+            self._prep_executor.shutdown(wait=False, cancel_futures=True)
+            self._prep_executor = None
+        self.store.close()
+
+    def submit(self, mission: Mission, priority: int = 0) -> dict:
+        """Persist a mission and queue it for a worker; returns without executing."""
+        self._speculative_attempts(mission)  # reject bad metadata before it reaches a worker
         run = Run(id=f"run-{uuid4().hex[:8]}", mission_id=mission.id)
         self.store.save_mission(mission)
         self.store.save_run(run)
         self.store.set_run_control(run.id, "active")
-        self.store.enqueue(run.id, mission.model_dump())
+        job_id = self.store.queue.enqueue(run.id, mission.model_dump(), priority=priority)
         self.stream("progress", {"run_id": run.id, "state": run.state.value})
+        return {"run_id": run.id, "state": run.state.value, "job_id": job_id}
 
-        queue_job = self.store.dequeue()
-        if not queue_job:
-            raise RuntimeError("queue is empty")
-        job_id, _, _ = queue_job
+    def run_mission(self, mission: Mission) -> dict:
+        submitted = self.submit(mission)
+        worker_id = f"inline-{uuid4().hex[:8]}"
+        job = self.store.queue.claim_job(submitted["job_id"], worker_id)
+        if not job:
+            raise RuntimeError(f"queued job {submitted['job_id']} was claimed by another worker")
+        try:
+            # Inline runs are not redelivered, so any error is final.
+            return self.execute_job(job, final=True)
+        finally:
+            self.store.queue.ack(job.id, worker_id)
 
+    def execute_job(self, job: QueueJob, final: bool | None = None) -> dict:
+        """Run a claimed job. Policy rejections fail the run and return normally (the
+        job is acked); other errors propagate for a queue retry, failing the run
+        first when this was the job's last attempt (or ``final``)."""
+        loaded = self._load_job(job)
+        if isinstance(loaded, dict):
+            return loaded
+        run, mission = loaded
+        router = self.router.scoped()
         try:
-            return self._execute_run(run, mission)
+            return self._execute_run(run, mission, router)
+        except Exception as exc:
+            outcome = self._job_error(job, run, exc, final)
+            if outcome is None:
+                raise
+            return outcome
         finally:
-            self.store.ack(job_id)
+            self._record_usage(run, router)
+            self.store.flush()
+
+    def _job_error(self, job: QueueJob, run: Run, exc: Exception, final: bool | None) -> dict | None:
+        error = f"{type(exc).__name__}: {exc}"
+        if isinstance(exc, PermissionError) or classify_error(exc) == ErrorType.POLICY_BLOCKED:
+            return self.fail_run(run, error)
+        if final or (final is None and job.attempts >= job.max_attempts):
+            self.fail_run(run, error)
+        return None
+
+    def fail_run(self, run: Run | str, error: str) -> dict:
+        """Move a run to FAILED with its error (by id when called from a worker after dead-lettering)."""
+        if isinstance(run, str):
+            stored = self.store.get_run_payload(run)
+            if not stored:
+                return {"run_id": run, "state": RunState.FAILED.value, "error": error}
+            run = Run(**stored)
+            if stored["state"] in {RunState.COMPLETED.value, RunState.FAILED.value}:
+                return {"run_id": run.id, "state": stored["state"], "error": run.error}
+        run.state = RunState.FAILED
+        run.error = error[:2000]
+        self._save_state(run, error=run.error)
+        return {"run_id": run.id, "state": run.state.value, "error": run.error}
+
+    def _save_state(self, run: Run, **extra) -> None:
+        """Persist a state transition and publish it, so watchers see every state."""
+        self.store.save_run(run)
+        self.stream("progress", {"run_id": run.id, "state": run.state.value, **extra})
+
+    def _load_job(self, job: QueueJob) -> tuple[Run, Mission] | dict:
+        mission = Mission(**job.payload)
+        stored = self.store.get_run_payload(job.run_id)
+        run = Run(**stored) if stored else Run(id=job.run_id, mission_id=mission.id)
+        run.state = RunState(run.state)
+        if run.state in {RunState.COMPLETED, RunState.FAILED}:
+            return {"run_id": run.id, "state": run.state.value, "reason": "already finished"}
+        if job.attempts > 1 or run.state != RunState.CREATED:
+            # Redelivered after a lost lease: restart the run from the top.
+            run.attempt += 1
+            run.state = RunState.CREATED
+        return run, mission
 
     def _select_runtime(self, mission: Mission) -> str:
         forced = mission.metadata.get("runtime") if mission.metadata else None
@@ -63,13 +169,218 @@ class Orchestrator:
             return "desktop"
         return "browser"
 
-    def _execute_run(self, run: Run, mission: Mission) -> dict:
+    def _execute_run(self, run: Run, mission: Mission, router: ModelRouter) -> dict:
+        ctx = self._begin_run(run, mission)
+        if isinstance(ctx, dict):
+            return ctx
+
+        ctx.plan = self._plan(ctx, router)
+        self._planned(ctx)
+        if self._speculative_attempts(mission) > 1:
+            return self._execute_speculative(ctx, router)
+
+        pipeline = self._pipelined(mission)
+        ahead: Future | None = None
+        for i in range(1, mission.max_steps + 1):
+            paused = self._check_paused(ctx)
+            if paused:
+                return paused
+
+            prepared = self._take_prepared(ahead, i)
+            ahead = None
+            exec_step = prepared.exec_step if prepared else self._executor_step(ctx, i)
+            payload = prepared.payload if prepared else self._executor_payload(ctx, i)
+            start = time.time()
+            try:
+                self._charge_executor(ctx, router)
+                result, artifact = self._call_executor(ctx, exec_step, payload)
+                self._record_execution(ctx, exec_step, result, artifact, start)
+
+                if pipeline and i < mission.max_steps:
+                    ahead = self._prep_pool().submit(self._prepare_iteration, ctx, i + 1)
+                parsed = self._validate(ctx, router, result, i)
+
+                outcome = self._after_validation(ctx, parsed, result, artifact, i)
+                if outcome:
+                    if ahead:
+                        ahead.cancel()
+                    return outcome
+                retry_sleep(self.retry, i)
+            except Exception as exc:
+                outcome = self._after_error(ctx, exec_step, exc, start, i)
+                if outcome:
+                    if ahead:
+                        ahead.cancel()
+                    return outcome
+                retry_sleep(self.retry, i)
+
+        return self._exhausted(ctx)
+
+    def _execute_speculative(self, ctx: RunContext, router: ModelRouter) -> dict:
+        """Launch a round of parallel executor attempts; the first that validates wins.
+
+        Attempts are validated in completion order on this thread, so state
+        transitions stay sequential. Each attempt is charged when launched, so the
+        next round's width already accounts for every earlier attempt. Once one
+        passes, the rest are abandoned: queued ones never start, and browser tasks
+        still running are cancelled remotely as soon as their call returns.
+        """
+        cancel = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=self._speculative_attempts(ctx.mission), thread_name_prefix=f"speculate-{ctx.run.id}")
+        unsettled: set[Future] = set()
+        try:
+            i = 1
+            while i <= ctx.mission.max_steps:
+                paused = self._check_paused(ctx)
+                if paused:
+                    return paused
+                width = self._speculation_width(ctx, router, i)
+                futures = {}
+                for j in range(width):
+                    exec_step = self._executor_step(ctx, i + j)
+                    payload = self._executor_payload(ctx, i + j, j)
+                    self._charge_executor(ctx, router)
+                    futures[pool.submit(self._call_executor, ctx, exec_step, payload, cancel)] = (exec_step, time.time())
+                unsettled = set(futures)
+                for n, future in enumerate(as_completed(futures)):
+                    unsettled.discard(future)
+                    exec_step, start = futures[future]
+                    # Limits count finished attempts and the width stays within them,
+                    # so only the round's last one can be terminal.
+                    outcome = self._settle_attempt(ctx, router, exec_step, future, start, i + n)
+                    if outcome:
+                        self._record_speculation(ctx, exec_step, width, n + 1)
+                        return outcome
+                self._record_speculation(ctx, None, width, width)
+                i += width
+                retry_sleep(self.retry, i - 1)
+            return self._exhausted(ctx)
+        finally:
+            cancel.set()
+            for future in unsettled:
+                if not future.cancel() and ctx.runtime == "browser":
+                    future.add_done_callback(self._cancel_abandoned)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _cancel_abandoned(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        result, _ = future.result()
+        self.skyvern.cancel_task(result)
+
+    def _task_cost(self, ctx: RunContext) -> float:
+        """Price of one browser task (``SKYVERN_TASK_COST_USD``); other executors are free."""
+        return getattr(self.skyvern, "task_cost_usd", 0.0) if ctx.runtime == "browser" else 0.0
+
+    def _charge_executor(self, ctx: RunContext, router: ModelRouter) -> None:
+        """Count the executor call against the run's budget before it starts."""
+        cost = self._task_cost(ctx)
+        if cost:
+            router.charge(cost)
+
+    def _call_executor(self, ctx: RunContext, exec_step: Step, payload: dict, cancel: threading.Event | None = None) -> tuple[dict, Artifact]:
+        if ctx.runtime == "desktop":
+            return self.desktop.execute(ctx.run.id, exec_step.id, "operate", payload)
+        if cancel is not None:
+            return self.skyvern.execute(ctx.run.id, exec_step.id, payload, cancel=cancel)
+        return self.skyvern.execute(ctx.run.id, exec_step.id, payload)
+
+    def _prep_pool(self) -> ThreadPoolExecutor:
+        if self._prep_executor is None:
+            self._prep_executor = ThreadPoolExecutor(max_workers=int(os.getenv("SKYAGENT_PIPELINE_THREADS", "4")), thread_name_prefix="prepare")
+        return self._prep_executor
+
+    def _prepare_iteration(self, ctx: RunContext, i: int) -> PreparedIteration:
+        start = time.perf_counter()
+        prepared = PreparedIteration(i, self._executor_step(ctx, i), self._executor_payload(ctx, i))
+        try:
+            (self.desktop if ctx.runtime == "desktop" else self.skyvern).warm()
+        except (ConnectionError, TimeoutError):
+            pass  # the executor call itself reports connection problems through the retry path
+        prepared.prep_ms = (time.perf_counter() - start) * 1000
+        return prepared
+
+    def _take_prepared(self, ahead: Future | None, i: int) -> PreparedIteration | None:
+        if ahead is None:
+            return None
+        try:
+            prepared = ahead.result()
+        except Exception:
+            return None
+        return self._use_prepared(prepared, i)
+
+    def _settle_attempt(self, ctx: RunContext, router: ModelRouter, exec_step: Step, future: Future, start: float, n: int) -> dict | None:
+        try:
+            result, artifact = future.result()
+            self._record_execution(ctx, exec_step, result, artifact, start)
+            parsed = self._validate(ctx, router, result, exec_step.input["iteration"])
+            return self._after_validation(ctx, parsed, result, artifact, n)
+        except Exception as exc:
+            return self._after_error(ctx, exec_step, exc, start, n)
+
+    # Run bookkeeping shared by the threaded and asyncio execution paths.
+
+    @staticmethod
+    def _pipelined(mission: Mission) -> bool:
+        """Prepare iteration i+1 while iteration i validates (``pipeline_validation`` metadata or env)."""
+        configured = (mission.metadata or {}).get("pipeline_validation")
+        if configured is None:
+            configured = os.getenv("SKYAGENT_PIPELINE_VALIDATION", "false").lower() == "true"
+        return bool(configured)
+
+    def _use_prepared(self, prepared: PreparedIteration, i: int) -> PreparedIteration | None:
+        if prepared.i != i:
+            return None
+        self.store.save_telemetry(
+            TelemetryEvent(run_id=prepared.exec_step.run_id, step_id=prepared.exec_step.id, name="pipeline_prep_ms", value=round(prepared.prep_ms, 3))
+        )
+        return prepared
+
+    def _executor_payload(self, ctx: RunContext, i: int, variant: int = 0) -> dict:
+        return self._desktop_payload(ctx, i) if ctx.runtime == "desktop" else self._browser_payload(ctx, i, variant)
+
+    @staticmethod
+    def _speculative_attempts(mission: Mission) -> int:
+        """Parallel executor attempts per round (``speculative_attempts`` metadata or env); 0 or 1 disables."""
+        configured = (mission.metadata or {}).get("speculative_attempts")
+        if configured is None:
+            configured = os.getenv("SKYAGENT_SPECULATIVE_ATTEMPTS", "1")
+        if isinstance(configured, bool):
+            raise ValueError(f"speculative_attempts must be an integer, got {configured!r}")
+        try:
+            return max(1, int(configured))
+        except (TypeError, ValueError):
+            raise ValueError(f"speculative_attempts must be an integer, got {configured!r}") from None
+
+    def _speculation_width(self, ctx: RunContext, router: ModelRouter, i: int) -> int:
+        """Attempts for the round starting at iteration ``i``, bounded by max_steps, by the
+        retry limit (the attempt settling at it ends the run) and by how many attempts
+        (task price plus a worst-case validator call) the mission budget still covers."""
+        last = min(ctx.mission.max_steps, self.retry.max_attempts)
+        width = min(self._speculative_attempts(ctx.mission), last - i + 1)
+        per_attempt = router.estimate_cost(self._validate_prompt(ctx, {"result": "x" * 1800}))
+        per_attempt += self._task_cost(ctx)
+        remaining = min(router.budget_usd, ctx.mission.budget_usd) - router.spent_usd
+        return max(1, min(width, int(remaining // per_attempt)))
+
+    def _record_speculation(self, ctx: RunContext, winner: Step | None, width: int, settled: int) -> None:
+        self.store.save_telemetry(
+            TelemetryEvent(
+                run_id=ctx.run.id,
+                step_id=winner.id if winner else "speculation",
+                name="speculative_round",
+                value=float(width),
+                tags={"settled": str(settled), "abandoned": str(width - settled), "runtime": ctx.runtime},
+            )
+        )
+
+    def _begin_run(self, run: Run, mission: Mission) -> RunContext | dict:
         run_paths = self.fs.init_run(run.id)
         self.fs.write_json(run_paths["inputs"] / "mission.json", mission.model_dump())
 
         if requires_human_review(mission):
             run.state = RunState.HUMAN_REVIEW
-            self.store.save_run(run)
+            self._save_state(run, reason="domain requires human review")
             return {"run_id": run.id, "state": run.state.value, "reason": "domain requires human review"}
 
         runtime = self._select_runtime(mission)
@@ -77,146 +388,263 @@ class Orchestrator:
         check_permissions(mission, [required_perm])
 
         run.state = transition(run.state, RunState.PLANNED)
-        self.store.save_run(run)
+        self._save_state(run)
+        rules = ValidationEngine.for_mission(mission) if rules_enabled() else None
+        return RunContext(run=run, mission=mission, runtime=runtime, paths=run_paths, rules=rules)
 
-        episodic = self.store.read_memory("episodic_memory", mission.domain, limit=20)
-        semantic = self.store.read_memory("semantic_memory", mission.domain, limit=50)
-        retrieved = semantic_rank(mission.objective, semantic)[:3]
+    def _plan_prompt(self, ctx: RunContext) -> str:
+        mission = ctx.mission
+        return self.prompts.planner(ctx.runtime, mission.objective, self._failure_summary(mission), self._retrieve(mission, k=3))
 
-        plan_prompt = (
-            f"You are planner. Runtime={runtime}. Objective: {mission.objective}\n"
-            f"Prior failures summary: {episodic_summary(episodic)}\n"
-            f"Relevant memory: {retrieved}\n"
-            "Return concise numbered plan + success criteria."
+    def _failure_summary(self, mission: Mission) -> str:
+        """Top decayed failure themes, maintained on write (``scan`` recounts the last 20 events)."""
+        if self.retrieval == "scan":
+            return episodic_summary(self.store.read_memory("episodic_memory", mission.domain, limit=20))
+        return self.store.themes.summary(mission.domain)
+
+    def _retrieve(self, mission: Mission, k: int) -> list[str]:
+        """Relevant semantic memory for the objective (``SKYAGENT_MEMORY_RETRIEVAL``)."""
+        if self.retrieval == "scan":
+            semantic = self.store.read_memory("semantic_memory", mission.domain, limit=50)
+            return semantic_rank(mission.objective, semantic)[:k]
+        return self.store.search_semantic(mission.domain, mission.objective, k=k, mode=self.retrieval)
+
+    def _planned(self, ctx: RunContext) -> None:
+        self.store.push_episodic(ctx.mission.domain, f"plan:{ctx.plan[:300]}")
+        ctx.run.state = transition(ctx.run.state, RunState.EXECUTING)
+        self._save_state(ctx.run)
+
+    def _check_paused(self, ctx: RunContext) -> dict | None:
+        if self.store.get_run_control(ctx.run.id) != "paused":
+            return None
+        ctx.run.state = RunState.HUMAN_REVIEW
+        self._save_state(ctx.run, reason="paused by operator")
+        return {"run_id": ctx.run.id, "state": ctx.run.state.value, "reason": "paused by operator"}
+
+    def _executor_step(self, ctx: RunContext, i: int) -> Step:
+        return Step(
+            id=f"step-{i}-executor",
+            run_id=ctx.run.id,
+            role=f"{ctx.runtime}_executor",
+            action=f"{ctx.runtime}.execute",
+            input={"objective": ctx.mission.objective, "iteration": i, "runtime": ctx.runtime},
         )
-        plan = self.router.complete("planner", plan_prompt)
-        self.store.push_episodic(mission.domain, f"plan:{plan[:300]}")
 
-        run.state = transition(run.state, RunState.EXECUTING)
-        self.store.save_run(run)
+    @staticmethod
+    def _desktop_payload(ctx: RunContext, i: int) -> dict:
+        return {"prompt": ctx.mission.objective, "iteration": i}
 
-        for i in range(1, mission.max_steps + 1):
-            if self.store.get_run_control(run.id) == "paused":
-                run.state = RunState.HUMAN_REVIEW
-                self.store.save_run(run)
-                return {"run_id": run.id, "state": run.state.value, "reason": "paused by operator"}
+    @staticmethod
+    def _browser_payload(ctx: RunContext, i: int, variant: int = 0) -> dict:
+        mission = ctx.mission
+        engine = os.getenv("SKYVERN_ENGINE", "browser")
+        if variant:
+            # Speculative attempt j > 0 uses SKYVERN_SPECULATIVE_ENGINES[j % len] to diversify the round.
+            engines = [e.strip() for e in os.getenv("SKYVERN_SPECULATIVE_ENGINES", "").split(",") if e.strip()] or [engine]
+            engine = engines[variant % len(engines)]
+        return {
+            "prompt": mission.objective,
+            "url": mission.metadata.get("url") if mission.metadata else None,
+            "engine": engine,
+            "metadata": {"run_id": ctx.run.id, "iteration": i, "runtime": ctx.runtime},
+        }
 
-            exec_step = Step(
-                id=f"step-{i}-executor",
+    def _record_execution(self, ctx: RunContext, exec_step: Step, result: dict, artifact: Artifact, start: float) -> None:
+        run = ctx.run
+        exec_step.output = result
+        exec_step.state = "ok"
+        exec_step.duration_ms = int((time.time() - start) * 1000)
+        self.store.save_step(exec_step)
+        self.store.save_artifact(artifact)
+        self.fs.write_json(ctx.paths["artifacts"] / f"{exec_step.id}.json", result)
+        self.store.save_telemetry(
+            TelemetryEvent(
                 run_id=run.id,
-                role=f"{runtime}_executor",
-                action=f"{runtime}.execute",
-                input={"objective": mission.objective, "iteration": i, "runtime": runtime},
+                step_id=exec_step.id,
+                name=f"{ctx.runtime}_call_ms",
+                value=float(exec_step.duration_ms),
+                tags={"iteration": str(exec_step.input["iteration"]), "run_state": run.state.value, "runtime": ctx.runtime},
             )
-            start = time.time()
-            try:
-                if runtime == "desktop":
-                    result, artifact = self.desktop.execute(run.id, exec_step.id, "operate", {"prompt": mission.objective, "iteration": i})
-                else:
-                    payload = {
-                        "prompt": mission.objective,
-                        "url": mission.metadata.get("url") if mission.metadata else None,
-                        "engine": os.getenv("SKYVERN_ENGINE", "browser"),
-                        "metadata": {"run_id": run.id, "iteration": i, "runtime": runtime},
-                    }
-                    result, artifact = self.skyvern.execute(run.id, exec_step.id, payload)
-
-                exec_step.output = result
-                exec_step.state = "ok"
-                exec_step.duration_ms = int((time.time() - start) * 1000)
-                self.store.save_step(exec_step)
-                self.store.save_artifact(artifact)
-                self.fs.write_json(run_paths["artifacts"] / f"{exec_step.id}.json", result)
-                self.store.save_telemetry(
-                    TelemetryEvent(
-                        run_id=run.id,
-                        step_id=exec_step.id,
-                        name=f"{runtime}_call_ms",
-                        value=float(exec_step.duration_ms),
-                        tags={"iteration": str(i), "run_state": run.state.value, "runtime": runtime},
-                    )
-                )
+        )
+        run.state = transition(run.state, RunState.VALIDATING)
+        self._save_state(run)
 
-                run.state = transition(run.state, RunState.VALIDATING)
-                self.store.save_run(run)
+    def _validator_step(self, ctx: RunContext, result: dict, i: int) -> Step:
+        return Step(
+            id=f"step-{i}-validator",
+            run_id=ctx.run.id,
+            role="validator",
+            action="validate.execution",
+            input={"plan": ctx.plan, "execution_result": result, "runtime": ctx.runtime, "iteration": i},
+        )
 
-                val_step = Step(
-                    id=f"step-{i}-validator",
-                    run_id=run.id,
-                    role="validator",
-                    action="validate.execution",
-                    input={"plan": plan, "execution_result": result, "runtime": runtime},
-                )
-                vstart = time.time()
-                validate_prompt = (
-                    "Return strict JSON only: {passed:boolean,reason:string,next_action:string}.\n"
-                    f"Plan:{plan}\nRuntime:{runtime}\nExecution:{json.dumps(result)[:1800]}"
-                )
-                raw = self.router.complete("validator", validate_prompt)
-                parsed = self._parse_validation(raw)
-                val_step.output = {"raw": raw, "parsed": parsed.model_dump()}
-                val_step.state = "ok"
-                val_step.duration_ms = int((time.time() - vstart) * 1000)
-                self.store.save_step(val_step)
-                self.fs.write_json(run_paths["logs"] / f"{val_step.id}.json", val_step.output)
-                self.store.save_telemetry(
-                    TelemetryEvent(
-                        run_id=run.id,
-                        step_id=val_step.id,
-                        name="validation_ms",
-                        value=float(val_step.duration_ms),
-                        tags={"passed": str(parsed.passed).lower(), "iteration": str(i), "runtime": runtime},
-                    )
-                )
-                self.store.push_semantic(mission.domain, json.dumps(result)[:500], embedding_hint=f"{runtime}-result")
-
-                if parsed.passed:
-                    run.state = transition(run.state, RunState.COMPLETED)
-                    self.store.save_run(run)
-                    outcome = {
-                        "run_id": run.id,
-                        "state": run.state.value,
-                        "step": i,
-                        "runtime": runtime,
-                        "executor_run_id": result.get("run_id") or result.get("task_id"),
-                        "artifact": artifact.path,
-                        "validation": parsed.model_dump(),
-                    }
-                    self.fs.write_json(run_paths["outputs"] / "result.json", outcome)
-                    self.stream("progress", {"run_id": run.id, "state": run.state.value, "step": i, "runtime": runtime})
-                    return outcome
+    def _validate_prompt(self, ctx: RunContext, result: dict) -> str:
+        return self.prompts.validator(ctx.runtime, ctx.plan, result)
 
-                run.state = transition(run.state, RunState.RETRYING)
-                self.store.save_run(run)
-                self.store.push_episodic(mission.domain, f"failure:{parsed.reason}")
-                self.stream("progress", {"run_id": run.id, "state": run.state.value, "reason": parsed.reason})
+    def _validate(self, ctx: RunContext, router: ModelRouter, result: dict, i: int) -> ValidationResult:
+        """Deterministic rules first; the validator model only sees inconclusive results."""
+        val_step = self._validator_step(ctx, result, i)
+        vstart = time.time()
+        ruled = ctx.rules.evaluate(result) if ctx.rules is not None else None
+        if ruled is not None:
+            parsed, rule = ruled
+            return self._record_validation(ctx, val_step, None, result, vstart, parsed=parsed, rule=rule)
+        # Batched validator calls are not streamed; the batch answers all items at once.
+        if not self.stream_completions or router.batcher is not None:
+            raw = router.complete("validator", self._validate_prompt(ctx, result))
+            return self._record_validation(ctx, val_step, raw, result, vstart)
+        verdict = IncrementalJson()
+        raw = router.complete_stream("validator", self._validate_prompt(ctx, result), on_token=verdict.feed, stop=lambda _: self._verdict_ready(verdict))
+        return self._record_validation(ctx, val_step, raw, result, vstart, parsed=self._streamed_verdict(verdict))
 
-                if i >= self.retry.max_attempts:
-                    run.state = transition(run.state, RunState.HUMAN_REVIEW)
-                    self.store.save_run(run)
-                    return {"run_id": run.id, "state": run.state.value, "reason": parsed.reason}
+    def _plan(self, ctx: RunContext, router: ModelRouter) -> str:
+        if not self.stream_completions:
+            return router.complete("planner", self._plan_prompt(ctx))
+        deltas = self._plan_delta(ctx)
+        try:
+            return router.complete_stream("planner", self._plan_prompt(ctx), on_token=deltas)
+        finally:
+            deltas.flush()
 
-                run.state = transition(run.state, RunState.EXECUTING)
-                self.store.save_run(run)
-                retry_sleep(self.retry, i)
-            except Exception as exc:
-                et = classify_error(exc)
-                exec_step.error_type = et
-                exec_step.state = "error"
-                exec_step.duration_ms = int((time.time() - start) * 1000)
-                self.store.save_step(exec_step)
+    def _plan_delta(self, ctx: RunContext) -> DeltaCoalescer:
+        # Coalesced, so a long plan does not push the run's state events out of the bus replay history.
+        emit = lambda text: self.stream("progress", {"run_id": ctx.run.id, "state": ctx.run.state.value, "plan_delta": text})
+        return DeltaCoalescer(emit, min_chars=self.plan_delta_chars)
+
+    @staticmethod
+    def _verdict_ready(verdict: IncrementalJson) -> bool:
+        """A pass needs nothing more; a failure waits for ``reason``, which feeds episodic memory."""
+        passed = verdict.fields.get("passed")
+        return passed is True or (passed is False and "reason" in verdict.fields)
+
+    @staticmethod
+    def _streamed_verdict(verdict: IncrementalJson) -> ValidationResult | None:
+        fields = verdict.fields
+        if not isinstance(fields.get("passed"), bool):
+            return None
+        return ValidationResult(passed=fields["passed"], reason=str(fields.get("reason", "")), next_action=str(fields.get("next_action", "")))
+
+    def _record_validation(
+        self,
+        ctx: RunContext,
+        val_step: Step,
+        raw: str | None,
+        result: dict,
+        vstart: float,
+        parsed: ValidationResult | None = None,
+        rule: str | None = None,
+    ) -> ValidationResult:
+        parsed = parsed if parsed is not None else self._parse_validation(raw or "")
+        tier = TIER_RULES if rule else TIER_LLM
+        val_step.output = {"raw": raw, "parsed": parsed.model_dump(), "tier": tier}
+        if rule:
+            val_step.output["rule"] = rule
+        val_step.state = "ok"
+        val_step.duration_ms = int((time.time() - vstart) * 1000)
+        self.store.save_step(val_step)
+        self.fs.write_json(ctx.paths["logs"] / f"{val_step.id}.json", val_step.output)
+        self.store.save_telemetry(
+            TelemetryEvent(
+                run_id=ctx.run.id,
+                step_id=val_step.id,
+                name="validation_ms",
+                value=float(val_step.duration_ms),
+                tags={"passed": str(parsed.passed).lower(), "iteration": str(val_step.input["iteration"]), "runtime": ctx.runtime, "tier": tier},
+            )
+        )
+        self.store.save_telemetry(
+            TelemetryEvent(
+                run_id=ctx.run.id,
+                step_id=val_step.id,
+                name=f"validation_tier_{tier}",
+                value=1.0,
+                tags={"passed": str(parsed.passed).lower(), "rule": rule or "model", "runtime": ctx.runtime},
+            )
+        )
+        self.store.push_semantic(ctx.mission.domain, json.dumps(result)[:500], embedding_hint=f"{ctx.runtime}-result")
+        return parsed
+
+    def _after_validation(self, ctx: RunContext, parsed: ValidationResult, result: dict, artifact: Artifact, i: int) -> dict | None:
+        """Apply the validation verdict; returns the run outcome, or None to retry."""
+        run, mission, runtime = ctx.run, ctx.mission, ctx.runtime
+        if parsed.passed:
+            run.state = transition(run.state, RunState.COMPLETED)
+            self.store.save_run(run)
+            outcome = {
+                "run_id": run.id,
+                "state": run.state.value,
+                "step": i,
+                "runtime": runtime,
+                "executor_run_id": result.get("run_id") or result.get("task_id"),
+                "artifact": artifact.path,
+                "validation": parsed.model_dump(),
+            }
+            self.fs.write_json(ctx.paths["outputs"] / "result.json", outcome)
+            self.stream("progress", {"run_id": run.id, "state": run.state.value, "step": i, "runtime": runtime})
+            return outcome
+
+        run.state = transition(run.state, RunState.RETRYING)
+        self.store.push_episodic(mission.domain, f"failure:{parsed.reason}")
+        self._save_state(run, reason=parsed.reason)
+
+        if i >= self.retry.max_attempts:
+            run.state = transition(run.state, RunState.HUMAN_REVIEW)
+            self._save_state(run, reason=parsed.reason)
+            return {"run_id": run.id, "state": run.state.value, "reason": parsed.reason}
+
+        run.state = transition(run.state, RunState.EXECUTING)
+        self._save_state(run)
+        return None
+
+    def _after_error(self, ctx: RunContext, exec_step: Step, exc: Exception, start: float, i: int) -> dict | None:
+        run = ctx.run
+        et = classify_error(exc)
+        exec_step.error_type = et
+        exec_step.state = "error"
+        exec_step.duration_ms = int((time.time() - start) * 1000)
+        self.store.save_step(exec_step)
+        self.store.save_telemetry(
+            TelemetryEvent(run_id=run.id, step_id=exec_step.id, name="step_error", value=1.0, tags={"type": et.value, "runtime": ctx.runtime})
+        )
+        if et == ErrorType.BUDGET_EXCEEDED or i >= self.retry.max_attempts:
+            run.state = RunState.FAILED
+            run.error = f"{type(exc).__name__}: {exc}"[:2000]
+            self._save_state(run, error=et.value)
+            return {"run_id": run.id, "state": run.state.value, "error": et.value}
+        if run.state == RunState.VALIDATING:
+            # The validator call failed after execution was recorded; go back to executing.
+            run.state = transition(transition(run.state, RunState.RETRYING), RunState.EXECUTING)
+            self._save_state(run, error=et.value)
+        return None
+
+    def _record_usage(self, run: Run, router: ModelRouter) -> None:
+        run.cost_usd = round(router.spent_usd, 6)
+        self.store.save_run(run)
+        model_spend = round(router.spent_usd - router.tool_spend_usd, 6)
+        self.store.save_telemetry(TelemetryEvent(run_id=run.id, step_id="run", name="model_spend_usd", value=model_spend))
+        if router.tool_spend_usd:
+            self.store.save_telemetry(TelemetryEvent(run_id=run.id, step_id="run", name="tool_spend_usd", value=round(router.tool_spend_usd, 6)))
+        if router.hedges:
+            self.store.save_telemetry(TelemetryEvent(run_id=run.id, step_id="run", name="model_hedges", value=float(router.hedges)))
+            # Already part of model_spend_usd; reported apart so the cost of hedging is visible.
+            self.store.save_telemetry(
+                TelemetryEvent(run_id=run.id, step_id="run", name="model_hedge_spend_usd", value=round(router.hedge_spend_usd, 6))
+            )
+        if router.coalesced:
+            self.store.save_telemetry(TelemetryEvent(run_id=run.id, step_id="run", name="model_coalesced", value=float(router.coalesced)))
+        if router.batched:
+            self.store.save_telemetry(TelemetryEvent(run_id=run.id, step_id="run", name="model_batched", value=float(router.batched)))
+        if router.cache is not None:
+            for name, value in (("model_cache_hits", router.cache_hits), ("model_cache_misses", router.cache_misses)):
                 self.store.save_telemetry(
-                    TelemetryEvent(run_id=run.id, step_id=exec_step.id, name="step_error", value=1.0, tags={"type": et.value, "runtime": runtime})
+                    TelemetryEvent(run_id=run.id, step_id="run", name=name, value=float(value), tags={"roles": ",".join(sorted(router.cache_roles))})
                 )
-                if et == ErrorType.BUDGET_EXCEEDED or i >= self.retry.max_attempts:
-                    run.state = RunState.FAILED
-                    self.store.save_run(run)
-                    return {"run_id": run.id, "state": run.state.value, "error": et.value}
-                retry_sleep(self.retry, i)
 
-        run.state = RunState.FAILED
-        self.store.save_run(run)
-        return {"run_id": run.id, "state": run.state.value, "error": "max steps exceeded"}
+    def _exhausted(self, ctx: RunContext) -> dict:
+        ctx.run.state = RunState.FAILED
+        ctx.run.error = "max steps exceeded"
+        self._save_state(ctx.run, error=ctx.run.error)
+        return {"run_id": ctx.run.id, "state": ctx.run.state.value, "error": "max steps exceeded"}
 
     @staticmethod
     def _parse_validation(raw: str) -> ValidationResult:
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+
+# Executor result fields that carry the verdict, in prompt order; everything else follows.
+PRIORITY_KEYS = ("status", "status_code", "http_status", "error", "failure_reason", "summary", "extracted_information", "output", "evidence")
+# Bulky payloads the validator cannot use: page dumps, media, echoed requests.
+BULKY_KEYS = {"html", "dom", "page_source", "screenshot", "screenshots", "recording", "har", "trace", "raw", "request", "headers", "base64"}
+# (string chars, list items, nesting depth) tried from most to least detail.
+_SHAPES = ((800, 20, 3), (300, 10, 2), (120, 5, 2), (60, 3, 1))
+
+VALIDATOR_HEADER = "Return strict JSON only: {passed:boolean,reason:string,next_action:string}."
+PLANNER_HEADER = "You are planner. Return concise numbered plan + success criteria."
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[: max(0, max_chars - 1)] + "…"
+
+
+def clip_lines(text: str, max_chars: int) -> str:
+    """Keeps whole lines while they fit, then notes how many were left out."""
+    if len(text) <= max_chars:
+        return text
+    lines, kept, size = text.splitlines(), [], 0
+    for line in lines:
+        if size + len(line) + 1 > max_chars - 24:
+            break
+        kept.append(line)
+        size += len(line) + 1
+    if not kept:
+        return clip(text, max_chars)
+    return "\n".join(kept) + f"\n… ({len(lines) - len(kept)} more lines)"
+
+
+def _shape(value: Any, chars: int, items: int, depth: int) -> Any:
+    if isinstance(value, str):
+        return clip(value, chars)
+    if isinstance(value, list):
+        shaped = [_shape(v, chars, items, depth - 1) for v in value[:items]]
+        return shaped + [f"… {len(value) - items} more"] if len(value) > items else shaped
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"{{{len(value)} keys}}"
+        ordered = [k for k in PRIORITY_KEYS if k in value] + [k for k in value if k not in PRIORITY_KEYS and str(k).lower() not in BULKY_KEYS]
+        return {k: _shape(value[k], chars, items, depth - 1) for k in ordered}
+    return value
+
+
+def summarize_result(result: dict[str, Any], max_chars: int) -> str:
+    """Compact JSON of an execution result within ``max_chars``.
+
+    Bulky fields are dropped (and named in ``_dropped``), verdict fields come
+    first, and strings/lists/nesting shrink step by step until the result fits.
+    As a last resort only the verdict fields are kept.
+    """
+    dropped = sorted(k for k in result if str(k).lower() in BULKY_KEYS)
+    for chars, items, depth in _SHAPES:
+        shaped = _shape(result, chars, items, depth + 1)
+        if dropped:
+            shaped["_dropped"] = dropped
+        text = json.dumps(shaped, default=str)
+        if len(text) <= max_chars:
+            return text
+    chars, items, depth = _SHAPES[-1]
+    core = {k: _shape(result[k], chars, items, depth) for k in PRIORITY_KEYS if k in result}
+    return clip(json.dumps(core, default=str), max_chars)
+
+
+def dedupe_snippets(snippets: list[str], max_chars: int, each_chars: int = 400) -> list[str]:
+    """Drops snippets that repeat (or are contained in) an earlier one after
+    whitespace/case normalization, clips each, and stops at ``max_chars``."""
+    kept: list[tuple[str, str]] = []
+    for snippet in snippets:
+        norm = " ".join(str(snippet).lower().split())
+        if not norm or any(norm in other for _, other in kept):
+            continue
+        kept = [(s, other) for s, other in kept if other not in norm]
+        kept.append((str(snippet), norm))
+    out, size = [], 0
+    for snippet, _ in kept:
+        text = clip(" ".join(snippet.split()), each_chars)
+        if size + len(text) > max_chars:
+            break
+        out.append(text)
+        size += len(text) + 3
+    return out
+
+
+@dataclass
+class PromptContext:
+    """Builds planner and validator prompts within a per-role token budget.
+
+    Prompts start with fixed instructions, followed by what stays constant
+    across a run's iterations (runtime, objective, plan). The per-iteration
+    parts (memory, execution result) come last, so providers with prefix/KV
+    caching can reuse the prefix across iterations. With ``enabled=False``
+    the uncompacted prompts are produced.
+    """
+
+    budgets: dict[str, int] = field(default_factory=lambda: {"planner": 1000, "validator": 800})
+    enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> PromptContext:
+        return cls(
+            budgets={
+                "planner": int(os.getenv("PROMPT_BUDGET_PLANNER", "1000")),
+                "validator": int(os.getenv("PROMPT_BUDGET_VALIDATOR", "800")),
+            },
+            enabled=os.getenv("SKYAGENT_PROMPT_COMPACTION", "true").lower() == "true",
+        )
+
+    def max_chars(self, role: str) -> int:
+        return self.budgets.get(role, 1000) * CHARS_PER_TOKEN
+
+    def planner(self, runtime: str, objective: str, failures: str, memory: list[str]) -> str:
+        if not self.enabled:
+            return (
+                f"You are planner. Runtime={runtime}. Objective: {objective}\n"
+                f"Prior failures summary: {failures}\n"
+                f"Relevant memory: {memory}\n"
+                "Return concise numbered plan + success criteria."
+            )
+        budget = self.max_chars("planner")
+        prefix = f"{PLANNER_HEADER}\nRuntime={runtime}\nObjective: {clip(objective, budget // 2)}\n"
+        failures_line = f"Prior failures summary: {clip(failures, budget // 5)}\n"
+        remaining = budget - len(prefix) - len(failures_line) - len("Relevant memory:\n")
+        snippets = dedupe_snippets(memory, max(0, remaining))
+        return prefix + failures_line + "Relevant memory:\n" + "".join(f"- {s}\n" for s in snippets)
+
+    def validator(self, runtime: str, plan: str, result: dict[str, Any]) -> str:
+        if not self.enabled:
+            return f"{VALIDATOR_HEADER}\nPlan:{plan}\nRuntime:{runtime}\nExecution:{json.dumps(result)[:1800]}"
+        budget = self.max_chars("validator")
+        prefix = f"{VALIDATOR_HEADER}\nRuntime:{runtime}\nPlan:{clip_lines(plan, budget * 2 // 5)}\n"
+        return prefix + "Execution:" + summarize_result(result, max(200, budget - len(prefix) - len("Execution:")))
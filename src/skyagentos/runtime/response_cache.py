@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from skyagentos.memory.store import MemoryStore
+
+
+class ResponseCache:
+    """Content-addressed model response cache: in-memory LRU over an optional SQLite tier.
+
+    Keys are ``sha256(model, temperature, prompt)``. Entries expire after ``ttl_s``;
+    the memory tier is capped at ``max_entries`` (LRU) and the persistent tier is
+    pruned to ``persist_max_rows`` (least recently hit first).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_s: float = 3600.0,
+        store: MemoryStore | None = None,
+        persist_max_rows: int = 10000,
+        prune_every: int = 100,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.store = store
+        self.persist_max_rows = persist_max_rows
+        self.prune_every = prune_every
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls, store: MemoryStore | None = None) -> ResponseCache:
+        persist = os.getenv("MODEL_CACHE_PERSIST", "true").lower() == "true"
+        return cls(
+            max_entries=int(os.getenv("MODEL_CACHE_MAX_ENTRIES", "1024")),
+            ttl_s=float(os.getenv("MODEL_CACHE_TTL_S", "3600")),
+            store=store if persist else None,
+            persist_max_rows=int(os.getenv("MODEL_CACHE_PERSIST_MAX_ROWS", "10000")),
+        )
+
+    @staticmethod
+    def key(model: str, prompt: str, temperature: float) -> str:
+        digest = hashlib.sha256(f"{model}\x00{temperature:.4f}\x00{prompt}".encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+        if self.store is not None:
+            value = self.store.get_cached_response(key, now)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.persistent_hits += 1
+                self._remember(key, value, now + self.ttl_s)
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl_s
+        self._remember(key, value, expires_at)
+        if self.store is not None:
+            self.store.put_cached_response(key, value, expires_at)
+            with self._lock:
+                self._puts += 1
+                prune = self._puts % self.prune_every == 0
+            if prune:
+                self.store.prune_cached_responses(self.persist_max_rows, time.time())
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+                "persistent_hits": self.persistent_hits,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+            }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from dataclasses import dataclass
 
@@ -33,3 +34,7 @@ def classify_error(exc: Exception) -> ErrorType:
 
 def retry_sleep(policy: RetryPolicy, attempt: int) -> None:
     time.sleep(policy.delay_for(attempt))
+
+
+async def async_retry_sleep(policy: RetryPolicy, attempt: int) -> None:
+    await asyncio.sleep(policy.delay_for(attempt))
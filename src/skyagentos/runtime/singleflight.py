@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs the work; callers arriving
+    while it is in flight wait and receive the same result or exception. Nothing
+    is kept once the call finishes, so this complements a TTL cache rather than
+    replacing it: it closes the window where identical requests race past an
+    empty cache. Threads and asyncio tasks coalesce separately (per event loop).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._tasks: dict[tuple[int, str], asyncio.Future] = {}
+        self._counts: dict[str, list[int]] = {}
+
+    def _count(self, namespace: str, leader: bool) -> None:
+        counts = self._counts.setdefault(namespace, [0, 0])
+        counts[0 if leader else 1] += 1
+
+    def do(self, key: str, fn: Callable[[], T], namespace: str = "default") -> tuple[T, bool]:
+        """Returns ``(result, leader)``; ``leader`` is False for callers that shared a result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._count(namespace, leader)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, False
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, True
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]], namespace: str = "default") -> tuple[T, bool]:
+        # The work runs as its own task, so a cancelled caller (even the leader)
+        # does not cancel it for the others.
+        slot = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(slot)
+            leader = task is None
+            if leader:
+                task = self._tasks[slot] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._tasks.pop(slot, None))
+            self._count(namespace, leader)
+        return await asyncio.shield(task), leader
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per namespace: executions, shared results and fan-in (callers per execution)."""
+        with self._lock:
+            return {
+                ns: {"executions": leaders, "shared": shared, "fan_in": round((leaders + shared) / leaders, 3) if leaders else 0.0}
+                for ns, (leaders, shared) in self._counts.items()
+            }
@@ -9,3 +9,11 @@ def default_stream(channel: str, payload: dict) -> None:
 
 
 StreamFn = Callable[[str, dict], None]
+
+
+def tee(*fns: StreamFn) -> StreamFn:
+    def stream(channel: str, payload: dict) -> None:
+        for fn in fns:
+            fn(channel, payload)
+
+    return stream
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WS = re.compile(r"\s*")
+# A number at the end of the buffer may still be growing ("12" of "125").
+_NUMBER_END = set(",}] \t\r\n")
+
+
+def sse_delta(line: bytes) -> str | None:
+    """Content delta carried by one SSE line of an OpenAI-style chat completion stream.
+
+    Returns None for non-data lines and the ``[DONE]`` sentinel, "" for events
+    without content (role headers, finish reasons).
+    """
+    text = line.decode("utf-8").strip()
+    if not text.startswith("data:"):
+        return None
+    data = text[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    choice = (json.loads(data).get("choices") or [{}])[0]
+    return (choice.get("delta") or choice.get("message") or {}).get("content") or ""
+
+
+def sse_deltas(lines: Iterable[bytes]) -> Iterator[str]:
+    for line in lines:
+        delta = sse_delta(line)
+        if delta:
+            yield delta
+
+
+async def asse_deltas(lines: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    async for line in lines:
+        delta = sse_delta(line)
+        if delta:
+            yield delta
+
+
+class DeltaCoalescer:
+    """Buffers token deltas and emits them in chunks of ``min_chars``, or after
+    ``max_wait_s`` since the last emit, so a long stream does not turn into one
+    event per token. Call ``flush`` when the stream ends.
+    """
+
+    def __init__(self, emit: Callable[[str], None], min_chars: int = 256, max_wait_s: float = 0.5):
+        self.emit = emit
+        self.min_chars = min_chars
+        self.max_wait_s = max_wait_s
+        self._buf: list[str] = []
+        self._size = 0
+        self._last = time.monotonic()
+
+    def __call__(self, delta: str) -> None:
+        self._buf.append(delta)
+        self._size += len(delta)
+        if self._size >= self.min_chars or time.monotonic() - self._last >= self.max_wait_s:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            text = "".join(self._buf)
+            self._buf.clear()
+            self._size = 0
+            self.emit(text)
+        self._last = time.monotonic()
+
+
+class IncrementalJson:
+    """Decodes the members of a top-level JSON object as text arrives.
+
+    ``feed`` text chunks; each member is available in ``fields`` as soon as its
+    value is complete, so a caller can act on ``passed`` before the model has
+    finished writing ``reason``. Text before the first ``{`` (prose, code
+    fences) is skipped. Each member is decoded once; a pending value is retried
+    from its start when more text arrives.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.fields: dict[str, Any] = {}
+        self.complete = False
+        self._pos = -1
+        self._key: str | None = None
+
+    def feed(self, text: str) -> dict[str, Any]:
+        self.buffer += text
+        if self._pos < 0:
+            start = self.buffer.find("{")
+            if start < 0:
+                return self.fields
+            self._pos = start + 1
+        while not self.complete and self._step():
+            pass
+        return self.fields
+
+    def _skip(self, pos: int) -> int:
+        return _WS.match(self.buffer, pos).end()
+
+    def _step(self) -> bool:
+        buf = self.buffer
+        pos = self._skip(self._pos)
+        if pos >= len(buf):
+            return False
+        if self._key is None:
+            if buf[pos] == "}":
+                self.complete = True
+                return False
+            if buf[pos] == ",":
+                pos = self._skip(pos + 1)
+                if pos >= len(buf):
+                    return False
+            try:
+                key, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                return False
+            end = self._skip(end)
+            if end >= len(buf):
+                return False
+            if buf[end] != ":" or not isinstance(key, str):
+                self.complete = True
+                return False
+            self._key, self._pos = key, end + 1
+            return True
+        try:
+            value, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            return False
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and (end >= len(buf) or buf[end] not in _NUMBER_END):
+            return False
+        self.fields[self._key] = value
+        self._key, self._pos = None, end
+        return True
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Protocol
+
+from skyagentos.models.schemas import Mission, ValidationResult
+
+TIER_RULES = "rules"
+TIER_LLM = "llm"
+
+OK_STATUSES = {"ok", "success", "succeeded", "completed"}
+FAILED_STATUSES = {"failed", "error", "timeout", "timed_out", "terminated", "canceled", "cancelled"}
+
+
+@dataclass
+class RuleVerdict:
+    """``passed`` is True/False for a definite answer and None when the rule cannot tell."""
+
+    rule: str
+    passed: bool | None
+    reason: str = ""
+
+
+class ValidationRule(Protocol):
+    name: str
+
+    def check(self, result: dict[str, Any]) -> RuleVerdict: ...
+
+
+@dataclass
+class StatusRule:
+    """Failed executor status, HTTP error code or error message -> fail."""
+
+    name: str = "status"
+
+    def check(self, result: dict[str, Any]) -> RuleVerdict:
+        status = str(result.get("status", "")).lower()
+        code = result.get("status_code") or result.get("http_status")
+        if isinstance(code, int) and code >= 400:
+            return RuleVerdict(self.name, False, f"executor returned HTTP {code}")
+        if status in FAILED_STATUSES:
+            return RuleVerdict(self.name, False, f"executor status {status}")
+        if result.get("error"):
+            return RuleVerdict(self.name, False, f"executor error: {str(result['error'])[:200]}")
+        if status in OK_STATUSES:
+            return RuleVerdict(self.name, True, f"executor status {status}")
+        return RuleVerdict(self.name, None)
+
+
+@dataclass
+class EvidenceRule:
+    """Fewer than ``min_count`` evidence items -> fail. Without an explicit
+    minimum, only an ``evidence`` field that is present but empty counts."""
+
+    min_count: int | None = None
+    name: str = "evidence"
+
+    def check(self, result: dict[str, Any]) -> RuleVerdict:
+        evidence = result.get("evidence")
+        if self.min_count is None:
+            if isinstance(evidence, list) and not evidence:
+                return RuleVerdict(self.name, False, "executor returned no evidence")
+            return RuleVerdict(self.name, None)
+        count = len(evidence) if isinstance(evidence, list) else 0
+        if count < self.min_count:
+            return RuleVerdict(self.name, False, f"{count} evidence items, need {self.min_count}")
+        return RuleVerdict(self.name, True, f"{count} evidence items")
+
+
+@dataclass
+class RequiredFieldsRule:
+    fields: list[str]
+    name: str = "required_fields"
+
+    def check(self, result: dict[str, Any]) -> RuleVerdict:
+        missing = [f for f in self.fields if _lookup(result, f) in (None, "", [], {})]
+        if missing:
+            return RuleVerdict(self.name, False, f"missing fields: {', '.join(missing)}")
+        return RuleVerdict(self.name, True, "required fields present")
+
+
+@dataclass
+class SchemaRule:
+    """Checks the result against a JSON Schema subset: ``type``, ``required``,
+    ``properties``, ``items``, ``enum``, ``minItems``, ``minLength``."""
+
+    schema: dict[str, Any]
+    name: str = "schema"
+
+    def check(self, result: dict[str, Any]) -> RuleVerdict:
+        error = schema_error(result, self.schema)
+        if error:
+            return RuleVerdict(self.name, False, f"schema: {error}")
+        return RuleVerdict(self.name, True, "matches schema")
+
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def schema_error(value: Any, schema: dict[str, Any], path: str = "$") -> str | None:
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_TYPES.get(t, lambda v: True)(value) for t in types):
+            return f"{path} is not {'/'.join(types)}"
+    if "enum" in schema and value not in schema["enum"]:
+        return f"{path} not in {schema['enum']}"
+    if isinstance(value, str) and len(value) < schema.get("minLength", 0):
+        return f"{path} shorter than {schema['minLength']}"
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            return f"{path} has fewer than {schema['minItems']} items"
+        if isinstance(schema.get("items"), dict):
+            for n, item in enumerate(value):
+                error = schema_error(item, schema["items"], f"{path}[{n}]")
+                if error:
+                    return error
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                return f"{path}.{key} is required"
+        for key, sub in schema.get("properties", {}).items():
+            if key in value:
+                error = schema_error(value[key], sub, f"{path}.{key}")
+                if error:
+                    return error
+    return None
+
+
+def _lookup(result: dict[str, Any], dotted: str) -> Any:
+    value: Any = result
+    for part in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+@dataclass
+class ValidationEngine:
+    """Deterministic first tier of validation.
+
+    Any failing rule decides the result without a model call. The result passes
+    without a model call only when the mission supplied structured criteria
+    (``required_fields``, ``schema`` or ``min_evidence``) and every rule that
+    can tell passes. Otherwise ``evaluate`` returns None and the LLM validator
+    decides.
+    """
+
+    rules: list[ValidationRule] = field(default_factory=list)
+    # Rules that may pass a result by themselves; status/evidence defaults only fail.
+    conclusive: set[str] = field(default_factory=set)
+
+    @classmethod
+    def for_mission(cls, mission: Mission) -> ValidationEngine:
+        criteria = (mission.metadata or {}).get("validation") or {}
+        engine = cls(rules=[StatusRule(), EvidenceRule(criteria.get("min_evidence"))])
+        if criteria.get("min_evidence") is not None:
+            engine.conclusive.add("evidence")
+        if criteria.get("required_fields"):
+            engine.add(RequiredFieldsRule(list(criteria["required_fields"])), conclusive=True)
+        if criteria.get("schema"):
+            engine.add(SchemaRule(criteria["schema"]), conclusive=True)
+        for factory, conclusive in _registered:
+            rule = factory(criteria)
+            if rule is not None:
+                engine.add(rule, conclusive=conclusive)
+        return engine
+
+    def add(self, rule: ValidationRule, conclusive: bool = False) -> None:
+        self.rules.append(rule)
+        if conclusive:
+            self.conclusive.add(rule.name)
+
+    def evaluate(self, result: dict[str, Any]) -> tuple[ValidationResult, str] | None:
+        """Returns ``(verdict, deciding rule)`` or None when the rules are inconclusive."""
+        passes = []
+        for rule in self.rules:
+            verdict = rule.check(result)
+            if verdict.passed is False:
+                return ValidationResult(passed=False, reason=verdict.reason, next_action="retry"), rule.name
+            if verdict.passed:
+                passes.append(verdict)
+        decisive = [v for v in passes if v.rule in self.conclusive]
+        if decisive and any(v.rule == "status" for v in passes):
+            return ValidationResult(passed=True, reason="; ".join(v.reason for v in decisive), next_action="none"), decisive[-1].rule
+        return None
+
+
+RuleFactory = Callable[[dict[str, Any]], "ValidationRule | None"]
+_registered: list[tuple[RuleFactory, bool]] = []
+
+
+def register_rule(factory: RuleFactory, conclusive: bool = False) -> None:
+    """Add a rule to every engine; ``factory`` gets the mission's ``validation`` criteria."""
+    _registered.append((factory, conclusive))
+
+
+def rules_enabled() -> bool:
+    return os.getenv("SKYAGENT_VALIDATION_RULES", "true").lower() == "true"
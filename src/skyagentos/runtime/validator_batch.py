@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from skyagentos.runtime.model_router import ModelRouter
+
+MULTI = "multi"
+BURST = "burst"
+
+BATCH_HEADER = (
+    "Validate each numbered item independently; each has its own plan and execution.\n"
+    'Return strict JSON only: {"results":[{"id":number,"passed":boolean,"reason":string,"next_action":string}]} '
+    "with exactly one entry per item.\n"
+)
+
+
+def batch_prompt(prompts: list[str]) -> str:
+    return BATCH_HEADER + "".join(f"### Item {n}\n{prompt}\n" for n, prompt in enumerate(prompts, 1))
+
+
+def scatter(raw: str) -> dict[int, str]:
+    """Per-item verdict JSON keyed by item id, from a multi-item reply. Items the
+    model skipped or mangled are simply missing."""
+    data: Any = None
+    for candidate in (raw, raw[raw.find("{") : raw.rfind("}") + 1], raw[raw.find("[") : raw.rfind("]") + 1]):
+        try:
+            data = json.loads(candidate)
+            break
+        except ValueError:
+            continue
+    entries = data.get("results") if isinstance(data, dict) else data
+    out: dict[int, str] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if isinstance(entry, dict) and isinstance(entry.get("id"), int) and isinstance(entry.get("passed"), bool):
+            out[entry["id"]] = json.dumps({k: entry[k] for k in ("passed", "reason", "next_action") if k in entry})
+    return out
+
+
+@dataclass
+class _Item:
+    prompt: str
+    done: threading.Event = field(default_factory=threading.Event)
+    result: str | None = None
+    error: BaseException | None = None
+
+
+@dataclass
+class BatchStats:
+    items: int = 0
+    batches: int = 0
+    requests: int = 0
+    fallbacks: int = 0
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, items: int = 0, batches: int = 0, requests: int = 0, fallbacks: int = 0) -> None:
+        with self._lock:
+            self.items += items
+            self.batches += batches
+            self.requests += requests
+            self.fallbacks += fallbacks
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "requests": self.requests,
+            "fallbacks": self.fallbacks,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class ValidatorBatcher:
+    """Micro-batches validator prompts from concurrent runs.
+
+    Prompts arriving within ``window_s`` of the first one (up to ``max_batch``)
+    are sent together. In ``multi`` mode one structured request carries every
+    item, and each caller gets back its own verdict JSON. Items missing from
+    the reply are re-asked individually. In ``burst`` mode the items go out as
+    parallel single requests. Either way at most ``concurrency`` batches are in
+    flight. Calls go through the owning router's health-ordered fallback chain;
+    budget is charged to each caller's own (scoped) router.
+    """
+
+    def __init__(self, router: ModelRouter, window_s: float = 0.02, max_batch: int = 16, mode: str = MULTI, concurrency: int = 4, role: str = "validator"):
+        if mode not in (MULTI, BURST):
+            raise ValueError(f"unknown validator batch mode: {mode}")
+        self.router = router
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.mode = mode
+        self.concurrency = concurrency
+        self.role = role
+        self.metrics = BatchStats()
+        self._cond = threading.Condition()
+        self._queue: list[_Item] = []
+        self._dispatcher: threading.Thread | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._loops: dict[int, dict[str, Any]] = {}
+
+    @classmethod
+    def from_env(cls, router: ModelRouter) -> ValidatorBatcher | None:
+        mode = os.getenv("SKYAGENT_VALIDATOR_BATCH", "off").lower()
+        if mode in ("", "off", "false"):
+            return None
+        return cls(
+            router,
+            window_s=int(os.getenv("VALIDATOR_BATCH_WINDOW_MS", "20")) / 1000.0,
+            max_batch=int(os.getenv("VALIDATOR_BATCH_MAX", "16")),
+            mode=mode,
+            concurrency=int(os.getenv("VALIDATOR_BATCH_CONCURRENCY", "4")),
+        )
+
+    # Threaded callers: a lazily started dispatcher thread forms batches.
+
+    def submit(self, prompt: str) -> str:
+        item = _Item(prompt)
+        with self._cond:
+            if self._dispatcher is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.concurrency * (self.max_batch + 1 if self.mode == BURST else 1), thread_name_prefix="vbatch")
+                self._dispatcher = threading.Thread(target=self._dispatch, name="vbatch-dispatch", daemon=True)
+                self._dispatcher.start()
+            self._queue.append(item)
+            self._cond.notify_all()
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.window_s
+                while len(self._queue) < self.max_batch and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                batch, self._queue = self._queue[: self.max_batch], self._queue[self.max_batch :]
+            self._slots.acquire()
+            self._pool.submit(self._run, batch)
+
+    def _run(self, batch: list[_Item]) -> None:
+        try:
+            prompts = [item.prompt for item in batch]
+            if self.mode == BURST:
+                self.metrics.add(items=len(prompts), batches=1)
+                outcomes = list(self._pool.map(self._single, prompts)) if len(batch) > 1 else [self._single(prompts[0])]
+            else:
+                outcomes = self._multi(prompts)
+            for item, outcome in zip(batch, outcomes):
+                if isinstance(outcome, BaseException):
+                    item.error = outcome
+                else:
+                    item.result = outcome
+        except BaseException as exc:
+            for item in batch:
+                item.error = exc
+        finally:
+            self._slots.release()
+            for item in batch:
+                item.done.set()
+
+    def _single(self, prompt: str) -> str | BaseException:
+        self.metrics.add(requests=1)
+        try:
+            return self.router._first_success(self.role, prompt, 0.0)[1]
+        except Exception as exc:
+            return exc
+
+    def _multi(self, prompts: list[str]) -> list[str | BaseException]:
+        self.metrics.add(items=len(prompts), batches=1)
+        if len(prompts) == 1:
+            return [self._single(prompts[0])]
+        self.metrics.add(requests=1)
+        verdicts = scatter(self.router._first_success(self.role, batch_prompt(prompts), 0.0)[1])
+        missing = [n for n in range(1, len(prompts) + 1) if n not in verdicts]
+        self.metrics.add(fallbacks=len(missing))
+        verdicts.update((n, self._single(prompts[n - 1])) for n in missing)
+        return [verdicts[n] for n in range(1, len(prompts) + 1)]
+
+    # asyncio callers: batches form per event loop with call_later timers.
+
+    async def asubmit(self, prompt: str) -> str:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(id(loop))
+        if state is None or state["loop"] is not loop:
+            state = self._loops[id(loop)] = {"loop": loop, "queue": [], "timer": None, "slots": asyncio.Semaphore(self.concurrency)}
+        future = loop.create_future()
+        state["queue"].append((prompt, future))
+        if len(state["queue"]) >= self.max_batch:
+            self._aflush(state)
+        elif state["timer"] is None:
+            state["timer"] = loop.call_later(self.window_s, self._aflush, state)
+        return await future
+
+    def _aflush(self, state: dict[str, Any]) -> None:
+        if state["timer"] is not None:
+            state["timer"].cancel()
+            state["timer"] = None
+        batch, state["queue"] = state["queue"][: self.max_batch], state["queue"][self.max_batch :]
+        if state["queue"]:
+            state["timer"] = state["loop"].call_later(self.window_s, self._aflush, state)
+        if batch:
+            state["loop"].create_task(self._arun(state, batch))
+
+    async def _arun(self, state: dict[str, Any], batch: list[tuple[str, asyncio.Future]]) -> None:
+        prompts = [prompt for prompt, _ in batch]
+        async with state["slots"]:
+            try:
+                if self.mode == BURST:
+                    self.metrics.add(items=len(prompts), batches=1)
+                    outcomes = await asyncio.gather(*(self._asingle(p) for p in prompts))
+                else:
+                    outcomes = await self._amulti(prompts)
+            except Exception as exc:
+                outcomes = [exc] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _asingle(self, prompt: str) -> str | BaseException:
+        self.metrics.add(requests=1)
+        try:
+            return (await self.router._afirst_success(self.role, prompt, 0.0))[1]
+        except Exception as exc:
+            return exc
+
+    async def _amulti(self, prompts: list[str]) -> list[str | BaseException]:
+        self.metrics.add(items=len(prompts), batches=1)
+        if len(prompts) == 1:
+            return [await self._asingle(prompts[0])]
+        self.metrics.add(requests=1)
+        verdicts = scatter((await self.router._afirst_success(self.role, batch_prompt(prompts), 0.0))[1])
+        missing = [n for n in range(1, len(prompts) + 1) if n not in verdicts]
+        self.metrics.add(fallbacks=len(missing))
+        retried = await asyncio.gather(*(self._asingle(prompts[n - 1]) for n in missing))
+        verdicts.update(zip(missing, retried))
+        return [verdicts[n] for n in range(1, len(prompts) + 1)]
+
+    def stats(self) -> dict[str, Any]:
+        return self.metrics.as_dict()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import sys
+import threading
+
+from skyagentos.memory.queue import DEAD
+from skyagentos.runtime.orchestrator import Orchestrator
+
+
+class MissionWorkerPool:
+    """Thread pool of mission executors draining ``queue_jobs``.
+
+    Each thread claims one job at a time under a lease; a shared heartbeat thread
+    keeps the leases of in-flight jobs alive. Several pools (processes or hosts)
+    can drain the same database, since claims are atomic.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        concurrency: int = 4,
+        poll_interval_s: float = 0.5,
+        lease_s: float | None = None,
+    ):
+        self.orchestrator = orchestrator
+        self.queue = orchestrator.store.queue
+        self.concurrency = max(1, concurrency)
+        self.poll_interval_s = poll_interval_s
+        self.lease_s = lease_s or self.queue.lease_s
+        self.name = f"{socket.gethostname()}-{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._active: dict[int, str] = {}
+        self._active_lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        for i in range(self.concurrency):
+            t = threading.Thread(target=self._work, args=(f"{self.name}-w{i}",), name=f"mission-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        hb = threading.Thread(target=self._heartbeat, name="mission-worker-heartbeat", daemon=True)
+        hb.start()
+        self._threads.append(hb)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming new jobs and wait for in-flight missions to finish."""
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def run_forever(self) -> None:
+        if threading.current_thread() is threading.main_thread():
+            # SIGTERM (docker stop, Kubernetes) drains like Ctrl-C instead of killing missions mid-run.
+            signal.signal(signal.SIGTERM, lambda *_: self._stop.set())
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("mission workers draining in-flight jobs...", file=sys.stderr)
+            self.stop()
+            # atexit does not run when SIGTERM kills the process, so flush buffered writes here.
+            self.orchestrator.store.flush()
+
+    def _work(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            job = self.queue.dequeue(worker_id, lease_s=self.lease_s)
+            if job is None:
+                self._stop.wait(self.poll_interval_s)
+                continue
+            with self._active_lock:
+                self._active[job.id] = worker_id
+            try:
+                self.orchestrator.execute_job(job)
+                self.queue.ack(job.id, worker_id)
+                self.completed += 1
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                if self.queue.fail(job.id, error, worker_id) == DEAD:
+                    # Normally already failed on the last attempt; covers jobs whose limit was lowered.
+                    self.orchestrator.fail_run(job.run_id, error)
+                self.failed += 1
+            finally:
+                with self._active_lock:
+                    self._active.pop(job.id, None)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(max(0.05, self.lease_s / 3)):
+            with self._active_lock:
+                active = list(self._active.items())
+            for job_id, worker_id in active:
+                self.queue.heartbeat(job_id, worker_id, self.lease_s)
@@ -3,34 +3,56 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from urllib import request
 
 from skyagentos.models.schemas import Artifact
+from skyagentos.runtime.httpclient import AsyncHttpClient, HttpPool, shared_async_client, shared_pool
 
 
 class DesktopTool:
-    def __init__(self, base_url: str, artifact_dir: Path):
+    def __init__(self, base_url: str, artifact_dir: Path, http: HttpPool | None = None, ahttp: AsyncHttpClient | None = None):
         self.base_url = base_url.rstrip("/")
         self.artifact_dir = artifact_dir
         self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout_s = float(os.getenv("DESKTOP_TIMEOUT_S", "120"))
+        self.http = http or shared_pool()
+        self.aclient = ahttp or shared_async_client()
 
     def execute(self, run_id: str, step_id: str, action: str, payload: dict) -> tuple[dict, Artifact]:
         body = {"action": action, "payload": payload}
-        if os.getenv("SKYAGENT_DRY_RUN", "false").lower() == "true":
-            result = {"status": "ok", "runtime": "desktop", "action": action, "result": "simulated"}
+        if self._dry_run():
+            result = self._dry_run_result(action)
         else:
-            req = request.Request(
-                f"{self.base_url}/execute",
-                data=json.dumps(body).encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with request.urlopen(req, timeout=120) as resp:
-                result = json.loads(resp.read().decode("utf-8"))
+            result = self.http.post_json(f"{self.base_url}/execute", body, timeout=self.timeout_s)
 
+        return result, self._artifact(run_id, step_id, result)
+
+    async def aexecute(self, run_id: str, step_id: str, action: str, payload: dict) -> tuple[dict, Artifact]:
+        body = {"action": action, "payload": payload}
+        if self._dry_run():
+            result = self._dry_run_result(action)
+        else:
+            result = await self.aclient.post_json(f"{self.base_url}/execute", body, timeout=self.timeout_s)
+
+        return result, self._artifact(run_id, step_id, result)
+
+    def warm(self) -> bool:
+        return False if self._dry_run() else self.http.warm(f"{self.base_url}/execute", timeout=self.timeout_s)
+
+    async def awarm(self) -> bool:
+        return False if self._dry_run() else await self.aclient.warm(f"{self.base_url}/execute", timeout=self.timeout_s)
+
+    @staticmethod
+    def _dry_run() -> bool:
+        return os.getenv("SKYAGENT_DRY_RUN", "false").lower() == "true"
+
+    @staticmethod
+    def _dry_run_result(action: str) -> dict:
+        return {"status": "ok", "runtime": "desktop", "action": action, "result": "simulated"}
+
+    def _artifact(self, run_id: str, step_id: str, result: dict) -> Artifact:
         path = self.artifact_dir / f"{run_id}_{step_id}_desktop.json"
         path.write_text(json.dumps(result, indent=2), encoding="utf-8")
-        artifact = Artifact(
+        return Artifact(
             id=f"artifact-{step_id}",
             run_id=run_id,
             step_id=step_id,
@@ -39,4 +61,3 @@ class DesktopTool:
             content_type="application/json",
             checksum=str(path.stat().st_size),
         )
-        return result, artifact
@@ -3,60 +3,114 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Any
-from urllib import request
 
 from skyagentos.models.schemas import Artifact
+from skyagentos.runtime.httpclient import AsyncHttpClient, HttpPool, shared_async_client, shared_pool
+
+# Task statuses that can still be cancelled remotely.
+ACTIVE_STATUSES = {"created", "queued", "running"}
 
 
 class SkyvernTool:
     """Skyvern API client aligned to run-task contract (prompt-first payload)."""
 
-    def __init__(self, base_url: str, artifact_dir: Path):
+    def __init__(self, base_url: str, artifact_dir: Path, http: HttpPool | None = None, ahttp: AsyncHttpClient | None = None):
         self.base_url = base_url.rstrip("/")
         self.task_endpoint = os.getenv("SKYVERN_TASK_ENDPOINT", "/api/v1/tasks")
         self.api_key = os.getenv("SKYVERN_API_KEY", "")
         self.artifact_dir = artifact_dir
         self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout_s = float(os.getenv("SKYVERN_TIMEOUT_S", "180"))
+        self.task_cost_usd = float(os.getenv("SKYVERN_TASK_COST_USD", "0"))
+        self.http = http or shared_pool()
+        self.aclient = ahttp or shared_async_client()
+
+    def execute(
+        self, run_id: str, step_id: str, payload: dict[str, Any], cancel: threading.Event | None = None
+    ) -> tuple[dict[str, Any], Artifact]:
+        """Execute task with documented fields: prompt (+ compatible optional params).
+
+        A set ``cancel`` event (a speculative attempt that already lost) stops the
+        task from being submitted at all."""
+        if cancel is not None and cancel.is_set():
+            raise RuntimeError("skyvern task cancelled before submission")
+        normalized = self._normalize(payload)
+
+        if self._dry_run():
+            result = self._dry_run_result(step_id, normalized)
+        else:
+            result = self.http.post_json(f"{self.base_url}{self.task_endpoint}", normalized, headers=self._headers(), timeout=self.timeout_s)
+
+        return result, self._artifact(run_id, step_id, result)
+
+    async def aexecute(self, run_id: str, step_id: str, payload: dict[str, Any]) -> tuple[dict[str, Any], Artifact]:
+        normalized = self._normalize(payload)
+
+        if self._dry_run():
+            result = self._dry_run_result(step_id, normalized)
+        else:
+            result = await self.aclient.post_json(f"{self.base_url}{self.task_endpoint}", normalized, headers=self._headers(), timeout=self.timeout_s)
 
-    def execute(self, run_id: str, step_id: str, payload: dict[str, Any]) -> tuple[dict[str, Any], Artifact]:
-        """Execute task with documented fields: prompt (+ compatible optional params)."""
+        return result, self._artifact(run_id, step_id, result)
+
+    def cancel_task(self, result: dict[str, Any]) -> bool:
+        """Best-effort cancel of a task that is still running remotely."""
+        task_id = result.get("task_id")
+        if self._dry_run() or not task_id or str(result.get("status", "")).lower() not in ACTIVE_STATUSES:
+            return False
+        try:
+            self.http.post_json(f"{self.base_url}{self.task_endpoint}/{task_id}/cancel", {}, headers=self._headers(), timeout=self.timeout_s)
+        except Exception:
+            return False
+        return True
+
+    def warm(self) -> bool:
+        """Pre-open a pooled connection so the next execute skips connect/TLS setup."""
+        return False if self._dry_run() else self.http.warm(f"{self.base_url}{self.task_endpoint}", timeout=self.timeout_s)
+
+    async def awarm(self) -> bool:
+        return False if self._dry_run() else await self.aclient.warm(f"{self.base_url}{self.task_endpoint}", timeout=self.timeout_s)
+
+    @staticmethod
+    def _dry_run() -> bool:
+        return os.getenv("SKYAGENT_DRY_RUN", "false").lower() == "true"
+
+    @staticmethod
+    def _normalize(payload: dict[str, Any]) -> dict[str, Any]:
         normalized = {
             "prompt": payload.get("prompt") or payload.get("goal") or "",
             "url": payload.get("url"),
             "engine": payload.get("engine"),
             "metadata": payload.get("metadata", {}),
         }
-        normalized = {k: v for k, v in normalized.items() if v not in (None, "")}
-
-        if os.getenv("SKYAGENT_DRY_RUN", "false").lower() == "true":
-            result = {
-                "status": "ok",
-                "run_id": f"dry-{step_id}",
-                "task_id": f"dry-task-{step_id}",
-                "summary": "Simulated Skyvern run for demo/testing",
-                "evidence": ["https://example.com"],
-                "request": normalized,
-            }
-        else:
-            headers = {"Content-Type": "application/json"}
-            if self.api_key:
-                headers["x-api-key"] = self.api_key
-            req = request.Request(
-                f"{self.base_url}{self.task_endpoint}",
-                data=json.dumps(normalized).encode("utf-8"),
-                headers=headers,
-                method="POST",
-            )
-            with request.urlopen(req, timeout=180) as resp:
-                result = json.loads(resp.read().decode("utf-8"))
+        return {k: v for k, v in normalized.items() if v not in (None, "")}
+
+    @staticmethod
+    def _dry_run_result(step_id: str, normalized: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "status": "ok",
+            "run_id": f"dry-{step_id}",
+            "task_id": f"dry-task-{step_id}",
+            "summary": "Simulated Skyvern run for demo/testing",
+            "evidence": ["https://example.com"],
+            "request": normalized,
+        }
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        return headers
 
+    def _artifact(self, run_id: str, step_id: str, result: dict[str, Any]) -> Artifact:
         artifact_path = self.artifact_dir / f"{run_id}_{step_id}_skyvern.json"
         artifact_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
         digest = hashlib.sha256(artifact_path.read_bytes()).hexdigest()
 
-        artifact = Artifact(
+        return Artifact(
             id=f"artifact-{step_id}",
             run_id=run_id,
             step_id=step_id,
@@ -65,4 +119,3 @@ class SkyvernTool:
             content_type="application/json",
             checksum=digest,
         )
-        return result, artifact
@@ -36,6 +36,7 @@ def test_api_server_accepts_mission_and_run_controls(tmp_path):
 
     created = _post("http://127.0.0.1:18787/missions", {"objective": "API mission"})
     assert "result" in created
+    assert created["result"]["state"] == "CREATED"
     run_id = created["result"]["run_id"]
 
     paused = _post(f"http://127.0.0.1:18787/runs/{run_id}/pause")
@@ -0,0 +1,60 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib import request
+
+from skyagentos.api.context import AppContext
+from skyagentos.api.server import make_server
+from skyagentos.memory.store import MemoryStore
+from skyagentos.models.schemas import Mission
+
+
+def test_borrowed_connections_are_pooled_across_short_lived_threads(tmp_path):
+    store = MemoryStore(tmp_path / "pool.db")
+    store.init()
+    store.set_run_control("r1", "active")
+    base = len(store._conns)
+
+    def request_thread():
+        with store.borrowed():
+            assert store.get_run_control("r1") == "active"
+
+    for _ in range(20):
+        t = threading.Thread(target=request_thread)
+        t.start()
+        t.join()
+    assert len(store._conns) == base + 1
+    store.close()
+    assert store._conns == [] and store._idle == []
+
+
+def test_server_shares_one_context_and_shuts_down_cleanly(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "ctx.db"))
+    monkeypatch.setenv("AGENT_FS_ROOT", str(tmp_path / "agentfs"))
+    monkeypatch.setenv("ORCHESTRATOR_HOST", "127.0.0.1")
+    monkeypatch.setenv("ORCHESTRATOR_PORT", "18789")
+    monkeypatch.setenv("ORCHESTRATOR_WORKERS", "1")
+    monkeypatch.setenv("SKYAGENT_STREAM_STDOUT", "false")
+    ctx = AppContext.from_env()
+    server = make_server(ctx)
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+    ctx.start()
+
+    run_id = ctx.orchestrator.submit(Mission(id="m-ctx", objective="ctx", domain="research"))["run_id"]
+
+    def get(_):
+        with request.urlopen(f"http://127.0.0.1:18789/runs/{run_id}", timeout=10) as resp:
+            return json.loads(resp.read())["run"]["id"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert set(pool.map(get, range(64))) == {run_id}
+    # 64 request threads, but only as many connections as ran at once (+ workers).
+    assert len(ctx.store._conns) <= 8 + 3
+
+    server.shutdown()
+    server.server_close()
+    serving.join(timeout=5)
+    ctx.close(timeout=5)
+    assert ctx.workers._threads == [] and ctx.store._conns == []
@@ -0,0 +1,24 @@
+import asyncio
+import os
+from pathlib import Path
+
+from evals.perf.stubs import start_stub
+from skyagentos.models.schemas import Mission
+from skyagentos.runtime.async_orchestrator import AsyncOrchestrator
+
+
+def test_async_orchestrator_multiplexes_missions_over_http(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    llm, llm_url = start_stub("litellm", delay_s=0.05)
+    sky, sky_url = start_stub("skyvern", delay_s=0.05)
+    try:
+        orch = AsyncOrchestrator(tmp_path / "a.db", llm_url, "dev", sky_url, stream_fn=lambda c, p: None)
+        missions = [Mission(id=f"m{i}", objective="Research async", max_steps=2) for i in range(20)]
+        results = asyncio.run(orch.run_many(missions, concurrency=20))
+    finally:
+        llm.shutdown()
+        sky.shutdown()
+
+    assert [r["state"] for r in results] == ["COMPLETED"] * 20
+    assert results[0]["validation"]["reason"] == "stub validated"
+    assert orch.store.queue.stats() == {"done": 20}
@@ -0,0 +1,46 @@
+import time
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+from skyagentos.memory.themes import ThemeIndex, split_kind
+
+
+def test_split_kind():
+    assert split_kind("failure:login timeout") == ("failure", "login timeout")
+    assert split_kind("Clicked export") == ("event", "Clicked export")
+
+
+def test_decayed_top_themes_and_windows(tmp_path: Path):
+    store = MemoryStore(tmp_path / "themes.db")
+    store.init()
+    themes = ThemeIndex(store, half_life_s=3600)
+    now = time.time()
+    with store._conn() as conn:
+        for _ in range(4):
+            themes.add(conn, "general", "failure:captcha blocked", now=now - 2 * 86400)
+        themes.add(conn, "general", "failure:login timeout", now=now - 60)
+        themes.add(conn, "general", "failure:login rejected", now=now - 30)
+        themes.add(conn, "general", "plan:open login page", now=now)
+
+    top = themes.top("general", k=3, now=now)
+    assert [term for term, _ in top] == ["login", "rejected", "timeout"]
+    assert 1.9 < top[0][1] < 2.0
+    assert [t for t, _ in themes.window("general", 3600, k=5, now=now)] == ["login", "rejected", "timeout"]
+    assert dict(themes.window("general", 3 * 86400, k=5, now=now))["captcha"] == 4
+    assert themes.top("general", k=1, kind="plan", now=now)[0][0] in {"open", "login", "page"}
+
+
+def test_push_episodic_updates_themes_and_rebuild_replays_history(tmp_path: Path):
+    db = tmp_path / "push.db"
+    store = MemoryStore(db)
+    store.init()
+    store.push_episodic("general", "failure:quota exceeded")
+    store.push_episodic("general", "failure:quota exceeded again")
+    assert store.themes.summary("general", limit=2) == "exceeded, quota"
+
+    with store._conn() as conn:
+        conn.execute("DELETE FROM episodic_themes")
+        conn.execute("DELETE FROM episodic_theme_landmarks")
+        store.themes.rebuild(conn)
+    assert store.themes.summary("general", limit=2) == "exceeded, quota"
+    store.close()
@@ -0,0 +1,155 @@
+import http.client
+import json
+import threading
+import time
+from urllib import request
+
+from skyagentos.api.server import run_server
+from skyagentos.runtime.events import EventBus
+from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.worker import MissionWorkerPool
+
+
+def test_bus_replays_after_last_event_id_and_drops_slow_consumers():
+    bus = EventBus(history=3, subscriber_buffer=2)
+    for state in ("CREATED", "PLANNED", "EXECUTING", "VALIDATING"):
+        bus.publish("progress", {"run_id": "r1", "state": state})
+    bus.publish("progress", {"run_id": "r2", "state": "CREATED"})
+    replay = bus.subscribe("r1", last_event_id=2, maxsize=200)
+    assert [e.payload["state"] for e in replay.get(timeout=0)] == ["EXECUTING", "VALIDATING"]
+    # History is bounded: ids older than the buffer are gone.
+    full = bus.subscribe("r1", last_event_id=0)
+    assert [e.id for e in full.get(timeout=0)] == [2, 3, 4]
+    full.close()
+
+    slow = bus.subscribe("r1")
+    start = time.perf_counter()
+    for n in range(100):
+        bus.publish("progress", {"run_id": "r1", "step": n})
+    assert time.perf_counter() - start < 0.5
+    assert bus.flush(timeout=5)
+    assert slow.dropped and [e.payload["step"] for e in slow.get(timeout=0)] == [0, 1]
+    assert replay.get(timeout=0)[-1].payload["step"] == 99
+    assert bus.stats()["dropped_subscribers"] == 1
+    assert bus.stats()["subscribers"] == 1
+    replay.close()
+    assert bus.stats()["subscribers"] == 0
+
+
+def _read_events(port: int, run_id: str, last_event_id: int | None = None) -> list[dict]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    headers = {} if last_event_id is None else {"Last-Event-ID": str(last_event_id)}
+    conn.request("GET", f"/runs/{run_id}/events", headers=headers)
+    resp = conn.getresponse()
+    assert resp.status == 200 and resp.getheader("Content-Type") == "text/event-stream"
+    events, current = [], {}
+    for line in resp.read().decode("utf-8").splitlines():
+        if not line:
+            if "data" in current:
+                events.append(current)
+            current = {}
+        elif not line.startswith(":"):
+            field, _, value = line.partition(": ")
+            current[field] = json.loads(value) if field == "data" else value
+    conn.close()
+    return events
+
+
+def test_run_events_endpoint_streams_and_replays(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("ORCHESTRATOR_HOST", "127.0.0.1")
+    monkeypatch.setenv("ORCHESTRATOR_PORT", "18788")
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "events.db"))
+    monkeypatch.setenv("SKYAGENT_STREAM_STDOUT", "false")
+    monkeypatch.setenv("SSE_KEEPALIVE_S", "0.2")
+    threading.Thread(target=run_server, daemon=True).start()
+    time.sleep(0.25)
+
+    req = request.Request(
+        "http://127.0.0.1:18788/missions",
+        data=json.dumps({"objective": "Stream mission", "domain": "research"}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with request.urlopen(req, timeout=10) as resp:
+        run_id = json.loads(resp.read())["run_id"]
+
+    events = _read_events(18788, run_id, last_event_id=0)
+    states = [e["data"]["state"] for e in events]
+    assert states[0] == "CREATED" and states[-1] in {"COMPLETED", "FAILED"}
+    ids = [int(e["id"]) for e in events]
+    assert ids == sorted(ids) and all(e["data"]["run_id"] == run_id for e in events)
+
+    # Reconnecting replays only what came after the last seen event.
+    assert [int(e["id"]) for e in _read_events(18788, run_id, last_event_id=ids[0])] == ids[1:]
+    assert _read_events(18788, run_id, last_event_id=ids[-1]) == []
+    # Without an id, a finished run yields its final event and the stream ends.
+    assert [e["data"]["state"] for e in _read_events(18788, run_id)] == [states[-1]]
+
+    for url, code in ((f"/runs/{run_id}/events?last_event_id=abc", 400), ("/runs/run-missing/events", 404)):
+        try:
+            request.urlopen(f"http://127.0.0.1:18788{url}", timeout=10)
+        except Exception as exc:
+            assert getattr(exc, "code", None) == code
+        else:
+            raise AssertionError(f"expected {code}")
+    conn = http.client.HTTPConnection("127.0.0.1", 18788, timeout=10)
+    conn.request("GET", f"/runs/{run_id}/events", headers={"Last-Event-ID": "not-a-number"})
+    assert conn.getresponse().status == 400
+    conn.close()
+
+
+def _post_mission(port: int, body: dict) -> str:
+    req = request.Request(
+        f"http://127.0.0.1:{port}/missions",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())["run_id"]
+
+
+def test_stream_closes_on_failed_and_human_review_runs(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("ORCHESTRATOR_HOST", "127.0.0.1")
+    monkeypatch.setenv("ORCHESTRATOR_PORT", "18791")
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "closes.db"))
+    monkeypatch.setenv("SKYAGENT_STREAM_STDOUT", "false")
+    monkeypatch.setenv("SSE_KEEPALIVE_S", "5")
+    threading.Thread(target=run_server, daemon=True).start()
+    time.sleep(0.25)
+
+    denied = _post_mission(18791, {"objective": "No permissions", "domain": "research", "permissions": []})
+    events = _read_events(18791, denied, last_event_id=0)
+    assert [e["data"]["state"] for e in events] == ["CREATED", "FAILED"]
+    assert "missing permissions" in events[-1]["data"]["error"]
+
+    review = _post_mission(18791, {"objective": "Pay an invoice", "domain": "finance"})
+    events = _read_events(18791, review, last_event_id=0)
+    assert [e["data"]["state"] for e in events] == ["CREATED", "HUMAN_REVIEW"]
+
+
+def test_stream_falls_back_to_stored_state_for_runs_on_other_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("ORCHESTRATOR_HOST", "127.0.0.1")
+    monkeypatch.setenv("ORCHESTRATOR_PORT", "18792")
+    monkeypatch.setenv("ORCHESTRATOR_WORKERS", "0")
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "remote.db"))
+    monkeypatch.setenv("SKYAGENT_STREAM_STDOUT", "false")
+    monkeypatch.setenv("SSE_KEEPALIVE_S", "0.2")
+    threading.Thread(target=run_server, daemon=True).start()
+    time.sleep(0.25)
+
+    run_id = _post_mission(18792, {"objective": "Remote worker", "domain": "research", "max_steps": 1})
+    # A separate worker process: its own orchestrator, publishing to no bus of the API's.
+    remote = Orchestrator(tmp_path / "remote.db", "http://litellm:4000", "dev", "http://skyvern:8000", stream_fn=lambda c, p: None)
+    pool = MissionWorkerPool(remote, concurrency=1, poll_interval_s=0.05)
+    pool.start()
+    try:
+        events = _read_events(18792, run_id, last_event_id=0)
+    finally:
+        pool.stop()
+    assert events[0]["data"]["state"] == "CREATED"
+    assert events[-1]["data"] == {"run_id": run_id, "state": remote.store.get_run_payload(run_id)["state"]}
+    assert events[-1]["data"]["state"] in {"COMPLETED", "FAILED"} and "id" not in events[-1]
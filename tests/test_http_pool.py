@@ -0,0 +1,78 @@
+import socket
+import threading
+
+import pytest
+
+from evals.perf.stubs import start_stub
+from skyagentos.runtime.httpclient import HttpPool
+from skyagentos.runtime.model_router import ModelRouter
+
+
+def test_pool_reuses_keepalive_connections(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    server, url = start_stub("litellm")
+    pool = HttpPool(max_per_host=2)
+    try:
+        router = ModelRouter(url, "dev", budget_usd=5.0, http=pool)
+        for _ in range(5):
+            assert '"passed": true' in router.complete("validator", "check")
+        assert router.complete("planner", "plan").startswith("1.")
+    finally:
+        pool.close()
+        server.shutdown()
+
+    stats = pool.stats()
+    assert stats["requests"] == 6
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 5
+
+
+def _drop_second_request_server():
+    """Answers the first request on each connection, then reads the next one and hangs up."""
+    received = []
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def read_request(conn):
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return False
+            data += chunk
+        head, _, body = data.partition(b"\r\n\r\n")
+        length = int(next(l.split(b":")[1] for l in head.split(b"\r\n") if l.lower().startswith(b"content-length")))
+        while len(body) < length:
+            body += conn.recv(4096)
+        received.append(body)
+        return True
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                if read_request(conn):
+                    conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}")
+                    read_request(conn)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener, f"http://127.0.0.1:{listener.getsockname()[1]}/tasks", received
+
+
+def test_requests_that_reached_the_server_are_only_replayed_when_idempotent():
+    listener, url, received = _drop_second_request_server()
+    pool = HttpPool()
+    try:
+        assert pool.post_json(url, {"n": 1}) == {}
+        with pytest.raises(ConnectionError, match="closed unexpectedly"):
+            pool.post_json(url, {"n": 2})
+        assert len(received) == 2 and pool.stats()["stale_retries"] == 0
+
+        assert pool.post_json(url, {"n": 3}) == {}
+        assert pool.post_json(url, {"n": 4}, idempotent=True) == {}
+        assert len(received) == 5 and pool.stats()["stale_retries"] == 1
+    finally:
+        pool.close()
+        listener.close()
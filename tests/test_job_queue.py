@@ -0,0 +1,50 @@
+import threading
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+
+
+def _store(tmp_path: Path) -> MemoryStore:
+    store = MemoryStore(tmp_path / "queue.db")
+    store.init()
+    return store
+
+
+def test_concurrent_workers_never_claim_the_same_job(tmp_path: Path):
+    store = _store(tmp_path)
+    for i in range(40):
+        store.queue.enqueue(f"run-{i}", {"i": i})
+
+    claimed: list[int] = []
+    lock = threading.Lock()
+
+    def worker(name: str) -> None:
+        while jobs := store.queue.claim(name, n=3):
+            with lock:
+                claimed.extend(j.id for j in jobs)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 40
+
+
+def test_priority_lease_expiry_and_dead_letter(tmp_path: Path):
+    store = _store(tmp_path)
+    low = store.queue.enqueue("run-low", {}, priority=0)
+    high = store.queue.enqueue("run-high", {}, priority=5, max_attempts=2)
+
+    job = store.queue.dequeue("w1", lease_s=-1)
+    assert job.id == high and job.attempts == 1
+    assert store.queue.ack(high, worker_id="w2") is False
+
+    again = store.queue.dequeue("w2", lease_s=-1)
+    assert again.id == high and again.attempts == 2
+
+    nxt = store.queue.dequeue("w3")
+    assert nxt.id == low
+    assert store.queue.stats()["dead"] == 1
+    assert store.queue.fail(low, "boom", worker_id="w3") == "queued"
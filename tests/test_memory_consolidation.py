@@ -0,0 +1,41 @@
+import time
+from pathlib import Path
+
+from services.scheduler.src.app import run_job
+from skyagentos.memory.consolidation import MemoryConsolidator, minhash, similarity
+from skyagentos.memory.store import MemoryStore
+
+
+def test_minhash_estimates_similarity_of_truncated_results():
+    base = '{"status": "ok", "summary": "gpu pricing trends for h100 and a100 across three cloud providers", "evidence": ["a", "b"]}'
+    assert similarity(minhash(base), minhash(base[:-12])) >= 0.8
+    assert similarity(minhash(base), minhash('{"status": "failed", "error": "captcha"}')) < 0.3
+
+
+def test_dedupe_collapses_with_counts_and_rolls_up_old_events(tmp_path: Path):
+    store = MemoryStore(tmp_path / "cons.db")
+    store.init()
+    for _ in range(3):
+        store.push_episodic("general", "failure:login timeout")
+        store.push_episodic("general", "Failure:login   timeout")
+    store.push_episodic("general", "plan:open dashboard")
+    result = '{"status": "ok", "summary": "gpu pricing trends for h100 and a100 across three cloud providers", "evidence": ["a", "b"]}'
+    store.push_semantic("general", result)
+    store.push_semantic("general", result[:-12])
+    store.push_semantic("general", '{"status": "failed", "error": "captcha"}')
+
+    report = MemoryConsolidator(store, rollup_age_days=-1).run()
+    assert report.merged == {"episodic_memory": 5, "semantic_memory": 1}
+    assert store.read_memory("episodic_memory", "general", 10) == ["plan:open dashboard", "Failure:login   timeout"]
+    counts = dict(store._conn().execute("SELECT content, dup_count FROM episodic_memory"))
+    assert counts["Failure:login   timeout"] == 6
+    assert store.search_semantic("general", "gpu pricing", k=5) == [result[:-12]]
+
+    store.push_episodic("finance", "failure:quota")
+    store.push_episodic("finance", "failure:quota exceeded")
+    rolled = MemoryConsolidator(store, rollup_age_days=0, rollup_min=2).run(namespace="finance", now=time.time() + 1)
+    assert rolled.rolled_up == 2 and rolled.summaries == 1
+    (summary,) = store.read_memory("episodic_memory", "finance", 10)
+    assert summary.startswith("summary:2 events") and "failure:quota x1" in summary
+    assert run_job("memory-consolidation", store)["merged"] == {"episodic_memory": 0, "semantic_memory": 0}
+    store.close()
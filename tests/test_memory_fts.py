@@ -0,0 +1,23 @@
+import sqlite3
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+
+
+def test_fts_search_ranks_in_sqlite_and_follows_deletes(tmp_path: Path):
+    db = tmp_path / "fts.db"
+    store = MemoryStore(db)
+    store.init()
+    assert store.fts.enabled
+    store.push_episodic("general", "failure: login timeout on dashboard")
+    store.push_episodic("general", "plan: open dashboard and export report")
+    store.push_episodic("finance", "failure: login timeout")
+    store.push_semantic("general", '{"status": "ok", "summary": "gpu pricing table"}')
+
+    assert store.search_memory("episodic_memory", "general", "login timeout", k=5) == ["failure: login timeout on dashboard"]
+    assert store.search_semantic("general", "gpu pricing", k=1, mode="fts") == ['{"status": "ok", "summary": "gpu pricing table"}']
+    assert store.search_memory("episodic_memory", "general", 'dashboard" OR *', k=5)
+
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM episodic_memory WHERE content LIKE 'failure%'")
+    assert store.search_memory("episodic_memory", "general", "login timeout", k=5) == []
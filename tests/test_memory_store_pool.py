@@ -0,0 +1,23 @@
+import threading
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+from skyagentos.models.schemas import Step
+
+
+def test_store_reuses_one_wal_connection_per_thread(tmp_path: Path):
+    store = MemoryStore(tmp_path / "pool.db", synchronous="normal")
+    store.init()
+    conn = store._conn()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.save_step(Step(id="s1", run_id="r1", role="validator", action="validate"))
+    assert store._conn() is conn
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(store._conn()))
+    t.start()
+    t.join()
+    assert seen[0] is not conn
+
+    store.close()
+    assert store.read_memory("episodic_memory", "general") == []
@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+from skyagentos.runtime.model_health import CircuitOpenError, ModelHealth
+from skyagentos.runtime.model_router import ModelRouter
+
+
+def test_breaker_opens_probes_and_closes():
+    health = ModelHealth(failure_threshold=3, cooldown_s=10)
+    for _ in range(3):
+        health.acquire("planner", now=0)
+        health.record("planner", 0.1, ok=False, now=0)
+    assert health.snapshot()["planner"]["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        health.acquire("planner", now=5)
+    assert health.order(["planner", "manager"], now=5) == ["manager"]
+
+    health.acquire("planner", now=11)  # the single half-open probe
+    with pytest.raises(CircuitOpenError):
+        health.acquire("planner", now=11)
+    health.record("planner", 0.1, ok=True, now=11)
+    assert health.snapshot()["planner"]["state"] == "closed"
+    # Back to too few samples to rank on: the configured order applies again.
+    assert health.order(["planner", "manager"], now=11) == ["planner", "manager"]
+
+
+def test_order_follows_live_latency_and_errors():
+    health = ModelHealth(min_calls=3, order_bias=0.5, hedge=True)
+    for _ in range(5):
+        health.record("planner", 0.8, ok=True)
+        health.record("manager", 0.1, ok=True)
+        health.record("local_reflector", 0.2, ok=False)
+    health.record("local_reflector", 0.2, ok=True)
+    # Fast manager overtakes the slow primary; the mostly failing reflector sinks.
+    assert health.order(["planner", "manager", "local_reflector"]) == ["manager", "planner", "local_reflector"]
+    assert health.hedge_delay("planner") == pytest.approx(0.8)
+
+
+class SlowPrimary(ModelRouter):
+    delays = {"planner": 0.5, "manager": 0.01}
+
+    def __init__(self, **kwargs):
+        health = ModelHealth(min_calls=3, hedge=True, hedge_min_s=0.05, failure_threshold=2, cooldown_s=60)
+        for _ in range(5):
+            health.record("planner", 0.02, ok=True)
+            health.record("manager", 0.04, ok=True)
+        super().__init__("http://llm", "k", budget_usd=1.0, health=health, **kwargs)
+        self.calls = []
+
+    def _call(self, model, prompt):
+        self.calls.append(model)
+        time.sleep(self.delays[model])
+        return model
+
+    async def _acall(self, model, prompt):
+        self.calls.append(model)
+        await asyncio.sleep(self.delays[model])
+        return model
+
+
+def test_slow_primary_is_hedged_to_the_next_model(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    monkeypatch.delenv("MODEL_HEDGE", raising=False)
+    assert not ModelHealth.from_env().hedge  # opt-in: hedges are paid twice
+    router = SlowPrimary()
+    start = time.perf_counter()
+    assert router.complete("planner", "plan") == "manager"
+    assert time.perf_counter() - start < 0.3
+    assert router.calls == ["planner", "manager"] and router.hedges == 1
+    assert router.spent_usd == pytest.approx(2 * router.estimate_cost("plan"))
+    assert router.hedge_spend_usd == pytest.approx(router.estimate_cost("plan"))
+    assert router.scoped().hedge_spend_usd == 0.0
+
+    arouter = SlowPrimary()
+    start = time.perf_counter()
+    assert asyncio.run(arouter.acomplete("planner", "plan")) == "manager"
+    assert time.perf_counter() - start < 0.3 and arouter.hedges == 1
+    # The losing request was cancelled, so it neither counts as an error nor holds a probe.
+    assert arouter.health.snapshot()["planner"]["error_rate"] == 0.0
+
+
+def test_open_circuit_skips_a_failing_model(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+
+    class DownPrimary(SlowPrimary):
+        def _call(self, model, prompt):
+            self.calls.append(model)
+            if model == "planner":
+                raise ConnectionError("connection refused")
+            return model
+
+    router = DownPrimary()
+    router.health.hedge = False
+    for _ in range(4):
+        assert router.complete("planner", "plan") == "manager"
+    assert router.calls.count("planner") == 2
+    assert router.health.snapshot()["planner"]["state"] == "open"
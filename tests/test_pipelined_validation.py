@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from evals.perf.stubs import start_stub
+from skyagentos.models.schemas import Artifact, Mission
+from skyagentos.runtime.async_orchestrator import AsyncOrchestrator
+from skyagentos.runtime.httpclient import HttpPool
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.orchestrator import Orchestrator
+
+
+class FlakyTool:
+    """Fails the first attempt; counts warm-ups requested by the pipeline."""
+
+    def __init__(self):
+        self.calls = 0
+        self.warmed = 0
+        self.threads: set[str] = set()
+
+    def _result(self, run_id: str, step_id: str):
+        self.calls += 1
+        status = "failed" if self.calls == 1 else "ok"
+        return {"status": status}, Artifact(id=f"a-{step_id}", run_id=run_id, step_id=step_id, kind="json", path="-", content_type="application/json", checksum="-")
+
+    def execute(self, run_id: str, step_id: str, payload: dict):
+        return self._result(run_id, step_id)
+
+    async def aexecute(self, run_id: str, step_id: str, payload: dict):
+        return self._result(run_id, step_id)
+
+    def warm(self) -> bool:
+        self.warmed += 1
+        self.threads.add(threading.current_thread().name)
+        return True
+
+    async def awarm(self) -> bool:
+        self.warmed += 1
+        return True
+
+
+def _validate(model: str, prompt: str) -> str:
+    passed = "true" if '"status": "ok"' in prompt else "false"
+    return f'{{"passed": {passed}, "reason": "checked", "next_action": "none"}}'
+
+
+@pytest.mark.parametrize("cls", [Orchestrator, AsyncOrchestrator])
+def test_next_iteration_is_prepared_during_validation(cls, tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setattr(ModelRouter, "_dry_run_reply", staticmethod(_validate))
+    monkeypatch.setattr("skyagentos.runtime.orchestrator.retry_sleep", lambda policy, attempt: None)
+    orch = cls(tmp_path / "pipe.db", "http://llm", "k", "http://sky", stream_fn=lambda c, p: None)
+    orch.skyvern = tool = FlakyTool()
+    mission = Mission(id="m-pipe", objective="Find pricing", max_steps=4, metadata={"runtime": "browser", "pipeline_validation": True})
+
+    result = orch.run_mission(mission) if cls is Orchestrator else asyncio.run(orch.run_mission_async(mission))
+
+    assert result["state"] == "COMPLETED" and result["step"] == 2
+    # Iteration 2 was prepared while 1 validated; the look-ahead for 3 is
+    # cancelled (or discarded) once 2 passes, so it may or may not have run.
+    assert 1 <= tool.warmed <= 2
+    if cls is Orchestrator:
+        assert all(name.startswith("prepare") for name in tool.threads)
+    orch.store.flush()
+    prep = orch.store._conn().execute("SELECT step_id FROM telemetry WHERE name='pipeline_prep_ms'").fetchall()
+    assert prep == [("step-2-executor",)]
+
+
+def test_http_pool_warm_opens_a_reusable_connection():
+    server, url = start_stub("skyvern")
+    pool = HttpPool()
+    try:
+        assert pool.warm(url + "/api/v1/tasks") is True
+        assert pool.warm(url + "/api/v1/tasks") is False
+        pool.post_json(url + "/api/v1/tasks", {"prompt": "x"})
+    finally:
+        pool.close()
+        server.shutdown()
+    stats = pool.stats()
+    assert stats["connections_opened"] == 1 and stats["connections_reused"] == 1
@@ -0,0 +1,50 @@
+import json
+
+from skyagentos.runtime.prompt_context import PromptContext, dedupe_snippets, estimate_tokens, summarize_result
+
+
+def _bulky_result():
+    return {
+        "html": "<div>" * 5000,
+        "request": {"prompt": "objective " * 200},
+        "metadata": {"steps": [{"action": "click", "detail": "x" * 900}] * 40},
+        "summary": "Found the Q3 revenue table",
+        "evidence": ["https://example.com/ir/q3", "https://example.com/ir/q3.pdf"],
+        "status": "completed",
+    }
+
+
+def test_summary_keeps_verdict_fields_within_budget():
+    text = summarize_result(_bulky_result(), 1200)
+    assert len(text) <= 1200
+    data = json.loads(text)
+    assert list(data)[:3] == ["status", "summary", "evidence"]
+    assert data["evidence"] == ["https://example.com/ir/q3", "https://example.com/ir/q3.pdf"]
+    assert data["_dropped"] == ["html", "request"]
+    # Too small for any structure: only the verdict fields survive.
+    assert json.loads(summarize_result({"status": "ok", "log": ["y" * 50] * 50}, 40)) == {"status": "ok"}
+
+
+def test_memory_snippets_are_deduplicated_and_bounded():
+    snippets = ["Revenue  table on IR page", "revenue table on ir page", "IR page", "Use the PDF export " + "z" * 600, "other"]
+    out = dedupe_snippets(snippets, max_chars=500, each_chars=100)
+    assert out[0] == "Revenue table on IR page"
+    assert len(out[1]) == 100 and out[1].endswith("…")
+    assert "IR page" not in out and len(out) == 3
+
+
+def test_prompts_fit_budget_and_share_a_stable_prefix():
+    ctx = PromptContext(budgets={"planner": 200, "validator": 300})
+    plan = "\n".join(f"{n}. step {n} " + "detail " * 10 for n in range(1, 30))
+    first = ctx.validator("web", plan, _bulky_result())
+    second = ctx.validator("web", plan, {"status": "failed", "error": "timeout"})
+    assert estimate_tokens(first) <= 300 and "more lines)" in first
+    prefix = first[: first.index("Execution:")]
+    assert second.startswith(prefix) and second.endswith('{"status": "failed", "error": "timeout"}')
+
+    planner = ctx.planner("web", "Collect Q3 revenue", "timeout x2", ["a note", "A  note", "b note"] * 50)
+    assert planner.startswith("You are planner.") and estimate_tokens(planner) <= 200
+    assert planner.count("- a note") == 1 and planner.count("- b note") == 1
+
+    legacy = PromptContext(enabled=False).validator("web", "p", {"status": "ok"})
+    assert legacy.endswith('Plan:p\nRuntime:web\nExecution:{"status": "ok"}')
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.response_cache import ResponseCache
+
+
+class CountingRouter(ModelRouter):
+    calls = 0
+
+    def _call(self, model: str, prompt: str) -> str:
+        self.calls += 1
+        return f"{model}:{prompt}"
+
+
+def test_cache_serves_planner_hits_free_and_persists(tmp_path: Path):
+    store = MemoryStore(tmp_path / "c.db")
+    store.init()
+    router = CountingRouter("http://litellm:4000", "dev", budget_usd=1.0, cache=ResponseCache(store=store), cache_roles={"planner"})
+
+    run = router.scoped()
+    assert run.complete("planner", "same prompt") == run.complete("planner", "same prompt")
+    run.complete("validator", "check")
+    run.complete("validator", "check")
+    assert run.calls == 3
+    assert (run.cache_hits, run.cache_misses) == (1, 1)
+    assert run.spent_usd == run.estimate_cost("same prompt") + 2 * run.estimate_cost("check")
+
+    cold = CountingRouter("http://litellm:4000", "dev", budget_usd=0.0, cache=ResponseCache(store=store), cache_roles={"planner"})
+    assert cold.complete("planner", "same prompt") == "planner:same prompt"
+    assert cold.calls == 0
+    assert cold.cache.stats()["persistent_hits"] == 1
+
+
+def test_cache_ttl_and_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl_s=-1)
+    cache.put("a", "1")
+    assert cache.get("a") is None
+    cache.ttl_s = 60
+    for k in "abc":
+        cache.put(k, k)
+    assert cache.get("a") is None and cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
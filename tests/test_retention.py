@@ -0,0 +1,79 @@
+import gzip
+import json
+import time
+from pathlib import Path
+
+from services.scheduler.src.app import run_job
+from skyagentos.memory.retention import RetentionEngine, RetentionPolicy
+from skyagentos.memory.store import MemoryStore
+from skyagentos.models.schemas import TelemetryEvent
+
+
+def test_policies_delete_in_chunks_archive_and_keep_newest(tmp_path: Path):
+    store = MemoryStore(tmp_path / "ret.db")
+    store.init()
+    for i in range(30):
+        store.push_semantic("general", f"note {i}")
+        store.push_semantic("finance", f"ledger {i}")
+    store.save_telemetry(TelemetryEvent(run_id="r", step_id="s", name="old", value=1.0, tags={}, created_at="2020-01-01T00:00:00+00:00"))
+    store.save_telemetry(TelemetryEvent(run_id="r", step_id="s", name="new", value=1.0, tags={}))
+    done = store.enqueue("run-done", {})
+    store.enqueue("run-queued", {})
+    store.ack(done)
+
+    engine = RetentionEngine(
+        store,
+        policies=[
+            RetentionPolicy("semantic_memory", max_rows=10),
+            RetentionPolicy("semantic_memory", namespace="finance", max_age_days=0, keep_last=5),
+            RetentionPolicy("telemetry", max_age_days=30),
+            RetentionPolicy("queue_jobs", max_age_days=0, archive=False),
+        ],
+        archive_dir=tmp_path / "archive",
+        chunk_size=7,
+    )
+    assert engine.run(now=time.time() + 1, dry_run=True).deleted == {"semantic_memory": 45, "telemetry": 1, "queue_jobs": 1}
+    report = engine.run(now=time.time() + 1)
+    assert report.deleted == {"semantic_memory": 45, "telemetry": 1, "queue_jobs": 1}
+    assert report.chunks > 3 and report.archived == 46
+
+    assert store.read_memory("semantic_memory", "general", 50) == [f"note {i}" for i in range(29, 19, -1)]
+    assert store.read_memory("semantic_memory", "finance", 50) == [f"ledger {i}" for i in range(29, 24, -1)]
+    assert "note 3" not in store.search_semantic("general", "note 3", k=20, mode="fts")
+    assert store.queue.stats() == {"queued": 1}
+
+    (semantic_archive,) = (tmp_path / "archive" / "semantic_memory").glob("*.jsonl.gz")
+    archived = [json.loads(line) for line in gzip.open(semantic_archive, "rt")]
+    assert len(archived) == 45 and {"namespace", "content", "created_at"} <= set(archived[0])
+    assert store._conn().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    store.close()
+
+
+def test_scheduler_runs_retention_cleanup(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("RETENTION_POLICIES", json.dumps([{"table": "episodic_memory", "max_rows": 1}]))
+    store = MemoryStore(tmp_path / "sched.db")
+    store.init()
+    store.push_episodic("general", "a")
+    store.push_episodic("general", "b")
+    assert run_job("retention-cleanup", store)["deleted"] == {"episodic_memory": 1}
+    assert store.read_memory("episodic_memory", "general", 5) == ["b"]
+    store.close()
+
+
+def test_defaults_keep_semantic_memory_and_purge_undated_done_jobs(tmp_path: Path):
+    store = MemoryStore(tmp_path / "defaults.db")
+    store.init()
+    for i in range(20):
+        store.push_semantic("general", f"fact {i}")
+    legacy = store.enqueue("run-legacy", {})
+    store.ack(legacy)
+    # A job finished before queue_jobs had updated_at.
+    with store._conn() as conn:
+        conn.execute("UPDATE queue_jobs SET updated_at=NULL WHERE id=?", (legacy,))
+    store.enqueue("run-queued", {})
+
+    report = RetentionEngine(store, policies=None).run(now=time.time() + 10 * 365 * 86400)
+    assert report.deleted.get("semantic_memory", 0) == 0 and report.deleted["queue_jobs"] == 1
+    assert len(store.read_memory("semantic_memory", "general", 50)) == 20
+    assert store.queue.stats() == {"queued": 1}
+    store.close()
@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from skyagentos.memory.migrations import MIGRATIONS, migrate
+from skyagentos.memory.store import MemoryStore
+
+
+def _plan(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> str:
+    return " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def test_migrations_are_recorded_once_and_indexes_are_used(tmp_path: Path):
+    db = tmp_path / "mig.db"
+    store = MemoryStore(db)
+    store.init()
+    conn = store._conn()
+    versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+    assert versions == [m.version for m in MIGRATIONS]
+    assert migrate(store) == []
+
+    assert "idx_episodic_ns_id" in _plan(conn, "SELECT content FROM episodic_memory WHERE namespace=? ORDER BY id DESC LIMIT 20", ("general",))
+    assert "idx_telemetry_run_name" in _plan(conn, "SELECT value FROM telemetry WHERE run_id=? AND name=?", ("r", "n"))
+    assert "idx_queue_jobs_ready" in _plan(conn, "SELECT id FROM queue_jobs WHERE state='queued' ORDER BY priority DESC, id LIMIT 1")
+    store.close()
+
+
+def test_pre_versioning_database_is_upgraded(tmp_path: Path):
+    db = tmp_path / "old.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE queue_jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL DEFAULT 'queued')")
+        conn.execute("INSERT INTO queue_jobs (run_id, payload) VALUES ('run-1', '{}')")
+    store = MemoryStore(db)
+    store.init()
+    assert store.fts.enabled
+    job = store.queue.dequeue("w1")
+    assert job is not None and job.run_id == "run-1" and job.attempts == 1
+    store.close()
+
+
+def test_concurrent_startup_applies_each_migration_once(tmp_path: Path):
+    db = tmp_path / "race.db"
+    barrier = threading.Barrier(6)
+    applied, errors = [], []
+
+    def start():
+        store = MemoryStore(db)
+        store.db_path.parent.mkdir(parents=True, exist_ok=True)
+        barrier.wait()
+        try:
+            applied.extend(migrate(store))
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=start) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert sorted(applied) == [m.version for m in MIGRATIONS]
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0] == len(MIGRATIONS)
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_interrupted_vacuum_step_is_completed_on_next_start(tmp_path: Path):
+    db = tmp_path / "vac.db"
+    store = MemoryStore(db)
+    store.db_path.parent.mkdir(parents=True, exist_ok=True)
+    migrate(store, target=6)
+    conn = store._conn()
+    # Version 7 was recorded but the process died before its VACUUM ran.
+    with conn:
+        conn.execute("INSERT INTO schema_migrations (version, name, applied_at) VALUES (7, 'incremental auto-vacuum', 0)")
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2
+    assert 7 not in migrate(store)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    store.close()
@@ -0,0 +1,33 @@
+import sqlite3
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+
+
+def test_bm25_index_searches_whole_namespace_and_tracks_deletes(tmp_path: Path):
+    db = tmp_path / "idx.db"
+    store = MemoryStore(db)
+    store.init()
+    store.push_semantic("general", "gpu pricing and market trends for cloud providers")
+    for i in range(120):
+        store.push_semantic("general", f"browser automation run {i} finished ok")
+    store.push_semantic("other", "gpu pricing in another namespace")
+
+    assert store.search_semantic("general", "cloud gpu pricing", k=2) == ["gpu pricing and market trends for cloud providers"]
+    assert store.search_semantic("general", "gardening", k=2) == []
+
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM semantic_memory WHERE content LIKE 'gpu%'")
+        docs = conn.execute("SELECT docs FROM semantic_index_stats WHERE namespace='general'").fetchone()[0]
+    assert docs == 120
+    assert store.search_semantic("general", "cloud gpu pricing", k=2) == []
+
+
+def test_backfill_indexes_preexisting_rows(tmp_path: Path):
+    db = tmp_path / "old.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE semantic_memory (id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT NOT NULL, content TEXT NOT NULL, embedding_hint TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("INSERT INTO semantic_memory (namespace, content) VALUES ('general', 'legacy desktop spreadsheet notes')")
+    store = MemoryStore(db)
+    store.init()
+    assert store.search_semantic("general", "spreadsheet") == ["legacy desktop spreadsheet notes"]
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.singleflight import SingleFlight
+
+
+def _burst(n, fn):
+    barrier = threading.Barrier(n)
+    out, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            out.append(fn())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return out, errors
+
+
+def test_concurrent_callers_share_one_execution_and_its_errors():
+    flights = SingleFlight()
+    runs = []
+
+    def slow():
+        runs.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    out, _ = _burst(8, lambda: flights.do("k", slow, namespace="model:planner"))
+    assert len(runs) == 1 and sorted(out) == [("value", False)] * 7 + [("value", True)]
+    assert flights.stats()["model:planner"] == {"executions": 1, "shared": 7, "fan_in": 8.0}
+
+    def boom():
+        time.sleep(0.1)
+        raise ConnectionError("down")
+
+    _, errors = _burst(4, lambda: flights.do("k", boom))
+    assert len(errors) == 4 and all(isinstance(e, ConnectionError) for e in errors)
+    assert flights.in_flight() == 0
+
+
+class CountingRouter(ModelRouter):
+    def __init__(self):
+        super().__init__("http://llm", "k", budget_usd=1.0)
+        self.calls = []
+
+    def _call(self, model, prompt):
+        self.calls.append((model, prompt))
+        time.sleep(0.1)
+        return f"{model} says ok"
+
+
+def test_router_coalesces_identical_planner_prompts_only(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    router = CountingRouter()
+    scoped = [router.scoped() for _ in range(6)]
+    it = iter(scoped)
+    out, _ = _burst(6, lambda: next(it).complete("planner", "same template plan"))
+    assert set(out) == {"planner says ok"} and len(router.calls) == 1
+    # Only the leader's run is charged; the others count as coalesced.
+    assert sorted(r.spent_usd > 0 for r in scoped) == [False] * 5 + [True]
+    assert sum(r.coalesced for r in scoped) == 5
+
+    router.calls.clear()
+    it = iter(router.scoped() for _ in range(3))
+    _burst(3, lambda: next(it).complete("validator", "same verdict prompt"))
+    assert len(router.calls) == 3
+
@@ -1,6 +1,9 @@
 import os
+import threading
 from pathlib import Path
 
+import pytest
+
 from skyagentos.tools.skyvern_tool import SkyvernTool
 
 
@@ -10,3 +13,25 @@ def test_skyvern_tool_uses_prompt_field_in_dry_run(tmp_path: Path):
     result, _ = tool.execute("run-1", "step-1", {"prompt": "Do a task", "url": "https://example.com"})
     assert result["request"]["prompt"] == "Do a task"
     assert result["request"]["url"] == "https://example.com"
+
+
+def test_lost_attempts_are_not_submitted_and_running_tasks_are_cancelled(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+
+    class RecordingPool:
+        def __init__(self):
+            self.urls = []
+
+        def post_json(self, url, payload, headers=None, timeout=None):
+            self.urls.append(url)
+            return {"status": "running", "task_id": "tsk-1"}
+
+    http = RecordingPool()
+    tool = SkyvernTool("http://skyvern:8000", artifact_dir=tmp_path, http=http)
+    cancel = threading.Event()
+    result, _ = tool.execute("run-1", "step-1", {"prompt": "Do a task"}, cancel=cancel)
+    cancel.set()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        tool.execute("run-1", "step-2", {"prompt": "Do a task"}, cancel=cancel)
+    assert tool.cancel_task(result) and not tool.cancel_task({"status": "completed", "task_id": "tsk-2"})
+    assert http.urls == ["http://skyvern:8000/api/v1/tasks", "http://skyvern:8000/api/v1/tasks/tsk-1/cancel"]
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from skyagentos.models.schemas import Artifact, Mission, Run
+from skyagentos.runtime import orchestrator as orchestrator_module
+from skyagentos.runtime.async_orchestrator import AsyncOrchestrator
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.retry import RetryPolicy
+
+# Engine -> (delay_s, status): the default engine fails fast, "slow" passes late, "quick" passes first.
+ENGINES = {"browser": (0.0, "failed"), "slow": (0.5, "ok"), "quick": (0.1, "ok")}
+
+
+class EngineTool:
+    def __init__(self, task_cost_usd: float = 0.0):
+        self.cancelled = 0
+        self.task_cost_usd = task_cost_usd
+        self.remote_cancels = []
+
+    def _reply(self, run_id: str, step_id: str, payload: dict):
+        delay, status = ENGINES[payload["engine"]]
+        result = {"status": status, "engine": payload["engine"], "task_id": f"task-{step_id}"}
+        return delay, (result, Artifact(id=f"a-{step_id}", run_id=run_id, step_id=step_id, kind="json", path="-", content_type="application/json", checksum="-"))
+
+    def execute(self, run_id: str, step_id: str, payload: dict, cancel=None):
+        delay, out = self._reply(run_id, step_id, payload)
+        time.sleep(delay)
+        return out
+
+    def cancel_task(self, result: dict) -> bool:
+        self.remote_cancels.append(result["task_id"])
+        return True
+
+    async def aexecute(self, run_id: str, step_id: str, payload: dict):
+        delay, out = self._reply(run_id, step_id, payload)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return out
+
+
+def _validate(model: str, prompt: str) -> str:
+    passed = "true" if '"status": "ok"' in prompt else "false"
+    return f'{{"passed": {passed}, "reason": "checked", "next_action": "none"}}'
+
+
+def _setup(monkeypatch, cls, tmp_path: Path):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("SKYVERN_SPECULATIVE_ENGINES", "browser,slow,quick")
+    monkeypatch.setattr(ModelRouter, "_dry_run_reply", staticmethod(_validate))
+    orch = cls(tmp_path / "spec.db", "http://llm", "k", "http://sky", stream_fn=lambda c, p: None)
+    orch.skyvern = EngineTool()
+    return orch
+
+
+def _mission(**metadata) -> Mission:
+    return Mission(id="m-spec", objective="Find pricing", max_steps=6, metadata={"runtime": "browser", **metadata})
+
+
+def test_speculative_round_returns_first_valid_attempt(tmp_path: Path, monkeypatch):
+    orch = _setup(monkeypatch, Orchestrator, tmp_path)
+    start = time.perf_counter()
+    result = orch.run_mission(_mission(speculative_attempts=3))
+    assert time.perf_counter() - start < 0.45
+    assert result["state"] == "COMPLETED"
+    assert result["step"] == 2  # second attempt to settle: the failed one, then "quick"
+    rows = orch.store._conn().execute("SELECT name, tags FROM telemetry WHERE name='speculative_round'").fetchall()
+    assert len(rows) == 1 and '"abandoned": "1"' in rows[0][1]
+    # The slow loser is cancelled remotely once its call returns.
+    deadline = time.time() + 5
+    while not orch.skyvern.remote_cancels and time.time() < deadline:
+        time.sleep(0.02)
+    assert orch.skyvern.remote_cancels == ["task-step-2-executor"]
+
+
+def test_speculation_reuses_one_executor_and_charges_every_attempt(tmp_path: Path, monkeypatch):
+    orch = _setup(monkeypatch, Orchestrator, tmp_path)
+    monkeypatch.setenv("SKYVERN_SPECULATIVE_ENGINES", "browser")  # every attempt fails validation
+    orch.skyvern = EngineTool(task_cost_usd=0.01)
+    orch.retry = RetryPolicy(max_attempts=6, base_delay_s=0)
+    pools = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(orchestrator_module, "ThreadPoolExecutor", CountingPool)
+    result = orch.run_mission(_mission(speculative_attempts=3))
+    assert result["state"] == "HUMAN_REVIEW" and len(pools) == 1  # two rounds, one executor
+    telemetry = dict(orch.store._conn().execute("SELECT name, value FROM telemetry WHERE step_id='run'").fetchall())
+    # Every launched attempt is charged up front, before the next round is sized.
+    assert telemetry["tool_spend_usd"] == pytest.approx(0.06)
+    assert orch.store.get_run_payload(result["run_id"])["cost_usd"] == pytest.approx(0.06 + telemetry["model_spend_usd"], abs=1e-5)
+
+
+def test_speculation_width_respects_budget_and_max_steps(tmp_path: Path, monkeypatch):
+    orch = _setup(monkeypatch, Orchestrator, tmp_path)
+    router = orch.router.scoped()
+    ctx = orch._begin_run(Run(id="r", mission_id="m-spec"), _mission(speculative_attempts=4))
+    orch.retry = RetryPolicy(max_attempts=6, base_delay_s=0)
+    assert orch._speculation_width(ctx, router, 1) == 4
+    assert orch._speculation_width(ctx, router, 5) == 2
+    ctx.mission.budget_usd = router.estimate_cost(orch._validate_prompt(ctx, {"result": "x" * 1800})) * 2.5
+    assert orch._speculation_width(ctx, router, 1) == 2
+
+
+def test_speculation_width_stays_within_the_retry_limit(tmp_path: Path, monkeypatch):
+    # Three attempts fail fast and a fourth would pass late: the third to settle ends
+    # the run, so a fourth must never be launched (and paid for).
+    orch = _setup(monkeypatch, Orchestrator, tmp_path)
+    monkeypatch.setenv("SKYVERN_SPECULATIVE_ENGINES", "browser,browser,browser,slow")
+    orch.skyvern = EngineTool(task_cost_usd=0.01)
+    orch.retry = RetryPolicy(max_attempts=3, base_delay_s=0)
+    result = orch.run_mission(_mission(speculative_attempts=4))
+    assert result["state"] == "HUMAN_REVIEW"
+    telemetry = dict(orch.store._conn().execute("SELECT name, value FROM telemetry WHERE step_id='run'").fetchall())
+    assert telemetry["tool_spend_usd"] == pytest.approx(0.03)
+    assert orch.skyvern.remote_cancels == []
+
+
+def test_speculative_attempts_metadata_is_validated(tmp_path: Path, monkeypatch):
+    orch = _setup(monkeypatch, Orchestrator, tmp_path)
+    monkeypatch.setenv("SKYAGENT_SPECULATIVE_ATTEMPTS", "3")
+    assert orch._speculative_attempts(_mission(speculative_attempts=0)) == 1  # explicit 0 disables
+    assert orch._speculative_attempts(_mission()) == 3
+    with pytest.raises(ValueError, match="speculative_attempts"):
+        orch.submit(_mission(speculative_attempts="many"))
+    assert orch.store.queue.stats() == {}
+
+
+def test_async_speculation_cancels_losing_attempts(tmp_path: Path, monkeypatch):
+    orch = _setup(monkeypatch, AsyncOrchestrator, tmp_path)
+    result = asyncio.run(orch.run_mission_async(_mission(speculative_attempts=3)))
+    assert result["state"] == "COMPLETED"
+    assert orch.skyvern.cancelled == 1
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from pathlib import Path
+
+from evals.perf.stubs import start_stub
+from skyagentos.models.schemas import Mission
+from skyagentos.runtime.events import EventBus
+from skyagentos.runtime.httpclient import AsyncHttpClient, HttpPool
+from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.streaming import DeltaCoalescer, IncrementalJson
+
+
+def test_incremental_json_yields_members_as_they_complete():
+    parser = IncrementalJson()
+    text = 'Sure:\n```json\n{"passed": true, "score": 12, "reason": "found \\"pricing\\"", "tags": ["a", "b"]}\n```'
+    seen = []
+    for ch in text:
+        parser.feed(ch)
+        if parser.fields and list(parser.fields) != (seen[-1] if seen else None):
+            seen.append(list(parser.fields))
+    assert seen == [["passed"], ["passed", "score"], ["passed", "score", "reason"], ["passed", "score", "reason", "tags"]]
+    assert parser.fields == {"passed": True, "score": 12, "reason": 'found "pricing"', "tags": ["a", "b"]}
+    assert parser.complete
+
+    partial = IncrementalJson()
+    partial.feed('{"passed": false, "reason": "timed o')
+    assert partial.fields == {"passed": False} and not partial.complete
+
+
+def test_router_streams_tokens_and_stops_on_validator_verdict(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    server, url = start_stub("litellm", token_delay_s=0.02)
+    pool = HttpPool()
+    router = ModelRouter(url, "k", budget_usd=1.0, http=pool)
+    try:
+        tokens = []
+        plan = router.complete_stream("planner", "plan it", on_token=tokens.append)
+        assert plan == "1. open source page 2. extract figures. Success: figures cited."
+        assert len(tokens) == 10
+
+        verdict = IncrementalJson()
+        start = time.perf_counter()
+        raw = router.complete_stream("validator", "check", on_token=verdict.feed, stop=lambda _: "passed" in verdict.fields)
+        early = time.perf_counter() - start
+        assert raw == '{"passed": true, ' and verdict.fields == {"passed": True}
+        # 2 of 6 tokens read: the remaining inter-token delays were never waited for.
+        assert early < 0.08
+        stats = pool.stats()
+    finally:
+        pool.close()
+        server.shutdown()
+    # The full planner stream went back to the pool; the abandoned validator stream did not.
+    assert stats["connections_reused"] == 1 and list(stats["idle_connections"].values()) == [0]
+
+
+def test_async_router_streams_over_keep_alive(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    server, url = start_stub("litellm")
+    client = AsyncHttpClient()
+    router = ModelRouter(url, "k", budget_usd=1.0, ahttp=client)
+
+    async def go():
+        first = await router.acomplete_stream("planner", "plan it")
+        second = await router.acomplete_stream("planner", "plan again")
+        verdict = IncrementalJson()
+        raw = await router.acomplete_stream("validator", "check", on_token=verdict.feed, stop=lambda _: "passed" in verdict.fields)
+        return first, second, raw, verdict.fields
+
+    try:
+        first, second, raw, fields = asyncio.run(go())
+    finally:
+        server.shutdown()
+    assert first == second == "1. open source page 2. extract figures. Success: figures cited."
+    assert fields == {"passed": True}
+    assert client.stats()["connections_reused"] == 2
+
+
+def test_orchestrator_streams_plan_deltas_and_verdicts(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("SKYAGENT_STREAM_COMPLETIONS", "true")
+    monkeypatch.setenv("SKYAGENT_PLAN_DELTA_CHARS", "32")
+    events = []
+    orch = Orchestrator(tmp_path / "stream.db", "http://llm", "k", "http://sky", stream_fn=lambda c, p: events.append((c, p)))
+    result = orch.run_mission(Mission(id="m-stream", objective="Find pricing", metadata={"runtime": "browser"}))
+
+    assert result["state"] == "COMPLETED"
+    assert result["validation"] == {"passed": True, "reason": "", "next_action": ""}
+    deltas = [p["plan_delta"] for c, p in events if c == "progress" and "plan_delta" in p]
+    assert len(deltas) > 1 and "".join(deltas).startswith("[dry-run:planner] ")
+
+
+def test_plan_deltas_are_coalesced_so_state_events_stay_replayable(tmp_path: Path, monkeypatch):
+    emitted = []
+    coalesce = DeltaCoalescer(emitted.append, min_chars=10, max_wait_s=60)
+    for token in ["ab", "cd", "efghij", "k", "l"]:
+        coalesce(token)
+    coalesce.flush()
+    assert emitted == ["abcdefghij", "kl"]
+
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setenv("SKYAGENT_STREAM_COMPLETIONS", "true")
+    bus = EventBus(history=12)
+    orch = Orchestrator(tmp_path / "replay.db", "http://llm", "k", "http://sky", stream_fn=bus.publish)
+    result = orch.run_mission(Mission(id="m-replay", objective="Find pricing", metadata={"runtime": "browser"}))
+    replay = bus.subscribe(result["run_id"], last_event_id=0)
+    events = replay.get(timeout=1)
+    replay.close()
+    deltas = [e.payload["plan_delta"] for e in events if "plan_delta" in e.payload]
+    assert len(deltas) == 1 and deltas[0].startswith("[dry-run:planner] ")
+    assert events[0].payload.get("state") == "CREATED"  # nothing evicted; per-token deltas would have
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from services.orchestrator.src.agents.planner import PlannerAgent
+from services.orchestrator.src.agents.validator import ValidatorAgent
+from services.orchestrator.src.mission.models import MissionV2, StepV2
+from services.orchestrator.src.runtime.dag import DagExecutor, topological_order
+from services.orchestrator.src.runtime.dispatcher import Dispatcher
+
+
+class SlowRuntime:
+    def __init__(self, name: str, delay_s: float = 0.1, fail_first: int = 0):
+        self.name = name
+        self.delay_s = delay_s
+        self.fail_first = fail_first
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def execute(self, action: str, payload: dict) -> dict:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            calls = self.calls
+        time.sleep(self.delay_s)
+        with self._lock:
+            self.active -= 1
+        if calls <= self.fail_first:
+            raise ConnectionError(f"{self.name} unavailable")
+        return {"status": "ok", "runtime": self.name, "action": action, "upstream": sorted(payload.get("upstream", {}))}
+
+
+def _step(sid: str, runtime: str, deps: list[str] | None = None, attempts: int = 1) -> StepV2:
+    return StepV2(step_id=sid, mission_id="m1", runtime=runtime, action=sid, depends_on=deps or [], max_attempts=attempts)
+
+
+def test_fan_out_runs_in_longest_branch_time_with_runtime_limits():
+    browser, desktop, workspace, tools = (SlowRuntime(n) for n in ("browser", "desktop", "workspace", "tools"))
+    executor = DagExecutor(Dispatcher(browser, desktop, workspace, tools), limits={"browser": 2, "desktop": 1, "workspace": 1, "tools": 4})
+    steps = [
+        _step("b1", "browser"),
+        _step("b2", "browser"),
+        _step("b3", "browser"),
+        _step("d1", "desktop"),
+        _step("t1", "tools"),
+        _step("report", "workspace", ["b1", "b2", "b3", "d1", "t1"]),
+    ]
+    result = executor.run(steps)
+    assert result.succeeded and result.completed[-1] == "report"
+    assert result.steps["report"].output["upstream"] == ["b1", "b2", "b3", "d1", "t1"]
+    assert browser.peak == 2 and desktop.peak == 1
+    assert result.elapsed_s < 0.45  # two browser waves + report; sequential would be 0.6s
+
+
+def test_retries_per_node_and_skips_downstream_of_failures():
+    flaky, broken = SlowRuntime("browser", 0.01, fail_first=1), SlowRuntime("desktop", 0.01, fail_first=5)
+    executor = DagExecutor(Dispatcher(flaky, broken, SlowRuntime("workspace", 0.01), SlowRuntime("tools", 0.01)), validator=ValidatorAgent())
+    steps = [
+        _step("web", "browser", attempts=2),
+        _step("app", "desktop", attempts=2),
+        _step("report", "workspace", ["web", "app"]),
+        _step("notify", "tools", ["web"]),
+    ]
+    result = executor.run(steps)
+    states = {sid: (s.state, s.attempt) for sid, s in result.steps.items()}
+    assert states == {"web": ("succeeded", 2), "app": ("failed", 2), "report": ("skipped", 1), "notify": ("succeeded", 1)}
+    assert result.steps["app"].output == {"status": "error", "error": "desktop unavailable"}
+    assert sorted(result.failed()) == ["app", "report"]
+
+
+def test_planner_emits_dependencies_and_cycles_are_rejected():
+    plan = PlannerAgent().plan(MissionV2(mission_id="m2", objective="Compare GPU prices"))
+    assert topological_order(plan) == ["m2-step-1", "m2-step-2"]
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order([_step("a", "tools", ["b"]), _step("b", "tools", ["a"])])
+
+
+class ExplodingValidator:
+    def validate(self, step: StepV2):
+        if step.runtime == "desktop":
+            raise RuntimeError("validator crashed")
+        return ValidatorAgent().validate(step)
+
+
+def test_validator_errors_fail_the_node_and_zero_limits_are_rejected():
+    runtimes = (SlowRuntime(n, 0.01) for n in ("browser", "desktop", "workspace", "tools"))
+    executor = DagExecutor(Dispatcher(*runtimes), validator=ExplodingValidator())
+    result = executor.run([_step("web", "browser"), _step("app", "desktop", attempts=2), _step("report", "workspace", ["app"])])
+    states = {sid: (s.state, s.attempt) for sid, s in result.steps.items()}
+    assert states == {"web": ("succeeded", 1), "app": ("failed", 2), "report": ("skipped", 1)}
+    assert result.steps["app"].output == {"status": "error", "error": "validator crashed"}
+    executor = DagExecutor(Dispatcher(*(SlowRuntime(n, 0.01) for n in ("browser", "desktop", "workspace", "tools"))), limits={"desktop": 0})
+    with pytest.raises(ValueError, match="desktop"):
+        executor.run([_step("app", "desktop")])
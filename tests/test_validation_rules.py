@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from skyagentos.models.schemas import Artifact, Mission
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.validation import ValidationEngine, register_rule, _registered
+
+
+def _mission(**validation) -> Mission:
+    return Mission(id="m-rules", objective="Find pricing", metadata={"runtime": "browser", "validation": validation})
+
+
+def test_rules_decide_obvious_outcomes_and_defer_the_rest():
+    plain = ValidationEngine.for_mission(_mission())
+    verdict, rule = plain.evaluate({"status": "failed", "evidence": ["x"]})
+    assert not verdict.passed and rule == "status"
+    assert plain.evaluate({"status": "ok", "status_code": 502})[0].reason == "executor returned HTTP 502"
+    assert plain.evaluate({"status": "ok", "evidence": []})[1] == "evidence"
+    # A bare "ok" proves nothing without structured criteria.
+    assert plain.evaluate({"status": "ok", "evidence": ["x"]}) is None
+
+    schema = {"type": "object", "required": ["price"], "properties": {"price": {"type": "number"}, "evidence": {"type": "array", "minItems": 1}}}
+    strict = ValidationEngine.for_mission(_mission(schema=schema, required_fields=["summary"]))
+    assert strict.evaluate({"status": "ok", "price": 9.5, "summary": "s", "evidence": ["u"]})[0].passed
+    verdict, rule = strict.evaluate({"status": "ok", "price": "9.5", "summary": "s", "evidence": ["u"]})
+    assert not verdict.passed and rule == "schema" and "$.price is not number" in verdict.reason
+    assert strict.evaluate({"status": "ok", "price": 1, "evidence": ["u"]})[1] == "required_fields"
+
+
+def test_registered_rules_join_every_engine():
+    class NoCaptcha:
+        name = "captcha"
+
+        def check(self, result):
+            from skyagentos.runtime.validation import RuleVerdict
+
+            return RuleVerdict(self.name, False, "blocked by captcha") if "captcha" in str(result) else RuleVerdict(self.name, None)
+
+    register_rule(lambda criteria: NoCaptcha())
+    try:
+        verdict, rule = ValidationEngine.for_mission(_mission()).evaluate({"status": "ok", "summary": "captcha page"})
+    finally:
+        _registered.clear()
+    assert rule == "captcha" and not verdict.passed
+
+
+class ScriptedTool:
+    def __init__(self, results):
+        self.results = list(results)
+
+    def execute(self, run_id, step_id, payload):
+        return self.results.pop(0), Artifact(id=f"a-{step_id}", run_id=run_id, step_id=step_id, kind="json", path="-", content_type="application/json", checksum="-")
+
+
+def test_orchestrator_skips_model_validator_when_rules_decide(tmp_path: Path, monkeypatch):
+    calls = []
+
+    def reply(model: str, prompt: str) -> str:
+        if prompt.startswith("Return strict JSON only"):
+            calls.append(prompt)
+            return '{"passed": true, "reason": "model", "next_action": "none"}'
+        return "plan"
+
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "true")
+    monkeypatch.setattr(ModelRouter, "_dry_run_reply", staticmethod(reply))
+    monkeypatch.setattr("skyagentos.runtime.orchestrator.retry_sleep", lambda policy, attempt: None)
+
+    orch = Orchestrator(tmp_path / "rules.db", "http://llm", "k", "http://sky", stream_fn=lambda c, p: None)
+    orch.skyvern = ScriptedTool([{"status": "failed"}, {"status": "ok", "summary": "pricing page", "evidence": ["u"]}])
+    result = orch.run_mission(_mission(required_fields=["summary"]))
+    assert result["state"] == "COMPLETED" and result["step"] == 2
+    assert result["validation"]["reason"] == "required fields present"
+    assert calls == []
+
+    orch.skyvern = ScriptedTool([{"status": "ok", "summary": "pricing page"}])
+    assert orch.run_mission(_mission())["validation"]["reason"] == "model"
+    assert len(calls) == 1
+
+    orch.store.flush()
+    tiers = dict(orch.store._conn().execute("SELECT name, COUNT(*) FROM telemetry WHERE name LIKE 'validation_tier_%' GROUP BY name"))
+    assert tiers == {"validation_tier_rules": 2, "validation_tier_llm": 1}
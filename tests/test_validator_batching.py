@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+
+from evals.perf.stubs import start_stub
+from skyagentos.runtime.httpclient import AsyncHttpClient, HttpPool
+from skyagentos.runtime.model_health import ModelHealth
+from skyagentos.runtime.model_router import ModelRouter
+from skyagentos.runtime.validator_batch import BURST, ValidatorBatcher, batch_prompt, scatter
+
+
+class ScriptedRouter:
+    """Answers batch prompts but drops item 2, so it must be re-asked alone."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def _first_success(self, role, prompt, est):
+        self.prompts.append(prompt)
+        if "### Item" not in prompt:
+            return "local_reflector", '{"passed": false, "reason": "alone", "next_action": "retry"}'
+        return "local_reflector", 'Sure: {"results": [{"id": 1, "passed": true, "reason": "ok"}, {"id": 3, "passed": true}, {"id": 9, "passed": "yes"}]}'
+
+
+def test_scatter_and_missing_items_fall_back_to_single_calls():
+    assert scatter('[{"id": 2, "passed": false, "reason": "r", "extra": 1}]') == {2: '{"passed": false, "reason": "r"}'}
+    assert scatter("not json") == {}
+    assert batch_prompt(["a", "b"]).endswith("### Item 1\na\n### Item 2\nb\n")
+
+    router = ScriptedRouter()
+    batcher = ValidatorBatcher(router, window_s=0.5, max_batch=3)
+    out = {}
+    barrier = threading.Barrier(3)
+
+    def worker(n):
+        barrier.wait()
+        out[n] = json.loads(batcher.submit(f"check {n}"))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    first = router.prompts[0]
+    order = [first.index(f"check {n}") for n in range(3)]
+    dropped = sorted(range(3), key=lambda n: order[n])[1]
+    assert out[dropped]["reason"] == "alone"
+    assert all(out[n]["passed"] for n in range(3) if n != dropped)
+    assert len(router.prompts) == 2
+    assert batcher.stats() == {"items": 3, "batches": 1, "requests": 2, "fallbacks": 1, "mean_batch": 3.0}
+
+
+def test_concurrent_runs_share_one_validator_request(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    server, url = start_stub("litellm", delay_s=0.05)
+    http = HttpPool()
+    try:
+        router = ModelRouter(url, "k", budget_usd=10.0, http=http, health=ModelHealth(hedge=False), coalesce_keys={})
+        router.batcher = ValidatorBatcher(router, window_s=0.2, max_batch=6)
+        scoped = [router.scoped() for _ in range(6)]
+        replies = []
+        barrier = threading.Barrier(6)
+
+        def worker(n):
+            barrier.wait()
+            replies.append(json.loads(scoped[n].complete("validator", f"Plan {n}")))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(replies) == 6 and all(r["passed"] for r in replies)
+        assert http.stats()["requests"] == 1
+        assert all(r.batched == 1 and r.spent_usd == r.estimate_cost("Plan 0") for r in scoped)
+        assert router.spent_usd == 0.0
+    finally:
+        http.close()
+        server.shutdown()
+
+
+def test_async_burst_mode_bounds_concurrency(monkeypatch):
+    monkeypatch.setenv("SKYAGENT_DRY_RUN", "false")
+    server, url = start_stub("litellm", delay_s=0.05)
+    client = AsyncHttpClient()
+    active, peak = [0], [0]
+    try:
+        router = ModelRouter(url, "k", budget_usd=10.0, ahttp=client, health=ModelHealth(hedge=False), coalesce_keys={})
+        router.batcher = ValidatorBatcher(router, window_s=0.01, max_batch=3, mode=BURST, concurrency=1)
+        inner = router._afirst_success
+
+        async def tracked(role, prompt, est):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            try:
+                return await inner(role, prompt, est)
+            finally:
+                active[0] -= 1
+
+        router._afirst_success = tracked
+
+        async def main():
+            return await asyncio.gather(*(router.scoped().acomplete("validator", f"Plan {n}") for n in range(6)))
+
+        replies = asyncio.run(main())
+        assert all(json.loads(r)["passed"] for r in replies)
+        assert client.stats()["requests"] == 6
+        # One batch of three at a time: three requests in flight at most.
+        assert peak[0] == 3
+        assert router.batcher.stats()["batches"] == 2
+    finally:
+        server.shutdown()
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+from skyagentos.memory.vectors import embed, vector_rank
+
+
+def test_embeddings_are_deterministic_unit_float32():
+    v = embed("gpu pricing trends")
+    assert v.typecode == "f" and len(v) == 256
+    assert v == embed("gpu pricing trends")
+    assert abs(sum(x * x for x in v) - 1.0) < 1e-4
+    assert vector_rank("gpu market pricing", ["gardening and flowers", "gpu pricing and market trends"], k=1) == [
+        "gpu pricing and market trends"
+    ]
+
+
+def test_vector_search_exact_and_lsh_modes(tmp_path: Path):
+    store = MemoryStore(tmp_path / "v.db")
+    store.init()
+    store.push_semantic("general", "spreadsheet totals updated in excel")
+    for i in range(50):
+        store.push_semantic("general", f"browser automation reliability note {i}")
+
+    assert store.search_semantic("general", "excel spreadsheets", k=1, mode="vector") == ["spreadsheet totals updated in excel"]
+
+    store.vectors.exact_max = 10
+    assert store.search_semantic("general", "spreadsheet totals updated in excel", k=1, mode="vector") == [
+        "spreadsheet totals updated in excel"
+    ]
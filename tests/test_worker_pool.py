@@ -0,0 +1,82 @@
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+
+from skyagentos.models.schemas import Mission
+from skyagentos.runtime.orchestrator import Orchestrator
+from skyagentos.runtime.worker import MissionWorkerPool
+
+
+def test_worker_pool_drains_submitted_missions(tmp_path: Path):
+    os.environ["SKYAGENT_DRY_RUN"] = "true"
+    orch = Orchestrator(tmp_path / "w.db", "http://litellm:4000", "dev", "http://skyvern:8000", stream_fn=lambda c, p: None)
+    runs = [orch.submit(Mission(id=f"m{i}", objective="Research worker pool", max_steps=1))["run_id"] for i in range(3)]
+    assert orch.store.queue.stats() == {"queued": 3}
+
+    pool = MissionWorkerPool(orch, concurrency=2, poll_interval_s=0.05)
+    pool.start()
+    deadline = time.time() + 10
+    while orch.store.queue.stats().get("done", 0) < 3 and time.time() < deadline:
+        time.sleep(0.05)
+    pool.stop()
+
+    assert orch.store.queue.stats() == {"done": 3}
+    assert {orch.store.get_run_payload(r)["state"] for r in runs} == {"COMPLETED"}
+
+
+def _drain(orch: Orchestrator, expected: dict) -> None:
+    pool = MissionWorkerPool(orch, concurrency=1, poll_interval_s=0.05)
+    pool.start()
+    deadline = time.time() + 10
+    while orch.store.queue.stats() != expected and time.time() < deadline:
+        time.sleep(0.05)
+    pool.stop()
+    assert orch.store.queue.stats() == expected
+
+
+def test_failed_jobs_leave_their_run_failed(tmp_path: Path):
+    os.environ["SKYAGENT_DRY_RUN"] = "true"
+    orch = Orchestrator(tmp_path / "f.db", "http://litellm:4000", "dev", "http://skyvern:8000", stream_fn=lambda c, p: None)
+
+    # Policy rejections are final: the run fails and the job is acked, not retried.
+    denied = orch.submit(Mission(id="m-denied", objective="Research", permissions=[]))["run_id"]
+    _drain(orch, {"done": 1})
+    run = orch.store.get_run_payload(denied)
+    assert run["state"] == "FAILED" and "missing permissions" in run["error"] and run["attempt"] == 0
+
+    # Other errors retry; the run fails once the job is dead-lettered.
+    def broken_plan(ctx, router):
+        raise RuntimeError("planner exploded")
+
+    orch._plan = broken_plan
+    crashed = orch.submit(Mission(id="m-crash", objective="Research"))["run_id"]
+    _drain(orch, {"done": 1, "dead": 1})
+    run = orch.store.get_run_payload(crashed)
+    assert run["state"] == "FAILED" and run["error"] == "RuntimeError: planner exploded" and run["attempt"] == 2
+
+
+def test_sigterm_drains_in_flight_jobs(tmp_path: Path):
+    os.environ["SKYAGENT_DRY_RUN"] = "true"
+    orch = Orchestrator(tmp_path / "t.db", "http://litellm:4000", "dev", "http://skyvern:8000", stream_fn=lambda c, p: None)
+    run_id = orch.submit(Mission(id="m-term", objective="Research drain", max_steps=1))["run_id"]
+    pool = MissionWorkerPool(orch, concurrency=1, poll_interval_s=0.05)
+    started = threading.Event()
+    execute = orch.execute_job
+
+    def slow_execute(job):
+        started.set()
+        time.sleep(0.3)
+        return execute(job)
+
+    orch.execute_job = slow_execute
+    threading.Thread(target=lambda: started.wait(10) and os.kill(os.getpid(), signal.SIGTERM), daemon=True).start()
+    previous = signal.getsignal(signal.SIGTERM)
+    try:
+        pool.run_forever()  # returns once SIGTERM stopped it and the job drained
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    assert orch.store.queue.stats() == {"done": 1}
+    assert orch.store.get_run_payload(run_id)["state"] == "COMPLETED"
+    assert orch.store.buffer is None or orch.store.buffer.pending() == 0
@@ -0,0 +1,61 @@
+import sqlite3
+import time
+from pathlib import Path
+
+from skyagentos.memory.store import MemoryStore
+from skyagentos.models.schemas import Run, RunState, Step, TelemetryEvent
+
+
+def _count(db: Path, table: str) -> int:
+    with sqlite3.connect(db) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_write_behind_flushes_batch_on_terminal_run_state(tmp_path: Path):
+    db = tmp_path / "wb.db"
+    store = MemoryStore(db, write_behind=True)
+    store.buffer.flush_interval_s = 60
+    store.init()
+    run = Run(id="r1", mission_id="m1", state=RunState.EXECUTING)
+    store.save_run(run)
+    for i in range(5):
+        store.save_step(Step(id=f"s{i}", run_id="r1", role="browser_executor", action="browser.execute"))
+        store.save_telemetry(TelemetryEvent(run_id="r1", step_id=f"s{i}", name="browser_call_ms", value=1.0))
+    assert store.buffer.pending() == 10
+    assert _count(db, "steps") == 0
+
+    run.state = RunState.COMPLETED
+    store.save_run(run)
+    assert store.buffer.pending() == 0
+    assert _count(db, "steps") == 5
+    assert _count(db, "telemetry") == 5
+    assert store.buffer.flushes == 1
+
+
+def test_write_behind_bursts_reuse_pooled_connections(tmp_path: Path):
+    store = MemoryStore(tmp_path / "bursts.db", write_behind=True)
+    store.buffer.flush_interval_s = 0.01
+    store.init()
+    base = len(store._conns)
+    threads = []
+    for burst in range(30):
+        store.save_telemetry(TelemetryEvent(run_id="r1", step_id=f"s{burst}", name="browser_call_ms", value=1.0))
+        threads.append(store.buffer._thread)
+        deadline = time.time() + 5
+        while store.buffer._thread is not None and time.time() < deadline:
+            time.sleep(0.005)
+    assert len({id(t) for t in threads}) == 30  # a new flusher per burst...
+    assert len(store._conns) == base + 1  # ...but one pooled connection between them
+    assert _count(tmp_path / "bursts.db", "telemetry") == 30
+    store.close()
+
+
+def test_orchestrator_and_store_share_the_write_behind_default(tmp_path: Path, monkeypatch):
+    from skyagentos.runtime.orchestrator import Orchestrator
+
+    monkeypatch.delenv("MEMORY_WRITE_BEHIND", raising=False)
+    orch = Orchestrator(tmp_path / "o.db", "http://llm", "k", "http://sky", stream_fn=lambda c, p: None)
+    assert orch.store.buffer is not None and MemoryStore(tmp_path / "s.db").buffer is not None
+    monkeypatch.setenv("MEMORY_WRITE_BEHIND", "false")
+    orch = Orchestrator(tmp_path / "o2.db", "http://llm", "k", "http://sky", stream_fn=lambda c, p: None)
+    assert orch.store.buffer is None and MemoryStore(tmp_path / "s2.db").buffer is None